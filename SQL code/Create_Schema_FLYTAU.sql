@@ -95,6 +95,9 @@ CREATE TABLE Flights (
     departure_time TIME,
     runway_num ENUM('R1','R2', 'R3', 'R4', 'R5'),
     PRIMARY KEY (flight_id, departure_date),
+    KEY idx_flights_runway (departure_date, runway_num, departure_time), -- Runway conflict checks
+    KEY idx_flights_airplane (airplane_id, departure_date),              -- Plane availability
+    KEY idx_flights_status (status, departure_date, departure_time),     -- Departures board / status scheduler
     FOREIGN KEY (airplane_id) REFERENCES Airplanes(airplane_id),
     FOREIGN KEY (source_airport, destination_airport) REFERENCES Flight_Routes(source_airport, destination_airport)
 );
@@ -105,6 +108,7 @@ CREATE TABLE Pilots_In_Flights (
     flight_id VARCHAR(20),
     departure_date DATE,
     PRIMARY KEY (pilot_id, flight_id),
+    KEY idx_pilots_in_flights_date (departure_date), -- Crew availability
     FOREIGN KEY (pilot_id) REFERENCES Pilots(pilot_id),
     FOREIGN KEY (flight_id, departure_date) REFERENCES Flights(flight_id, departure_date)
 );
@@ -115,6 +119,7 @@ CREATE TABLE Attendants_In_Flights (
     departure_date DATE,
     flight_id VARCHAR(20),
     PRIMARY KEY (attendant_id, flight_id),
+    KEY idx_attendants_in_flights_date (departure_date), -- Crew availability
     FOREIGN KEY (attendant_id) REFERENCES Flight_Attendants(attendant_id),
     FOREIGN KEY (flight_id, departure_date) REFERENCES Flights(flight_id, departure_date)
 );
@@ -186,7 +191,8 @@ CREATE TABLE Orders (
     customer_email VARCHAR(100), -- Logical link to Customers
     status ENUM('Active', 'Executed','Cancelled by customer', 'Cancelled by system'),
     order_date DATE,
-    customer_type ENUM('Registered','Unregistered') -- Indicates which table to check ('Registered'/'Unregistered')
+    customer_type ENUM('Registered','Unregistered'), -- Indicates which table to check ('Registered'/'Unregistered')
+    KEY idx_orders_customer_email (customer_email) -- Customer order history
 );
 
 
@@ -200,8 +206,105 @@ CREATE TABLE Flight_Tickets (
     class_type ENUM('Economy','Business'),
     airplane_id VARCHAR(20),
     price DECIMAL (10 , 2),
+    seat_hold TINYINT DEFAULT 1, -- 1 while the seat is held by the order, NULL once the order is cancelled
     PRIMARY KEY (order_code, flight_id, departure_date, row_num, column_num, class_type),
+    -- A seat can be held by at most one order per flight (NULLs never collide, so cancelled tickets are ignored)
+    UNIQUE KEY uq_active_seat (flight_id, departure_date, row_num, column_num, seat_hold),
     FOREIGN KEY (order_code) REFERENCES Orders(order_code),
     FOREIGN KEY (flight_id, departure_date) REFERENCES Flights(flight_id, departure_date),
     FOREIGN KEY (row_num, column_num, class_type, airplane_id) REFERENCES Seats(row_num, column_num, class_type, airplane_id)
-);
\ No newline at end of file
+);
+
+
+-- ==========================================================
+-- Dashboard summary tables (maintained by code/report_aggregates.py)
+-- Rebuild from the base tables with: python report_aggregates.py --rebuild
+-- ==========================================================
+
+-- 20. Per-flight occupancy (input of the average occupancy report)
+CREATE TABLE Report_Flight_Occupancy (
+    flight_id VARCHAR(20),
+    departure_date DATE,
+    airplane_id VARCHAR(20),
+    status ENUM('Active','Arrived','Cancelled'),
+    total_seats INT DEFAULT 0,
+    occupied_seats INT DEFAULT 0,
+    PRIMARY KEY (flight_id, departure_date)
+);
+
+-- 21. Running total of the occupancy of arrived flights (single row, id = 1)
+CREATE TABLE Report_Occupancy_Summary (
+    id TINYINT PRIMARY KEY,
+    arrived_flights INT DEFAULT 0,
+    occupancy_pct_sum DOUBLE DEFAULT 0
+);
+
+-- 22. Revenue per aircraft model and class
+CREATE TABLE Report_Revenue (
+    manufacturer VARCHAR(50),
+    size ENUM('Small','Big'),
+    class_type ENUM('Economy','Business'),
+    total_revenue DECIMAL(14, 2) DEFAULT 0,
+    ticket_count INT DEFAULT 0,
+    PRIMARY KEY (manufacturer, size, class_type)
+);
+
+-- 23. Flight minutes per crew member on arrived flights
+CREATE TABLE Report_Crew_Hours (
+    employee_id VARCHAR(20),
+    role ENUM('Pilot','Attendant'),
+    first_name VARCHAR(50),
+    last_name VARCHAR(50),
+    short_minutes INT DEFAULT 0,
+    long_minutes INT DEFAULT 0,
+    PRIMARY KEY (employee_id, role)
+);
+
+-- 24. Orders and cancellations per order month (YYYY-MM)
+CREATE TABLE Report_Monthly_Orders (
+    order_month CHAR(7) PRIMARY KEY,
+    total_orders INT DEFAULT 0,
+    cancelled_orders INT DEFAULT 0
+);
+
+-- 25. Airplane activity per month (YYYY-MM)
+CREATE TABLE Report_Plane_Monthly (
+    airplane_id VARCHAR(20),
+    activity_month CHAR(7),
+    flights_executed INT DEFAULT 0,
+    flights_cancelled INT DEFAULT 0,
+    days_flown INT DEFAULT 0,
+    dominant_route VARCHAR(101), -- 'source-destination'
+    PRIMARY KEY (airplane_id, activity_month)
+);
+
+INSERT INTO Report_Occupancy_Summary (id, arrived_flights, occupancy_pct_sum) VALUES (1, 0, 0);
+
+-- ==========================================================
+-- Generated IDs (code/id_sequences.py)
+-- ==========================================================
+
+-- 26. Named ID counters (workers, order code nodes); processes reserve blocks of values
+CREATE TABLE Id_Sequences (
+    name VARCHAR(50) PRIMARY KEY,
+    next_value BIGINT UNSIGNED NOT NULL
+);
+
+-- ==========================================================
+-- Schema versioning (managed by code/migrations.py)
+-- This script already contains every migration in "SQL code/migrations", so they are recorded as applied.
+-- ==========================================================
+
+-- 27. Applied migrations
+CREATE TABLE Schema_Migrations (
+    version INT PRIMARY KEY,
+    name VARCHAR(100),
+    checksum CHAR(64), -- SHA-256 of the migration file (NULL when recorded by this script)
+    applied_at DATETIME
+);
+
+INSERT INTO Schema_Migrations (version, name, checksum, applied_at) VALUES
+    (1, 'active_seat_uniqueness', NULL, NOW()),
+    (2, 'report_aggregates', NULL, NOW()),
+    (3, 'hot_predicate_indexes', NULL, NOW()),
+    (4, 'id_sequences', NULL, NOW());
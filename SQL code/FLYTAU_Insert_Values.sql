@@ -24,6 +24,7 @@ TRUNCATE TABLE Unregistered_Customers;
 TRUNCATE TABLE Managers;
 TRUNCATE TABLE Pilots;
 TRUNCATE TABLE Flight_Attendants;
+TRUNCATE TABLE Id_Sequences; -- Counters restart after the reloaded IDs on first use
 
 -- Drop helper table if it remains from previous run
 DROP TABLE IF EXISTS NumberGen;
@@ -311,4 +312,19 @@ SELECT
     s.airplane_id,
     CASE WHEN s.class_type = 'Business' THEN 1900 ELSE 950 END
 FROM Seats s
-WHERE s.airplane_id = 'AP-A380-3';
\ No newline at end of file
+WHERE s.airplane_id = 'AP-A380-3';
+
+
+-- ==========================================================
+-- 7. Release seats of cancelled orders
+-- ==========================================================
+UPDATE Flight_Tickets FT
+JOIN Orders O ON FT.order_code = O.order_code
+SET FT.seat_hold = NULL
+WHERE O.status IN ('Cancelled by customer', 'Cancelled by system');
+
+-- ==========================================================
+-- 8. Dashboard summary tables
+-- The Report_* tables are derived data: fill them from the rows above with
+--     python report_aggregates.py --rebuild
+-- ==========================================================
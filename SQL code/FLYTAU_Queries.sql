@@ -7,25 +7,22 @@ USE FLYTAU;
 -- 2. Calculates total physical seats per airplane model.
 -- 3. Computes the ratio (Occupied / Total) and averages it across all flights.
 
-SELECT AVG((occupied_seats * 100.0)/ total_seats)  AS avg_capacity_percentage
-FROM (
-    SELECT F.flight_id, F.departure_date,
-        -- Count tickets sold for this flight (Comparing both ID and Date)
-        (SELECT COUNT(*)
-         FROM Flight_Tickets FT
-         JOIN Orders O ON FT.order_code = O.order_code
-         WHERE FT.flight_id = F.flight_id
-           AND FT.departure_date = F.departure_date
-           AND O.status IN ('Active', 'Executed')) AS occupied_seats,
-
-        -- Calculate total physical seats in the plane (based on model)
-        (SELECT SUM(rows_count * columns_count)
-         FROM Airplane_Classes AC
-         WHERE AC.airplane_id = F.airplane_id) AS total_seats
-
-    FROM Flights F
-    WHERE F.status = 'Arrived'
-) AS flight_occupancy_data;
+SELECT AVG((COALESCE(T.occupied_seats, 0) * 100.0) / S.total_seats) AS avg_capacity_percentage
+FROM Flights F
+-- Seats per airplane, computed once per airplane instead of once per flight
+JOIN (SELECT airplane_id, SUM(rows_count * columns_count) AS total_seats
+      FROM Airplane_Classes
+      GROUP BY airplane_id) S ON S.airplane_id = F.airplane_id
+-- Tickets sold per arrived flight, in a single pass over the tickets
+LEFT JOIN (SELECT FT.flight_id, FT.departure_date, COUNT(*) AS occupied_seats
+           FROM Flight_Tickets FT
+           JOIN Orders O ON FT.order_code = O.order_code
+           JOIN Flights AF ON FT.flight_id = AF.flight_id AND FT.departure_date = AF.departure_date
+           WHERE O.status IN ('Active', 'Executed')
+             AND AF.status = 'Arrived'
+           GROUP BY FT.flight_id, FT.departure_date) T
+       ON T.flight_id = F.flight_id AND T.departure_date = F.departure_date
+WHERE F.status = 'Arrived';
 
 
 
@@ -112,37 +109,39 @@ ORDER BY order_month;
 -- - Activity Month: Grouping by Year-Month.
 -- - Flights Executed/Cancelled: Simple counts based on status.
 -- - Utilization %: Calculated as (Distinct Days Flown / 30).
--- - Dominant Route: Subquery to find the most frequent route flown by that specific plane in that specific month.
-SELECT 
+-- - Dominant Route: The most frequent route flown by that specific plane in that specific month
+--   (ranked with ROW_NUMBER(); ties go to the alphabetically first route).
+SELECT
     Stats.airplane_id,
     Stats.activity_month,
     Stats.flights_executed,
     Stats.flights_cancelled,
-    -- Utilization: Days flown / 30 days
     ROUND((Stats.days_flown / 30) * 100.0, 2) AS utilization_percentage,
-
-    -- Subquery to find the dominant route (most frequent)
-    (SELECT CONCAT(source_airport, '-', destination_airport)
-     FROM Flights F2
-     WHERE F2.airplane_id = Stats.airplane_id
-       AND DATE_FORMAT(F2.departure_date, '%Y-%m') = Stats.activity_month
-       AND F2.status = 'Arrived'
-     GROUP BY source_airport, destination_airport
-     ORDER BY COUNT(*) DESC
-     LIMIT 1
-    ) AS dominant_route
-
+    Dominant.route AS dominant_route
 FROM (
     SELECT
-        F.airplane_id,
-        DATE_FORMAT(F.departure_date, '%Y-%m') AS activity_month,
-        SUM(CASE WHEN F.status = 'Arrived' THEN 1 ELSE 0 END) AS flights_executed,
-        SUM(CASE WHEN F.status = 'Cancelled' THEN 1 ELSE 0 END) AS flights_cancelled,
-        -- Count distinct days where the plane flew (status='Arrived')
-        COUNT(DISTINCT CASE WHEN F.status = 'Arrived' THEN F.departure_date END) AS days_flown
-    FROM Flights F
-    -- Join is still kept to align with previous logic, though strictly not needed for days count
-    JOIN Flight_Routes R ON F.source_airport = R.source_airport AND F.destination_airport = R.destination_airport
-    GROUP BY F.airplane_id, DATE_FORMAT(F.departure_date, '%Y-%m')
+        airplane_id,
+        DATE_FORMAT(departure_date, '%Y-%m') AS activity_month,
+        SUM(CASE WHEN status = 'Arrived' THEN 1 ELSE 0 END) AS flights_executed,
+        SUM(CASE WHEN status = 'Cancelled' THEN 1 ELSE 0 END) AS flights_cancelled,
+        COUNT(DISTINCT CASE WHEN status = 'Arrived' THEN departure_date END) AS days_flown
+    FROM Flights
+    GROUP BY airplane_id, DATE_FORMAT(departure_date, '%Y-%m')
 ) AS Stats
-ORDER BY Stats.airplane_id, Stats.activity_month;
\ No newline at end of file
+LEFT JOIN (
+    -- Most frequent arrived route per airplane-month
+    SELECT airplane_id, activity_month, route
+    FROM (
+        SELECT
+            airplane_id,
+            DATE_FORMAT(departure_date, '%Y-%m') AS activity_month,
+            CONCAT(source_airport, '-', destination_airport) AS route,
+            ROW_NUMBER() OVER (PARTITION BY airplane_id, DATE_FORMAT(departure_date, '%Y-%m')
+                               ORDER BY COUNT(*) DESC, CONCAT(source_airport, '-', destination_airport)) AS route_rank
+        FROM Flights
+        WHERE status = 'Arrived'
+        GROUP BY airplane_id, DATE_FORMAT(departure_date, '%Y-%m'), source_airport, destination_airport
+    ) AS Ranked_Routes
+    WHERE route_rank = 1
+) AS Dominant ON Dominant.airplane_id = Stats.airplane_id AND Dominant.activity_month = Stats.activity_month
+ORDER BY Stats.airplane_id, Stats.activity_month;
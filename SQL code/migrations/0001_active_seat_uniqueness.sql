@@ -0,0 +1,20 @@
+-- ==========================================================
+-- Active seat uniqueness for Flight_Tickets
+-- Adds the seat_hold column and the uq_active_seat key to Flight_Tickets.
+-- ==========================================================
+
+ALTER TABLE Flight_Tickets ADD COLUMN seat_hold TINYINT DEFAULT 1;
+
+-- Cancelled orders no longer hold their seats
+UPDATE Flight_Tickets FT
+JOIN Orders O ON FT.order_code = O.order_code
+SET FT.seat_hold = NULL
+WHERE O.status IN ('Cancelled by customer', 'Cancelled by system');
+
+-- Any row returned here is an existing double booking and must be resolved before adding the key:
+-- SELECT flight_id, departure_date, row_num, column_num, COUNT(*) AS holders
+-- FROM Flight_Tickets WHERE seat_hold = 1
+-- GROUP BY flight_id, departure_date, row_num, column_num HAVING COUNT(*) > 1;
+
+ALTER TABLE Flight_Tickets
+    ADD UNIQUE KEY uq_active_seat (flight_id, departure_date, row_num, column_num, seat_hold);
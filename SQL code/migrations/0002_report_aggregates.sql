@@ -0,0 +1,65 @@
+-- ==========================================================
+-- Dashboard summary tables
+-- Creates the Report_* tables maintained by code/report_aggregates.py.
+-- After applying it, fill them from the existing data with:
+--     python report_aggregates.py --rebuild
+-- ==========================================================
+
+-- 20. Per-flight occupancy (input of the average occupancy report)
+CREATE TABLE Report_Flight_Occupancy (
+    flight_id VARCHAR(20),
+    departure_date DATE,
+    airplane_id VARCHAR(20),
+    status ENUM('Active','Arrived','Cancelled'),
+    total_seats INT DEFAULT 0,
+    occupied_seats INT DEFAULT 0,
+    PRIMARY KEY (flight_id, departure_date)
+);
+
+-- 21. Running total of the occupancy of arrived flights (single row, id = 1)
+CREATE TABLE Report_Occupancy_Summary (
+    id TINYINT PRIMARY KEY,
+    arrived_flights INT DEFAULT 0,
+    occupancy_pct_sum DOUBLE DEFAULT 0
+);
+
+-- 22. Revenue per aircraft model and class
+CREATE TABLE Report_Revenue (
+    manufacturer VARCHAR(50),
+    size ENUM('Small','Big'),
+    class_type ENUM('Economy','Business'),
+    total_revenue DECIMAL(14, 2) DEFAULT 0,
+    ticket_count INT DEFAULT 0,
+    PRIMARY KEY (manufacturer, size, class_type)
+);
+
+-- 23. Flight minutes per crew member on arrived flights
+CREATE TABLE Report_Crew_Hours (
+    employee_id VARCHAR(20),
+    role ENUM('Pilot','Attendant'),
+    first_name VARCHAR(50),
+    last_name VARCHAR(50),
+    short_minutes INT DEFAULT 0,
+    long_minutes INT DEFAULT 0,
+    PRIMARY KEY (employee_id, role)
+);
+
+-- 24. Orders and cancellations per order month (YYYY-MM)
+CREATE TABLE Report_Monthly_Orders (
+    order_month CHAR(7) PRIMARY KEY,
+    total_orders INT DEFAULT 0,
+    cancelled_orders INT DEFAULT 0
+);
+
+-- 25. Airplane activity per month (YYYY-MM)
+CREATE TABLE Report_Plane_Monthly (
+    airplane_id VARCHAR(20),
+    activity_month CHAR(7),
+    flights_executed INT DEFAULT 0,
+    flights_cancelled INT DEFAULT 0,
+    days_flown INT DEFAULT 0,
+    dominant_route VARCHAR(101), -- 'source-destination'
+    PRIMARY KEY (airplane_id, activity_month)
+);
+
+INSERT INTO Report_Occupancy_Summary (id, arrived_flights, occupancy_pct_sum) VALUES (1, 0, 0);
@@ -0,0 +1,21 @@
+-- ==========================================================
+-- Secondary indexes for the hottest query predicates
+-- (Flight_Tickets (flight_id, departure_date) is already served by the uq_active_seat key,
+--  and Managers.email by its UNIQUE constraint.)
+-- ==========================================================
+
+-- Runway conflict checks: departure_date = ? AND runway_num = ? around departure_time
+CREATE INDEX idx_flights_runway ON Flights (departure_date, runway_num, departure_time);
+
+-- Plane availability: airplane_id = ? AND departure_date = ?
+CREATE INDEX idx_flights_airplane ON Flights (airplane_id, departure_date);
+
+-- Public departures board (status = 'Active', ordered by date/time) and the status scheduler
+CREATE INDEX idx_flights_status ON Flights (status, departure_date, departure_time);
+
+-- Customer order history: customer_email = ?
+CREATE INDEX idx_orders_customer_email ON Orders (customer_email);
+
+-- Crew availability: departure_date = ?
+CREATE INDEX idx_pilots_in_flights_date ON Pilots_In_Flights (departure_date);
+CREATE INDEX idx_attendants_in_flights_date ON Attendants_In_Flights (departure_date);
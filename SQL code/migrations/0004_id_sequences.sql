@@ -0,0 +1,10 @@
+-- ==========================================================
+-- Named ID counters for generated IDs (code/id_sequences.py)
+-- Processes reserve blocks of values from here instead of counting rows; a counter is created
+-- on first use, starting after the highest existing ID.
+-- ==========================================================
+
+CREATE TABLE Id_Sequences (
+    name VARCHAR(50) PRIMARY KEY,
+    next_value BIGINT UNSIGNED NOT NULL
+);
@@ -0,0 +1,185 @@
+"""
+Automatic plane and crew assignment.
+
+Given flights without a plane and/or crew (route, date and time known), the solver picks for each one
+  - a plane: 'Big' for long-haul routes (> 360 min), a plane with a Business class when a business price
+    is set and no 'Big' plane without one; short-haul flights prefer 'Small' planes so the big ones stay
+    free for long-haul routes,
+  - the crew size of that plane (2/3 for Small, 3/6 for Big) of free pilots and attendants, trained for
+    long flights when needed,
+with no overlap with the plane's or the crew's other flights (the schedule and crew interval indexes).
+It is a greedy solver: the most constrained flights (long-haul) are assigned first, then the others in
+departure order, and each time the least-used plane and the crew with the fewest flight hours are taken,
+the hours counted as in the crew-hours report (q3) plus the flights already scheduled. That balances
+hours across the crew and assigns thousands of flights in well under a second.
+
+The bulk schedule import (bulk_import.py) uses it for rows that leave the plane or crew empty, and the
+add-flight wizard uses pick_plane / pick_crew to pre-select a suggestion.
+"""
+from schedule_index import to_datetime
+from crew_index import CREW_ROLES
+
+LONG_HAUL_MINUTES = 360
+CREW_SIZE = {'Big': (3, 6), 'Small': (2, 3)}  # plane size -> (pilots, attendants)
+
+# Flight minutes per crew member: flown (report summary) plus scheduled flights
+CREW_MINUTES_QUERY = """
+    SELECT crew_id, role, SUM(minutes) AS minutes
+    FROM (
+        SELECT employee_id AS crew_id, role, short_minutes + long_minutes AS minutes
+        FROM Report_Crew_Hours
+
+        UNION ALL
+
+        SELECT PIF.pilot_id, 'Pilot', R.flight_duration
+        FROM Pilots_In_Flights PIF
+        JOIN Flights F ON PIF.flight_id = F.flight_id AND PIF.departure_date = F.departure_date
+        JOIN Flight_Routes R ON F.source_airport = R.source_airport AND F.destination_airport = R.destination_airport
+        WHERE F.status IN ('Active', 'Full Capacity')
+
+        UNION ALL
+
+        SELECT AIF.attendant_id, 'Attendant', R.flight_duration
+        FROM Attendants_In_Flights AIF
+        JOIN Flights F ON AIF.flight_id = F.flight_id AND AIF.departure_date = F.departure_date
+        JOIN Flight_Routes R ON F.source_airport = R.source_airport AND F.destination_airport = R.destination_airport
+        WHERE F.status IN ('Active', 'Full Capacity')
+    ) T
+    GROUP BY crew_id, role
+"""
+
+
+def load_planes(cursor):
+    """Returns: dict: airplane_id -> {'airplane_id', 'size', 'classes' (set of class types)}."""
+    cursor.execute("""
+        SELECT A.airplane_id, A.size, AC.class_type
+        FROM Airplanes A
+        LEFT JOIN Airplane_Classes AC ON A.airplane_id = AC.airplane_id
+    """)
+    planes = {}
+    for row in cursor.fetchall():
+        plane = planes.setdefault(row['airplane_id'],
+                                  {'airplane_id': row['airplane_id'], 'size': row['size'], 'classes': set()})
+        if row['class_type']:
+            plane['classes'].add(row['class_type'])
+    return planes
+
+
+def load_crew_minutes(cursor):
+    """Returns: dict: (role, crew_id) -> flight minutes (flown and scheduled)."""
+    cursor.execute(CREW_MINUTES_QUERY)
+    return {(row['role'], row['crew_id']): int(row['minutes'] or 0) for row in cursor.fetchall()}
+
+
+def plane_fits(plane, long_haul, has_business=None):
+    """
+    param has_business (bool|None): Whether the flight has a business price (None: not known yet).
+    Returns: bool: True if the plane may operate the flight.
+    """
+    if long_haul and plane['size'] != 'Big':
+        return False
+    if has_business is None:
+        return True
+    if has_business:
+        return 'Business' in plane.get('classes', {'Business'})
+    return plane['size'] != 'Big'  # A Big plane needs a business price
+
+
+def pick_plane(planes, long_haul, has_business=None, plane_minutes=None):
+    """
+    Picks a plane among free candidates: Small before Big on short-haul flights, then the least used.
+    param planes (list[dict]): Free planes (with 'airplane_id' and 'size').
+    param plane_minutes (dict, optional): airplane_id -> minutes already assigned (balances planes).
+    Returns: dict|None: The chosen plane, or None if none fits.
+    """
+    plane_minutes = plane_minutes or {}
+    fitting = [p for p in planes if plane_fits(p, long_haul, has_business)]
+    if not fitting:
+        return None
+    return min(fitting, key=lambda p: (not long_haul and p['size'] == 'Big',
+                                       plane_minutes.get(p['airplane_id'], 0), p['airplane_id']))
+
+
+def pick_crew(members, role, count, long_haul, crew_minutes=None):
+    """
+    Picks `count` crew members among free candidates: the fewest flight minutes first; on short-haul flights,
+    untrained members before trained ones at equal minutes.
+    param members (list[dict]): Free Pilots / Flight_Attendants rows.
+    param role (str): 'Pilot' or 'Attendant'.
+    param crew_minutes (dict, optional): (role, crew_id) -> flight minutes.
+    Returns: list[str]|None: The chosen IDs, or None if there are not enough qualified members.
+    """
+    crew_minutes = crew_minutes or {}
+    id_col = CREW_ROLES[role][1]
+    qualified = [m for m in members if not long_haul or m.get('long_flight_training')]
+    if len(qualified) < count:
+        return None
+    qualified.sort(key=lambda m: (crew_minutes.get((role, m[id_col]), 0),
+                                  bool(m.get('long_flight_training')) and not long_haul, m[id_col]))
+    return [m[id_col] for m in qualified[:count]]
+
+
+class AssignmentSolver:
+    """
+    Greedy plane and crew assignment against a schedule index and a crew index.
+    The indexes hold the existing flights; the caller adds every flight it accepts to them (and calls
+    record()), so later assignments see earlier ones.
+    """
+
+    def __init__(self, schedule, crew, planes, crew_minutes):
+        self.schedule = schedule
+        self.crew = crew
+        self.planes = planes
+        self.crew_minutes = dict(crew_minutes)
+        self.plane_minutes = {}
+
+    @staticmethod
+    def order_key(flight):
+        """Sort key of the assignment order: long-haul flights first, then by departure."""
+        return (int(flight['duration']) <= LONG_HAUL_MINUTES,
+                to_datetime(flight['departure_date'], flight['departure_time']))
+
+    def assign(self, flight):
+        """
+        Completes a flight's plane and crew (fields already set are kept).
+        param flight (dict): departure_date, departure_time, duration, and optionally airplane_id, pilots,
+                             attendants and has_business.
+        Returns: tuple[dict|None, str|None]: ({'airplane_id', 'pilots', 'attendants'}, None), or (None, reason).
+        """
+        date, time, duration = flight['departure_date'], flight['departure_time'], int(flight['duration'])
+        long_haul = duration > LONG_HAUL_MINUTES
+
+        airplane_id = flight.get('airplane_id')
+        if not airplane_id:
+            free = [p for p in self.planes.values()
+                    if not self.schedule.plane_conflicts(None, p['airplane_id'], date, time, duration)]
+            plane = pick_plane(free, long_haul, flight.get('has_business'), self.plane_minutes)
+            if plane is None:
+                return None, "No suitable aircraft is free for this flight."
+            airplane_id = plane['airplane_id']
+        if airplane_id not in self.planes:
+            return None, f"Plane {airplane_id} not found."
+
+        req_pilots, req_attendants = CREW_SIZE.get(self.planes[airplane_id]['size'], CREW_SIZE['Small'])
+        assignment = {'airplane_id': airplane_id}
+        for role, key, count in (('Pilot', 'pilots', req_pilots), ('Attendant', 'attendants', req_attendants)):
+            if flight.get(key):
+                assignment[key] = flight[key]
+                continue
+            id_col = CREW_ROLES[role][1]
+            members = self.crew.members(role)
+            busy = self.crew.busy(role, [m[id_col] for m in members], date, time, duration)
+            free = [m for m in members if m[id_col] not in busy]
+            chosen = pick_crew(free, role, count, long_haul, self.crew_minutes)
+            if chosen is None:
+                return None, f"Not enough free{' long-haul trained' if long_haul else ''} {role.lower()}s (need {count})."
+            assignment[key] = chosen
+        return assignment, None
+
+    def record(self, flight, airplane_id, pilot_ids, attendant_ids):
+        """Counts an accepted flight's minutes for its plane and crew (keeps the balancing up to date)."""
+        duration = int(flight['duration'])
+        self.plane_minutes[airplane_id] = self.plane_minutes.get(airplane_id, 0) + duration
+        for role, ids in (('Pilot', pilot_ids), ('Attendant', attendant_ids)):
+            for crew_id in ids:
+                self.crew_minutes[(role, crew_id)] = self.crew_minutes.get((role, crew_id), 0) + duration
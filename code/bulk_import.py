@@ -0,0 +1,352 @@
+"""
+Bulk import of a season schedule (flights with their prices and crew).
+
+The schedule is a CSV file with a header row, or a JSON list of objects, with the fields
+    flight_id, departure_date (YYYY-MM-DD), departure_time (HH:MM), source_airport, destination_airport,
+    airplane_id, runway_num, price_economy, price_business, pilots, attendants
+where pilots / attendants are lists of IDs (in CSV: one cell, IDs separated by ';'). Rows that leave
+airplane_id, pilots or attendants empty are completed by the assignment solver (assignment_solver.py).
+
+The whole batch is validated in one pass, with the rules of the add-flight wizard: unique flight IDs,
+known route / airplane / crew, business price for big planes, long-haul flights on big planes with trained
+crew, crew size per plane size, and no runway, aircraft or crew conflicts with existing flights or with
+earlier rows of the same file. The existing flights of the season are read once (rows locked) into the
+schedule and crew interval indexes, and every accepted row is added to them, so each check is a binary
+search instead of a query. Every violation is reported; the valid rows are inserted with multi-row
+inserts in one transaction.
+
+Usage:
+    python bulk_import.py season.csv              # import the valid rows, list the rejected ones
+    python bulk_import.py season.json --dry-run   # only validate (and show the automatic assignments)
+    python bulk_import.py season.csv --no-auto-assign
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+from datetime import datetime
+from utils import (db_tx, schedule_config, schedule_index, crew_config, crew_index, invalidate_flight_board,
+                   invalidate_prices)
+from schedule_index import ScheduleIndex
+from crew_index import CrewIndex
+from report_aggregates import record_flights_created
+from assignment_solver import (AssignmentSolver, CREW_SIZE, LONG_HAUL_MINUTES, load_crew_minutes,
+                               load_planes)
+
+FIELDS = ['flight_id', 'departure_date', 'departure_time', 'source_airport', 'destination_airport',
+          'airplane_id', 'runway_num', 'price_economy', 'price_business', 'pilots', 'attendants']
+REQUIRED_FIELDS = ['flight_id', 'departure_date', 'departure_time', 'source_airport', 'destination_airport',
+                   'runway_num', 'price_economy']
+RUNWAYS = {'R1', 'R2', 'R3', 'R4', 'R5'}
+
+# Rows per multi-row INSERT statement (keeps each statement well under max_allowed_packet)
+INSERT_CHUNK_SIZE = 500
+
+
+def _id_list(value):
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = value.replace(',', ';').split(';')
+    return [str(v).strip() for v in value if str(v).strip()]
+
+
+def read_records(stream, filename):
+    """
+    Reads the records of an upload or import file (also used by onboard_crew.py).
+    param stream (file): The file contents (text or bytes).
+    param filename (str): Its name; '.json' files are read as JSON, anything else as CSV with a header row.
+    Returns: list[dict]: One dict per record.
+    Raises: ValueError: If the file can't be parsed.
+    """
+    text = stream.read()
+    if isinstance(text, bytes):
+        text = text.decode('utf-8-sig')
+    if filename.lower().endswith('.json'):
+        try:
+            records = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e}")
+        if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+            raise ValueError("The JSON file must be a list of objects.")
+        return records
+    return list(csv.DictReader(io.StringIO(text)))
+
+
+def parse_schedule(stream, filename):
+    """
+    Reads a schedule file.
+    param stream (file): The file contents (text or bytes).
+    param filename (str): Its name; '.json' files are read as JSON, anything else as CSV.
+    Returns: list[dict]: One dict per flight, with the FIELDS keys (missing fields are None).
+    Raises: ValueError: If the file can't be parsed.
+    """
+    rows = []
+    for record in read_records(stream, filename):
+        row = {field: record.get(field) for field in FIELDS}
+        for field in FIELDS:
+            if isinstance(row[field], str):
+                row[field] = row[field].strip() or None
+        row['pilots'] = _id_list(row['pilots'])
+        row['attendants'] = _id_list(row['attendants'])
+        rows.append(row)
+    return rows
+
+
+def _parse_row(row, now):
+    """
+    Checks the fields of one row on their own and converts them.
+    Returns: list[str]: The violations found (the row is updated in place with parsed values).
+    """
+    errors = [f"Missing {field}." for field in REQUIRED_FIELDS if row.get(field) in (None, '')]
+    if errors:
+        return errors
+
+    try:
+        departure = datetime.strptime(f"{row['departure_date']} {str(row['departure_time'])[:5]}", '%Y-%m-%d %H:%M')
+        row['departure_date'] = departure.strftime('%Y-%m-%d')
+        row['departure_time'] = departure.strftime('%H:%M')
+        if departure < now:
+            errors.append("Departure is in the past.")
+    except ValueError:
+        errors.append("Invalid departure date or time (expected YYYY-MM-DD and HH:MM).")
+
+    for field in ('price_economy', 'price_business'):
+        if row[field] in (None, ''):
+            row[field] = None
+            continue
+        try:
+            row[field] = float(row[field])
+            if row[field] <= 0:
+                errors.append(f"{field} must be positive.")
+        except (TypeError, ValueError):
+            errors.append(f"Invalid {field}.")
+
+    row['source_airport'] = str(row['source_airport']).upper()
+    row['destination_airport'] = str(row['destination_airport']).upper()
+    row['runway_num'] = str(row['runway_num']).upper()
+    if row['runway_num'] not in RUNWAYS:
+        errors.append(f"Unknown runway {row['runway_num']}.")
+    for role in ('pilots', 'attendants'):
+        if len(set(row[role])) != len(row[role]):
+            errors.append(f"The same crew member is listed twice in {role}.")
+    return errors
+
+
+def _existing_flight_ids(cursor, flight_ids):
+    existing = set()
+    flight_ids = sorted(flight_ids)
+    for i in range(0, len(flight_ids), INSERT_CHUNK_SIZE):
+        chunk = flight_ids[i:i + INSERT_CHUNK_SIZE]
+        cursor.execute(f"SELECT DISTINCT flight_id FROM Flights WHERE flight_id IN ({', '.join(['%s'] * len(chunk))})",
+                       tuple(chunk))
+        existing.update(row['flight_id'] for row in cursor.fetchall())
+    return existing
+
+
+def validate_schedule(cursor, rows, lock=False, auto_assign=True):
+    """
+    Validates a parsed schedule against the database and against itself.
+    Rows with a plane and crew are checked first, in file order; rows that leave them empty are then
+    completed by the assignment solver (see assignment_solver.py) and checked the same way. Each valid row
+    is added to the indexes, so a later row that conflicts with it is the one rejected.
+    param lock (bool): Lock the existing flights of the season and the crew (inside a transaction),
+                       so the result still holds when the valid rows are inserted.
+    param auto_assign (bool): Assign a plane / crew to rows that leave them empty (else they are rejected).
+    Returns: tuple[list, list]: (valid rows, violations) - each violation is (row number, flight ID, message),
+             row numbers counting from 1 for the first flight.
+    """
+    now = datetime.now()
+    violations, candidates = [], []
+    for number, row in enumerate(rows, start=1):
+        errors = _parse_row(row, now)
+        if errors:
+            violations += [(number, row.get('flight_id'), error) for error in errors]
+        else:
+            candidates.append((number, row))
+    if not candidates:
+        return [], violations
+
+    # Reference data, read once for the whole batch
+    cursor.execute("SELECT source_airport, destination_airport, flight_duration FROM Flight_Routes")
+    routes = {(r['source_airport'], r['destination_airport']): int(r['flight_duration']) for r in cursor.fetchall()}
+    planes = load_planes(cursor)
+    existing_ids = _existing_flight_ids(cursor, {row['flight_id'] for _, row in candidates})
+
+    unassigned = [(number, row) for number, row in candidates
+                  if not (row['airplane_id'] and row['pilots'] and row['attendants'])]
+    first_date = min(row['departure_date'] for _, row in candidates)
+    last_date = max(row['departure_date'] for _, row in candidates)
+    schedule = ScheduleIndex.load_window(cursor, first_date, lock=lock, last_date=last_date, **schedule_config)
+    if auto_assign and unassigned:
+        crew_ids = None  # The solver may pick anyone
+    else:
+        crew_ids = {'Pilot': [p for _, row in candidates for p in row['pilots']],
+                    'Attendant': [a for _, row in candidates for a in row['attendants']]}
+    crew = CrewIndex.load_for(cursor, first_date, crew_ids, lock=lock, last_date=last_date, **crew_config)
+    solver = AssignmentSolver(schedule, crew, planes, load_crew_minutes(cursor) if auto_assign and unassigned else {})
+
+    # Explicit rows keep file order; rows to complete follow in the solver's order
+    for _, row in candidates:
+        row['duration'] = routes.get((row['source_airport'], row['destination_airport']))
+    unassigned_numbers = {number for number, _ in unassigned}
+    assigned = [(number, row) for number, row in candidates if number not in unassigned_numbers]
+    if auto_assign:
+        unassigned.sort(key=lambda c: AssignmentSolver.order_key(c[1]) if c[1]['duration'] else (True, datetime.max))
+
+    valid, seen_ids = [], set()
+    for number, row in assigned + unassigned:
+        f_id, date, time, duration = row['flight_id'], row['departure_date'], row['departure_time'], row['duration']
+        errors = []
+        if f_id in existing_ids:
+            errors.append(f"Flight ID {f_id} is already in use.")
+        elif f_id in seen_ids:
+            errors.append(f"Flight ID {f_id} appears more than once in the file.")
+        if duration is None:
+            errors.append(f"Route {row['source_airport']}-{row['destination_airport']} not found.")
+            violations += [(number, f_id, error) for error in errors]
+            continue
+
+        if auto_assign and not (row['airplane_id'] and row['pilots'] and row['attendants']):
+            assignment, reason = solver.assign(dict(row, has_business=bool(row['price_business'])))
+            if reason:
+                violations += [(number, f_id, error) for error in errors + [f"Auto-assignment failed: {reason}"]]
+                continue
+            row.update(assignment)
+            row['auto_assigned'] = True
+        if not row['airplane_id']:
+            errors.append("Missing airplane_id.")
+        plane = planes.get(row['airplane_id'])
+        if row['airplane_id'] and plane is None:
+            errors.append(f"Plane {row['airplane_id']} not found.")
+        if plane is None:
+            violations += [(number, f_id, error) for error in errors]
+            continue
+
+        size = plane['size']
+        is_long_haul = duration > LONG_HAUL_MINUTES
+        if is_long_haul and size != 'Big':
+            errors.append(f"Long-haul route ({duration} min) requires a Big plane.")
+        if size == 'Big' and not row['price_business']:
+            errors.append("Business Class price is mandatory for this aircraft type (Big).")
+        if row['price_business'] and 'Business' not in plane['classes']:
+            errors.append(f"Plane {row['airplane_id']} has no Business class.")
+
+        req_pilots, req_attendants = CREW_SIZE.get(size, CREW_SIZE['Small'])
+        if len(row['pilots']) != req_pilots:
+            errors.append(f"Crew mismatch: {size} plane requires {req_pilots} Pilots ({len(row['pilots'])} listed).")
+        if len(row['attendants']) != req_attendants:
+            errors.append(f"Crew mismatch: {size} plane requires {req_attendants} Attendants "
+                          f"({len(row['attendants'])} listed).")
+
+        for flight_id, departure in schedule.runway_conflicts(None, date, time, row['runway_num']):
+            errors.append(f"Runway Collision: Flight {flight_id} departs from {row['runway_num']} "
+                          f"at {departure.strftime('%Y-%m-%d %H:%M')}.")
+        for flight_id in schedule.plane_conflicts(None, row['airplane_id'], date, time, duration):
+            errors.append(f"Aircraft Conflict: Plane {row['airplane_id']} is busy with Flight {flight_id}.")
+        for role, ids in (('Pilot', row['pilots']), ('Attendant', row['attendants'])):
+            for crew_id in crew.unqualified(role, ids, is_long_haul):
+                errors.append(f"{role} {crew_id} is unknown or lacks long-haul training.")
+            for crew_id, flight_id in crew.busy(role, ids, date, time, duration).items():
+                errors.append(f"Crew Conflict: {role} {crew_id} is on duty with Flight {flight_id}.")
+
+        if errors:
+            violations += [(number, f_id, error) for error in errors]
+            continue
+        seen_ids.add(f_id)
+        schedule.add_flight(f_id, date, time, duration, row['airplane_id'], row['runway_num'])
+        crew.add_flight(f_id, date, time, duration, row['pilots'], row['attendants'])
+        solver.record(row, row['airplane_id'], row['pilots'], row['attendants'])
+        valid.append(row)
+
+    violations.sort(key=lambda v: v[0])
+    return valid, violations
+
+
+def _insert_chunked(cursor, sql, params):
+    for i in range(0, len(params), INSERT_CHUNK_SIZE):
+        cursor.executemany(sql, params[i:i + INSERT_CHUNK_SIZE])
+
+
+def insert_flights(cursor, rows):
+    """Inserts validated rows (flights, crew, prices, report summaries) with multi-row inserts."""
+    _insert_chunked(cursor, """
+        INSERT INTO Flights (flight_id, departure_date, airplane_id, source_airport, destination_airport, status, departure_time, runway_num)
+        VALUES (%s, %s, %s, %s, %s, 'Active', %s, %s)
+    """, [(r['flight_id'], r['departure_date'], r['airplane_id'], r['source_airport'], r['destination_airport'],
+           r['departure_time'], r['runway_num']) for r in rows])
+    _insert_chunked(cursor, """
+        INSERT INTO Pilots_In_Flights (pilot_id, flight_id, departure_date) VALUES (%s, %s, %s)
+    """, [(pid, r['flight_id'], r['departure_date']) for r in rows for pid in r['pilots']])
+    _insert_chunked(cursor, """
+        INSERT INTO Attendants_In_Flights (attendant_id, flight_id, departure_date) VALUES (%s, %s, %s)
+    """, [(aid, r['flight_id'], r['departure_date']) for r in rows for aid in r['attendants']])
+    _insert_chunked(cursor, """
+        INSERT INTO Classes_In_Flights (flight_id, departure_date, class_type, airplane_id, price)
+        VALUES (%s, %s, %s, %s, %s)
+    """, [(r['flight_id'], r['departure_date'], class_type, r['airplane_id'], price)
+          for r in rows
+          for class_type, price in (('Economy', r['price_economy']), ('Business', r['price_business']))
+          if price])
+    record_flights_created(cursor, [(r['flight_id'], r['departure_date'], r['airplane_id']) for r in rows])
+
+
+def import_schedule(rows, dry_run=False, auto_assign=True):
+    """
+    Validates a parsed schedule and inserts its valid rows in one transaction.
+    param rows (list[dict]): The output of parse_schedule (automatic assignments are written back into it).
+    param dry_run (bool): Only validate; nothing is written.
+    param auto_assign (bool): Complete rows without a plane / crew with the assignment solver.
+    Returns: tuple[int, list]: (number of flights inserted, or that would be inserted; violations).
+    """
+    with db_tx() as tx:
+        valid, violations = validate_schedule(tx.cursor, rows, lock=not dry_run, auto_assign=auto_assign)
+        if dry_run or not valid:
+            tx.rollback()
+            return len(valid), violations
+        insert_flights(tx.cursor, valid)
+
+    for r in valid:
+        schedule_index.add_flight(r['flight_id'], r['departure_date'], r['departure_time'], r['duration'],
+                                  r['airplane_id'], r['runway_num'])
+        crew_index.add_flight(r['flight_id'], r['departure_date'], r['departure_time'], r['duration'],
+                              r['pilots'], r['attendants'])
+        invalidate_prices(r['flight_id'])
+    for date, source, dest in {(r['departure_date'], r['source_airport'], r['destination_airport']) for r in valid}:
+        invalidate_flight_board(date, source, dest)
+    return len(valid), violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import of a season schedule (CSV or JSON).")
+    parser.add_argument('path', help="Schedule file (.csv or .json)")
+    parser.add_argument('--dry-run', action='store_true', help="Only validate, don't insert anything")
+    parser.add_argument('--no-auto-assign', action='store_true',
+                        help="Reject rows without a plane / crew instead of assigning them")
+    args = parser.parse_args()
+
+    try:
+        with open(args.path, encoding='utf-8-sig') as f:
+            rows = parse_schedule(f, os.path.basename(args.path))
+    except (OSError, ValueError) as e:
+        print(f"Could not read {args.path}: {e}")
+        return 1
+
+    count, violations = import_schedule(rows, dry_run=args.dry_run, auto_assign=not args.no_auto_assign)
+    rejected_numbers = {number for number, _, _ in violations}
+    for number, row in enumerate(rows, start=1):
+        if row.get('auto_assigned') and number not in rejected_numbers:
+            print(f"row {number} ({row['flight_id']}): assigned plane {row['airplane_id']}, "
+                  f"pilots {', '.join(row['pilots'])}, attendants {', '.join(row['attendants'])}")
+    for number, flight_id, message in violations:
+        print(f"row {number} ({flight_id}): {message}")
+    rejected = len(rejected_numbers)
+    verb = "would be imported" if args.dry_run else "imported"
+    print(f"{len(rows)} rows read, {count} flights {verb}, {rejected} rows rejected.")
+    return 1 if violations else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
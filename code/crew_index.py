@@ -0,0 +1,185 @@
+import threading
+import time
+from datetime import date, timedelta
+from schedule_index import IntervalIndex, to_datetime
+
+# Crew tables per role: (table, id column)
+CREW_ROLES = {
+    'Pilot': ('Pilots', 'pilot_id'),
+    'Attendant': ('Flight_Attendants', 'attendant_id'),
+}
+# Crew ID column of each role in DUTY_QUERY
+DUTY_COLUMNS = {'Pilot': 'PIF.pilot_id', 'Attendant': 'AIF.attendant_id'}
+
+# Duties of every crew member on non-cancelled flights departing within [%s, %s]
+DUTY_QUERY = """
+    SELECT 'Pilot' AS role, PIF.pilot_id AS crew_id, F.flight_id, F.departure_date, F.departure_time, R.flight_duration
+    FROM Pilots_In_Flights PIF
+    JOIN Flights F ON PIF.flight_id = F.flight_id AND PIF.departure_date = F.departure_date
+    JOIN Flight_Routes R ON F.source_airport = R.source_airport AND F.destination_airport = R.destination_airport
+    WHERE F.status != 'Cancelled' AND F.departure_date BETWEEN %s AND %s {pilot_filter}
+    UNION ALL
+    SELECT 'Attendant', AIF.attendant_id, F.flight_id, F.departure_date, F.departure_time, R.flight_duration
+    FROM Attendants_In_Flights AIF
+    JOIN Flights F ON AIF.flight_id = F.flight_id AND AIF.departure_date = F.departure_date
+    JOIN Flight_Routes R ON F.source_airport = R.source_airport AND F.destination_airport = R.destination_airport
+    WHERE F.status != 'Cancelled' AND F.departure_date BETWEEN %s AND %s {attendant_filter}
+"""
+
+# Longest stretch a duty can reach back from (flight time + rest); bounds the private re-check window
+DUTY_WINDOW_DAYS = 2
+
+
+class CrewIndex:
+    """
+    In-process index of crew duty intervals, used to find who is free for a new flight.
+    A duty covers [departure, departure + flight_duration + rest_buffer_minutes); a crew member is free for
+    a new flight if none of their duties overlaps the new flight's own duty interval. Every crew member has
+    a sorted timeline (IntervalIndex), so each check is a binary search.
+    The roster (Pilots / Flight_Attendants rows) and duties are loaded on first use and rebuilt after
+    `ttl` seconds; this process's writes update them directly. The final assignment re-checks the chosen
+    crew with load_for(), inside the writing transaction and with their rows locked.
+    """
+
+    def __init__(self, ttl=300, rest_buffer_minutes=120):
+        self.ttl = ttl
+        self.rest_buffer = timedelta(minutes=rest_buffer_minutes)
+        self._duties = IntervalIndex()       # key: (role, crew_id)
+        self._roster = {role: {} for role in CREW_ROLES}  # role -> crew_id -> row
+        self._loaded_at = None
+        self._lock = threading.RLock()
+
+    def _add_duty(self, role, crew_id, flight_id, departure_date, departure_time, duration):
+        start = to_datetime(departure_date, departure_time)
+        end = start + timedelta(minutes=int(duration)) + self.rest_buffer
+        self._duties.add((role, crew_id), start, end, (flight_id, str(departure_date)))
+
+    def _add_duty_rows(self, rows):
+        for row in rows:
+            self._add_duty(row['role'], row['crew_id'], row['flight_id'], row['departure_date'],
+                           row['departure_time'], row['flight_duration'])
+
+    def _duty_interval(self, departure_date, departure_time, duration):
+        start = to_datetime(departure_date, departure_time)
+        return start, start + timedelta(minutes=int(duration)) + self.rest_buffer
+
+    def load(self, cursor):
+        """
+        (Re)builds the roster and the duties of the last DUTY_WINDOW_DAYS days onwards (flights can't be added
+        in the past, and older duties end before any new flight starts).
+        """
+        roster = {}
+        for role, (table, id_col) in CREW_ROLES.items():
+            cursor.execute(f"SELECT * FROM {table}")
+            roster[role] = {row[id_col]: row for row in cursor.fetchall()}
+        since = date.today() - timedelta(days=DUTY_WINDOW_DAYS)
+        cursor.execute(DUTY_QUERY.format(pilot_filter='', attendant_filter=''),
+                       (since, date.max, since, date.max))
+        rows = cursor.fetchall()
+
+        with self._lock:
+            self._roster = roster
+            self._duties = IntervalIndex()
+            self._add_duty_rows(rows)
+            self._loaded_at = time.monotonic()
+
+    def _ensure_loaded(self, cursor):
+        if self._loaded_at is None or time.monotonic() - self._loaded_at >= self.ttl:
+            self.load(cursor)
+
+    @classmethod
+    def load_for(cls, cursor, departure_date, crew, lock=False, last_date=None, **settings):
+        """
+        Builds a private index for the given crew members around `departure_date` (or the range
+        `departure_date`..`last_date`).
+        With lock=True the crew rows are locked (FOR UPDATE, in a fixed order) and their duties are read
+        with a locking read, so they reflect every committed assignment and no concurrent transaction can
+        assign the same people until the caller's transaction ends.
+        param crew (dict|None): role -> list of crew IDs (None: every crew member, e.g. for the assignment solver).
+        Returns: CrewIndex
+        """
+        index = cls(**settings)
+        since = to_datetime(departure_date, '00:00').date() - timedelta(days=DUTY_WINDOW_DAYS)
+        until = to_datetime(last_date or departure_date, '00:00').date() + timedelta(days=DUTY_WINDOW_DAYS)
+
+        filters, params = {}, []
+        for role, (table, id_col) in CREW_ROLES.items():
+            if crew is None:
+                cursor.execute(f"SELECT * FROM {table} ORDER BY {id_col}" + (" FOR UPDATE" if lock else ""))
+                index._roster[role] = {row[id_col]: row for row in cursor.fetchall()}
+                filters[role] = ""
+                params += [since, until]
+                continue
+            ids = sorted(set(crew.get(role, [])))
+            params += [since, until] + ids
+            if not ids:
+                filters[role] = "AND FALSE"
+                continue
+            placeholders = ", ".join(["%s"] * len(ids))
+            cursor.execute(f"SELECT * FROM {table} WHERE {id_col} IN ({placeholders}) ORDER BY {id_col}"
+                           + (" FOR UPDATE" if lock else ""), tuple(ids))
+            index._roster[role] = {row[id_col]: row for row in cursor.fetchall()}
+            filters[role] = f"AND {DUTY_COLUMNS[role]} IN ({placeholders})"
+
+        cursor.execute(DUTY_QUERY.format(pilot_filter=filters['Pilot'], attendant_filter=filters['Attendant'])
+                       + (" LOCK IN SHARE MODE" if lock else ""), tuple(params))
+        index._add_duty_rows(cursor.fetchall())
+        index._loaded_at = time.monotonic()
+        return index
+
+    def add_flight(self, flight_id, departure_date, departure_time, duration, pilot_ids, attendant_ids):
+        """Records the duties of a newly created flight (no-op until the index is first loaded)."""
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            for role, ids in (('Pilot', pilot_ids), ('Attendant', attendant_ids)):
+                for crew_id in ids:
+                    self._add_duty(role, crew_id, flight_id, departure_date, departure_time, duration)
+
+    def remove_flight(self, flight_id, departure_date):
+        """Frees the crew of a cancelled flight."""
+        with self._lock:
+            self._duties.remove((flight_id, str(departure_date)))
+
+    def invalidate(self):
+        """Forces a reload on next use (e.g. after a crew member was added)."""
+        with self._lock:
+            self._loaded_at = None
+
+    def busy(self, role, crew_ids, departure_date, departure_time, duration):
+        """
+        Returns: dict: crew_id -> flight_id of a conflicting duty, for each of `crew_ids` that is not free.
+        """
+        start, end = self._duty_interval(departure_date, departure_time, duration)
+        conflicts = {}
+        with self._lock:
+            for crew_id in crew_ids:
+                hits = self._duties.overlapping((role, crew_id), start, end)
+                if hits:
+                    conflicts[crew_id] = hits[0][2][0]
+        return conflicts
+
+    def members(self, role):
+        """Returns: list[dict]: The roster rows of a role, ordered by ID."""
+        with self._lock:
+            return [row for _, row in sorted(self._roster[role].items())]
+
+    def unqualified(self, role, crew_ids, long_haul):
+        """Returns: list[str]: Crew IDs that are unknown, or lack long-haul training when it is required."""
+        with self._lock:
+            roster = self._roster[role]
+            return [crew_id for crew_id in crew_ids
+                    if crew_id not in roster or (long_haul and not roster[crew_id].get('long_flight_training'))]
+
+    def available(self, cursor, role, departure_date, departure_time, duration, long_haul=False):
+        """
+        Lists the crew members of a role who are free for the new flight.
+        param long_haul (bool): Only return crew with long-haul training.
+        Returns: list[dict]: Their Pilots / Flight_Attendants rows, ordered by ID.
+        """
+        start, end = self._duty_interval(departure_date, departure_time, duration)
+        with self._lock:
+            self._ensure_loaded(cursor)
+            return [row for crew_id, row in sorted(self._roster[role].items())
+                    if (not long_haul or row.get('long_flight_training'))
+                    and not self._duties.overlapping((role, crew_id), start, end)]
@@ -0,0 +1,593 @@
+"""
+Synthetic production-scale dataset for performance work.
+
+Generates airports and routes, a fleet with seat maps, pilots and attendants, registered and guest customers,
+and `days` of daily flights with their prices, crew, orders and tickets. Everything is streamed into the
+database with LOAD DATA LOCAL INFILE (or multi-row INSERTs when the server doesn't allow local files), then
+the dashboard summary tables are rebuilt. The data follows the application's rules:
+  - departures on one runway are at least the runway buffer apart (schedule_config), planes get their
+    turnaround and crew their rest time between flights; long-haul flights (> 360 min) fly Big planes with
+    trained crew, and the crew size follows the plane size (CREW_SIZE),
+  - most flights are 60-95% full and some sell out; an order holds 1-4 seats booked days to months ahead,
+    and future flights only have the orders placed before today,
+  - a share of the orders and of the flights is cancelled, with the prices and seat release the application
+    applies (5% fee / full refund); past flights are 'Arrived' with 'Executed' orders.
+Generated keys start with GEN_PREFIX (airports with GEN_AIRPORT_PREFIX, customer e-mails end with GEN_DOMAIN),
+so the data lives next to the seed data of FLYTAU_Insert_Values.sql and --cleanup removes it again.
+
+Usage (against a local/test database):
+    python data_generator.py --scale small                  # 2 months, ~40 flights/day
+    python data_generator.py --scale large --seed 7         # 2 years, 3000 planes, millions of tickets
+    python data_generator.py --scale medium --days 90 --method insert
+    python data_generator.py --cleanup
+"""
+import argparse
+import bisect
+import heapq
+import itertools
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+import mysql.connector
+from utils import db_config, db_cur, db_tx, schedule_config, crew_config
+from assignment_solver import CREW_SIZE, LONG_HAUL_MINUTES
+from report_aggregates import rebuild_report_aggregates
+
+GEN_PREFIX = 'G'
+GEN_AIRPORT_PREFIX = 'Q~'    # '~' never occurs in a real airport code, so a real 'Q..' airport is never matched
+GEN_DOMAIN = '@gen.flytau.test'
+
+# Dataset sizes; any field can be overridden on the command line
+SCALES = {
+    'small': {'airports': 30, 'routes': 200, 'airplanes': 80, 'days': 60, 'flights_per_day': 40,
+              'customers': 5000},
+    'medium': {'airports': 150, 'routes': 2000, 'airplanes': 800, 'days': 365, 'flights_per_day': 100,
+               'customers': 200000},
+    'large': {'airports': 600, 'routes': 10000, 'airplanes': 3000, 'days': 730, 'flights_per_day': 120,
+              'customers': 1000000},
+}
+
+# Behaviour of the generated traffic
+traffic_config = {
+    "past_share": 0.75,             # Part of the date range before today (the rest is future flights)
+    "long_haul_share": 0.25,        # Routes longer than LONG_HAUL_MINUTES
+    "big_plane_share": 0.35,        # Part of the fleet that is Big
+    "sold_out_share": 0.08,         # Flights that sell every seat
+    "flight_cancel_rate": 0.015,    # Flights cancelled by a manager
+    "order_cancel_rate": 0.06,      # Orders cancelled by the customer
+    "registered_share": 0.65,       # Orders placed by registered customers (the rest by guests)
+    "mean_lead_days": 35,           # Mean days between order and departure
+    "crew_reserve": 0.2             # Idle crew hired on top of what the schedule needs
+}
+
+# (manufacturer, model, size, [(class_type, rows, columns)]) - at most 10 columns (seat letters A-J)
+PLANE_MODELS = [
+    ('Airbus', 'A320', 'Small', [('Economy', 30, 6)]),
+    ('Boeing', 'B737', 'Small', [('Economy', 28, 6)]),
+    ('Embraer', 'E195', 'Small', [('Economy', 30, 4)]),
+    ('Dassault', 'F7X', 'Small', [('Economy', 15, 4)]),
+    ('Boeing', 'B787', 'Big', [('Business', 5, 4), ('Economy', 30, 9)]),
+    ('Airbus', 'A380', 'Big', [('Business', 10, 6), ('Economy', 40, 10)]),
+    ('Boeing', 'B777', 'Big', [('Business', 8, 6), ('Economy', 35, 10)]),
+    ('Airbus', 'A350', 'Big', [('Business', 8, 4), ('Economy', 32, 9)]),
+]
+
+FIRST_NAMES = ['Noa', 'Daniel', 'Maya', 'Yosef', 'Tamar', 'David', 'Shira', 'Omer', 'Yael', 'Itai', 'Emma',
+               'Liam', 'Olivia', 'Lucas', 'Sofia', 'Adam', 'Mia', 'Ethan', 'Lea', 'Ariel', 'Hannah', 'Ben']
+LAST_NAMES = ['Cohen', 'Levi', 'Mizrahi', 'Peretz', 'Biton', 'Friedman', 'Katz', 'Azulay', 'Smith', 'Garcia',
+              'Muller', 'Rossi', 'Dubois', 'Silva', 'Novak', 'Berg', 'Shapiro', 'Klein', 'Weiss', 'Stone']
+CITIES = ['Tel Aviv', 'Haifa', 'Jerusalem', 'Eilat', 'Herzliya', 'Netanya', 'Ashdod', 'Beer Sheva']
+RUNWAYS = ('R1', 'R2', 'R3', 'R4', 'R5')
+
+# Columns of every loaded table, in the order the generator produces them
+TABLE_COLUMNS = {
+    'Flight_Routes': ('source_airport', 'destination_airport', 'flight_duration'),
+    'Airplanes': ('airplane_id', 'manufacturer', 'purchase_date', 'size'),
+    'Airplane_Classes': ('class_type', 'airplane_id', 'columns_count', 'rows_count'),
+    'Seats': ('row_num', 'column_num', 'class_type', 'airplane_id'),
+    'Pilots': ('pilot_id', 'first_name', 'middle_name', 'last_name', 'city', 'street', 'house_num', 'start_date',
+               'long_flight_training'),
+    'Flight_Attendants': ('attendant_id', 'first_name', 'middle_name', 'last_name', 'city', 'street', 'house_num',
+                          'start_date', 'long_flight_training'),
+    'Registered_Customers': ('email', 'first_name', 'middle_name', 'last_name', 'passport_num', 'registration_date',
+                             'birth_date', 'password', 'customer_type'),
+    'Unregistered_Customers': ('email', 'first_name', 'middle_name', 'last_name', 'customer_type'),
+    'Customer_Phones': ('phone_num', 'email', 'customer_type'),
+    'Flights': ('flight_id', 'departure_date', 'airplane_id', 'source_airport', 'destination_airport', 'status',
+                'departure_time', 'runway_num'),
+    'Classes_In_Flights': ('flight_id', 'departure_date', 'class_type', 'airplane_id', 'price'),
+    'Pilots_In_Flights': ('pilot_id', 'flight_id', 'departure_date'),
+    'Attendants_In_Flights': ('attendant_id', 'flight_id', 'departure_date'),
+    'Orders': ('order_code', 'customer_email', 'status', 'order_date', 'customer_type'),
+    'Flight_Tickets': ('order_code', 'flight_id', 'departure_date', 'row_num', 'column_num', 'class_type',
+                       'airplane_id', 'price', 'seat_hold'),
+}
+
+# Generated rows per table, children first: (table, column, LIKE pattern)
+CLEANUP_ORDER = [
+    ('Flight_Tickets', 'flight_id', f'{GEN_PREFIX}F-%'),
+    ('Orders', 'order_code', f'{GEN_PREFIX}O-%'),
+    ('Classes_In_Flights', 'flight_id', f'{GEN_PREFIX}F-%'),
+    ('Pilots_In_Flights', 'flight_id', f'{GEN_PREFIX}F-%'),
+    ('Attendants_In_Flights', 'flight_id', f'{GEN_PREFIX}F-%'),
+    ('Flights', 'flight_id', f'{GEN_PREFIX}F-%'),
+    ('Customer_Phones', 'email', f'%{GEN_DOMAIN}'),
+    ('Registered_Customers', 'email', f'%{GEN_DOMAIN}'),
+    ('Unregistered_Customers', 'email', f'%{GEN_DOMAIN}'),
+    ('Seats', 'airplane_id', f'{GEN_PREFIX}A-%'),
+    ('Airplane_Classes', 'airplane_id', f'{GEN_PREFIX}A-%'),
+    ('Airplanes', 'airplane_id', f'{GEN_PREFIX}A-%'),
+    ('Pilots', 'pilot_id', f'{GEN_PREFIX}P-%'),
+    ('Flight_Attendants', 'attendant_id', f'{GEN_PREFIX}FA-%'),
+    ('Flight_Routes', 'source_airport', f'{GEN_AIRPORT_PREFIX}%'),    # Generated routes join two generated airports
+]
+CLEANUP_BATCH = 50000
+
+# Server errors meaning LOAD DATA LOCAL is not allowed
+LOCAL_INFILE_ERRNOS = {1148, 2068, 3948}
+
+
+def _tsv_value(value):
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, str):
+        return value.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n')
+    return str(value)
+
+
+class BulkLoader:
+    """
+    Streams generated rows into the database on its own connection, with foreign-key and unique checks off
+    for the session (the generator produces consistent data).
+    method 'load-data': rows are written to per-table tab-separated files and loaded with LOAD DATA LOCAL
+                        INFILE every `file_rows` rows.
+    method 'insert':    rows are sent as multi-row INSERTs of `chunk_size` rows.
+    """
+
+    def __init__(self, method='load-data', chunk_size=5000, file_rows=500000):
+        self.method = method
+        self.chunk_size = chunk_size
+        self.file_rows = file_rows
+        self.counts = dict.fromkeys(TABLE_COLUMNS, 0)
+        self._conn = mysql.connector.connect(**dict(db_config, autocommit=False,
+                                                    allow_local_infile=method == 'load-data'))
+        self._cursor = self._conn.cursor()
+        self._cursor.execute("SET SESSION foreign_key_checks = 0")
+        self._cursor.execute("SET SESSION unique_checks = 0")
+        if method == 'load-data':
+            self._cursor.execute("SELECT @@GLOBAL.local_infile")
+            if not self._cursor.fetchone()[0]:
+                print("The server has local_infile disabled - falling back to multi-row INSERTs.")
+                self.method = 'insert'
+        self._buffers = {}
+        self._files = {}
+        self._tmp_dir = tempfile.mkdtemp(prefix='flytau_gen_') if self.method == 'load-data' else None
+
+    def add(self, table, row):
+        self.counts[table] += 1
+        if self.method == 'insert':
+            buffer = self._buffers.setdefault(table, [])
+            buffer.append(row)
+            if len(buffer) >= self.chunk_size:
+                self._insert(table)
+            return
+        entry = self._files.get(table)
+        if entry is None:
+            path = os.path.join(self._tmp_dir, f"{table}.tsv")
+            entry = self._files[table] = [open(path, 'w', encoding='utf-8', newline='\n'), path, 0]
+        entry[0].write('\t'.join(_tsv_value(v) for v in row) + '\n')
+        entry[2] += 1
+        if entry[2] >= self.file_rows:
+            self._load_file(table)
+
+    def _insert(self, table):
+        rows = self._buffers.pop(table, None)
+        if not rows:
+            return
+        columns = TABLE_COLUMNS[table]
+        self._cursor.executemany(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})", rows)
+        self._conn.commit()
+
+    def _load_file(self, table):
+        handle, path, rows = self._files.pop(table)
+        handle.close()
+        if rows:
+            try:
+                self._cursor.execute(f"""
+                    LOAD DATA LOCAL INFILE %s INTO TABLE {table}
+                    CHARACTER SET utf8mb4
+                    FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\'
+                    LINES TERMINATED BY '\\n'
+                    ({', '.join(TABLE_COLUMNS[table])})
+                """, (path,))
+                self._conn.commit()
+            except mysql.connector.Error as err:
+                if err.errno not in LOCAL_INFILE_ERRNOS:
+                    raise
+                print(f"LOAD DATA LOCAL refused ({err.msg}) - falling back to multi-row INSERTs.")
+                self._reload_with_inserts(table, path)
+        os.remove(path)
+
+    def _reload_with_inserts(self, table, path):
+        self.method = 'insert'
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                values = [None if v == '\\N' else v.replace('\\t', '\t').replace('\\n', '\n').replace('\\\\', '\\')
+                          for v in line.rstrip('\n').split('\t')]
+                self._buffers.setdefault(table, []).append(values)
+                if len(self._buffers[table]) >= self.chunk_size:
+                    self._insert(table)
+        self._insert(table)
+
+    def close(self):
+        """Writes everything still buffered and closes the connection."""
+        try:
+            for table in list(self._files):
+                self._load_file(table)
+            for table in list(self._buffers):
+                self._insert(table)
+        finally:
+            self._cursor.close()
+            self._conn.close()
+            if self._tmp_dir:
+                shutil.rmtree(self._tmp_dir, ignore_errors=True)
+
+
+class CrewPool:
+    """
+    Crew of one role, handed out earliest-available first; members are hired when nobody qualified is free.
+    Heaps of (minute free again, crew_id) for trained and untrained members.
+    """
+
+    def __init__(self, role, prefix, rng):
+        self.role = role
+        self.prefix = prefix
+        self.rng = rng
+        self.members = []       # (crew_id, trained)
+        self._heaps = {True: [], False: []}
+
+    def hire(self, trained):
+        crew_id = f"{self.prefix}-{len(self.members) + 1:05d}"
+        self.members.append((crew_id, trained))
+        return crew_id
+
+    def assign(self, count, start, free_at, long_haul):
+        """
+        Picks `count` members free at minute `start` and books them until minute `free_at`.
+        Returns: list[str]: The crew IDs.
+        """
+        chosen = []
+        for trained in ((True,) if long_haul else (False, True)):
+            heap = self._heaps[trained]
+            while len(chosen) < count and heap and heap[0][0] <= start:
+                chosen.append((heapq.heappop(heap)[1], trained))
+        while len(chosen) < count:
+            chosen.append((self.hire(long_haul), long_haul))
+        for crew_id, trained in chosen:
+            heapq.heappush(self._heaps[trained], (free_at, crew_id))
+        return [crew_id for crew_id, _ in chosen]
+
+    def add_reserve(self, share):
+        """Hires idle members on top of the schedule's needs (so the app always has some free crew)."""
+        for _ in range(int(len(self.members) * share)):
+            self.hire(self.rng.random() < 0.4)
+
+    def rows(self, start_date):
+        for crew_id, trained in self.members:
+            yield (crew_id, self.rng.choice(FIRST_NAMES), None, self.rng.choice(LAST_NAMES),
+                   self.rng.choice(CITIES), f"Street {self.rng.randint(1, 90)}", str(self.rng.randint(1, 200)),
+                   start_date - timedelta(days=self.rng.randint(30, 5000)), trained)
+
+
+def _airport_codes(count):
+    letters = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    codes = [GEN_AIRPORT_PREFIX + a + b for a in letters for b in letters]
+    if count > len(codes):
+        raise ValueError(f"At most {len(codes)} airports can be generated")
+    return codes[:count]
+
+
+def generate_routes(rng, airports, routes, long_haul_share):
+    """Returns: list[tuple]: (source, destination, duration) rows, both directions of each city pair."""
+    pairs = set()
+    max_pairs = len(airports) * (len(airports) - 1) // 2
+    while len(pairs) < min(routes // 2, max_pairs):
+        a, b = rng.sample(airports, 2)
+        pairs.add((min(a, b), max(a, b)))
+    rows = []
+    for a, b in sorted(pairs):
+        if rng.random() < long_haul_share:
+            duration = rng.randint(LONG_HAUL_MINUTES + 10, 900)
+        else:
+            duration = int(rng.triangular(40, LONG_HAUL_MINUTES, 120))
+        rows.append((a, b, duration))
+        rows.append((b, a, max(30, int(duration * rng.uniform(0.93, 1.07)))))
+    return rows
+
+
+def generate_fleet(rng, count, big_share, start_date):
+    """Returns: list[dict]: airplane_id, model (a PLANE_MODELS entry), seats [(row, col, class)], purchase_date."""
+    small_models = [m for m in PLANE_MODELS if m[2] == 'Small']
+    big_models = [m for m in PLANE_MODELS if m[2] == 'Big']
+    fleet = []
+    for n in range(1, count + 1):
+        model = rng.choice(big_models if rng.random() < big_share else small_models)
+        seats = []
+        row_num = 0
+        for class_type, rows, columns in model[3]:  # Business rows first, numbered on across classes
+            for _ in range(rows):
+                row_num += 1
+                seats.extend((row_num, col, class_type) for col in range(1, columns + 1))
+        fleet.append({'airplane_id': f"{GEN_PREFIX}A-{n:05d}", 'model': model, 'seats': seats,
+                      'purchase_date': start_date - timedelta(days=rng.randint(100, 7000))})
+    return fleet
+
+
+def _existing_departures(start_date, end_date):
+    """Returns: dict: runway -> sorted departure datetimes of the flights already in the database."""
+    with db_cur() as cursor:
+        cursor.execute("""
+            SELECT runway_num, departure_date, departure_time FROM Flights
+            WHERE departure_date BETWEEN %s AND %s AND status <> 'Cancelled'
+        """, (start_date - timedelta(days=1), end_date + timedelta(days=1)))
+        departures = {}
+        for row in cursor.fetchall():
+            departures.setdefault(row['runway_num'], []).append(
+                datetime.combine(row['departure_date'], datetime.min.time()) + row['departure_time'])
+    return {runway: sorted(times) for runway, times in departures.items()}
+
+
+def _runway_free(existing, runway, departure, buffer):
+    times = existing.get(runway)
+    if not times:
+        return True
+    i = bisect.bisect_left(times, departure - buffer + timedelta(seconds=1))
+    return i == len(times) or times[i] >= departure + buffer
+
+
+def generate(scale, seed=1, start=None, method='load-data', chunk_size=5000, **overrides):
+    """
+    Generates and loads a dataset.
+    param scale (str): A SCALES preset; `overrides` replace its fields.
+    param start (date, optional): First departure date (default: traffic_config['past_share'] of the days before today).
+    Returns: dict: Rows loaded per table.
+    """
+    settings = dict(SCALES[scale], **{k: v for k, v in overrides.items() if v is not None})
+    rng = random.Random(seed)
+    today = date.today()
+    now = datetime.now()
+    days = settings['days']
+    start_date = start or today - timedelta(days=int(days * traffic_config['past_share']))
+    end_date = start_date + timedelta(days=days - 1)
+
+    buffer_minutes = schedule_config['runway_buffer_minutes']
+    slots_per_runway = 24 * 60 // buffer_minutes
+    if settings['flights_per_day'] > slots_per_runway * len(RUNWAYS):
+        raise ValueError(f"At most {slots_per_runway * len(RUNWAYS)} departures per day fit the runway rule "
+                         f"({len(RUNWAYS)} runways, {buffer_minutes} minutes apart)")
+    # Departure slots of one day: each runway every buffer_minutes, the runways staggered
+    stagger = buffer_minutes // len(RUNWAYS)
+    day_slots = [(k * buffer_minutes + r * stagger, runway)
+                 for r, runway in enumerate(RUNWAYS) for k in range(slots_per_runway)]
+
+    with db_cur() as cursor:
+        cursor.execute("SELECT COUNT(*) AS n FROM Airplanes WHERE airplane_id LIKE %s", (f"{GEN_PREFIX}A-%",))
+        if cursor.fetchone()['n']:
+            raise ValueError("Generated data is already loaded - run with --cleanup first")
+    existing = _existing_departures(start_date, end_date)
+    runway_buffer = timedelta(minutes=buffer_minutes)
+
+    loader = BulkLoader(method, chunk_size)
+    started = time.perf_counter()
+    try:
+        # Routes, weighted by popularity (a few busy routes, a long tail)
+        airports = _airport_codes(settings['airports'])
+        routes = generate_routes(rng, airports, settings['routes'], traffic_config['long_haul_share'])
+        for route in routes:
+            loader.add('Flight_Routes', route)
+        popularity = list(range(1, len(routes) + 1))
+        rng.shuffle(popularity)
+        route_cumulative = list(itertools.accumulate(1.0 / rank ** 0.8 for rank in popularity))
+
+        # Fleet and seat maps
+        fleet = generate_fleet(rng, settings['airplanes'], traffic_config['big_plane_share'], start_date)
+        plane_heaps = {'Small': [], 'Big': []}
+        for plane in fleet:
+            manufacturer, model, size, classes = plane['model']
+            loader.add('Airplanes', (plane['airplane_id'], manufacturer, plane['purchase_date'], size))
+            for class_type, rows, columns in classes:
+                loader.add('Airplane_Classes', (class_type, plane['airplane_id'], columns, rows))
+            for row_num, col, class_type in plane['seats']:
+                loader.add('Seats', (row_num, col, class_type, plane['airplane_id']))
+            plane_heaps[size].append((-10 ** 9, plane['airplane_id']))
+        planes = {plane['airplane_id']: plane for plane in fleet}
+        if not plane_heaps['Big']:
+            raise ValueError("The fleet has no Big plane for long-haul routes")
+
+        # Customers (frequent flyers are picked more often than the rest)
+        registered_count = max(1, int(settings['customers'] * 0.7))
+        guest_count = max(1, settings['customers'] - registered_count)
+        for n in range(1, registered_count + 1):
+            email = f"reg{n}{GEN_DOMAIN}"
+            loader.add('Registered_Customers', (
+                email, rng.choice(FIRST_NAMES), None, rng.choice(LAST_NAMES), f"{GEN_PREFIX}{n:08d}",
+                start_date - timedelta(days=rng.randint(0, 1500)), date(rng.randint(1950, 2006), rng.randint(1, 12),
+                                                                        rng.randint(1, 28)),
+                f"pass{n}", 'Registered'))
+            loader.add('Customer_Phones', (f"+1-555-1{n:07d}", email, 'Registered'))
+        for n in range(1, guest_count + 1):
+            email = f"guest{n}{GEN_DOMAIN}"
+            loader.add('Unregistered_Customers', (email, rng.choice(FIRST_NAMES), None, rng.choice(LAST_NAMES),
+                                                  'Unregistered'))
+            loader.add('Customer_Phones', (f"+1-555-2{n:07d}", email, 'Unregistered'))
+        print(f"Static data generated ({time.perf_counter() - started:.1f}s)")
+
+        pilots = CrewPool('Pilot', f"{GEN_PREFIX}P", rng)
+        attendants = CrewPool('Attendant', f"{GEN_PREFIX}FA", rng)
+        turnaround = schedule_config['turnaround_minutes']
+        rest = crew_config['rest_buffer_minutes']
+        flight_no = order_no = skipped = 0
+        base = datetime.combine(start_date, datetime.min.time())
+
+        for day in range(days):
+            departure_date = start_date + timedelta(days=day)
+            wanted = min(len(day_slots), max(1, int(settings['flights_per_day'] * rng.uniform(0.9, 1.1))))
+            for slot_minute, runway in sorted(rng.sample(day_slots, wanted)):
+                departure = base + timedelta(days=day, minutes=slot_minute)
+                if not _runway_free(existing, runway, departure, runway_buffer):
+                    skipped += 1
+                    continue
+                source, destination, duration = rng.choices(routes, cum_weights=route_cumulative)[0]
+                long_haul = duration > LONG_HAUL_MINUTES
+                start_minute = day * 1440 + slot_minute
+
+                # Plane: Big for long-haul routes, mostly Small otherwise; the one free the longest
+                sizes = ('Big',) if long_haul else (('Small', 'Big') if rng.random() < 0.85 else ('Big', 'Small'))
+                airplane_id = None
+                for size in sizes:
+                    heap = plane_heaps[size]
+                    if heap and heap[0][0] <= start_minute:
+                        airplane_id = heapq.heapreplace(heap, (start_minute + duration + turnaround, heap[0][1]))[1]
+                        break
+                if airplane_id is None:
+                    skipped += 1
+                    continue
+                plane = planes[airplane_id]
+                size = plane['model'][2]
+
+                flight_no += 1
+                flight_id = f"{GEN_PREFIX}F-{flight_no:07d}"
+                cancelled = rng.random() < traffic_config['flight_cancel_rate']
+                arrived = departure < now and not cancelled
+                crew_free_at = start_minute + duration + rest
+                req_pilots, req_attendants = CREW_SIZE[size]
+                for pilot_id in pilots.assign(req_pilots, start_minute, crew_free_at, long_haul):
+                    loader.add('Pilots_In_Flights', (pilot_id, flight_id, departure_date))
+                for attendant_id in attendants.assign(req_attendants, start_minute, crew_free_at, long_haul):
+                    loader.add('Attendants_In_Flights', (attendant_id, flight_id, departure_date))
+
+                economy = round(60 + duration * 1.1 * rng.uniform(0.8, 1.25))
+                prices = {'Economy': economy}
+                if any(class_type == 'Business' for class_type, _, _ in plane['model'][3]):
+                    prices['Business'] = round(economy * rng.uniform(2.2, 3.0))
+                for class_type, price in prices.items():
+                    loader.add('Classes_In_Flights', (flight_id, departure_date, class_type, airplane_id, price))
+
+                # Orders: seats sold in groups of 1-4, each group booked some days ahead; for future flights
+                # only the orders placed by today exist
+                seats = plane['seats']
+                if rng.random() < traffic_config['sold_out_share']:
+                    occupancy = 1.0
+                else:
+                    occupancy = min(1.0, rng.betavariate(6, 2.2))
+                sold = rng.sample(seats, int(len(seats) * occupancy))
+                held = 0
+                i = 0
+                while i < len(sold):
+                    group = sold[i:i + rng.choices((1, 2, 3, 4), weights=(50, 25, 15, 10))[0]]
+                    i += len(group)
+                    lead = min(330, int(rng.expovariate(1.0 / traffic_config['mean_lead_days'])))
+                    order_date = departure_date - timedelta(days=lead)
+                    if order_date > today:
+                        continue
+                    order_no += 1
+                    order_code = f"{GEN_PREFIX}O-{order_no:09d}"
+                    if rng.random() < traffic_config['registered_share']:
+                        email = f"reg{int(registered_count * rng.random() ** 2) + 1}{GEN_DOMAIN}"
+                        customer_type = 'Registered'
+                    else:
+                        email = f"guest{rng.randint(1, guest_count)}{GEN_DOMAIN}"
+                        customer_type = 'Unregistered'
+                    if cancelled:
+                        status, factor, seat_hold = 'Cancelled by system', 0.0, None
+                    elif rng.random() < traffic_config['order_cancel_rate']:
+                        status, factor, seat_hold = 'Cancelled by customer', 0.05, None
+                    else:
+                        status, factor, seat_hold = ('Executed' if arrived else 'Active'), 1.0, 1
+                        held += len(group)
+                    loader.add('Orders', (order_code, email, status, order_date, customer_type))
+                    for row_num, col, class_type in group:
+                        loader.add('Flight_Tickets', (order_code, flight_id, departure_date, row_num, col, class_type,
+                                                      airplane_id, round(prices[class_type] * factor, 2), seat_hold))
+
+                if cancelled:
+                    status = 'Cancelled'
+                elif arrived:
+                    status = 'Arrived'
+                else:
+                    status = 'Full Capacity' if held == len(seats) else 'Active'
+                loader.add('Flights', (flight_id, departure_date, airplane_id, source, destination, status,
+                                       (datetime.min + timedelta(minutes=slot_minute)).strftime('%H:%M:%S'), runway))
+
+            if (day + 1) % 30 == 0 or day + 1 == days:
+                print(f"{day + 1}/{days} days: {flight_no} flights, {loader.counts['Flight_Tickets']} tickets "
+                      f"({time.perf_counter() - started:.1f}s)")
+
+        for pool, table in ((pilots, 'Pilots'), (attendants, 'Flight_Attendants')):
+            pool.add_reserve(traffic_config['crew_reserve'])
+            for row in pool.rows(start_date):
+                loader.add(table, row)
+        if skipped:
+            print(f"{skipped} departure slots skipped (runway taken by existing flights or no free plane)")
+    finally:
+        loader.close()
+
+    print(f"Loaded in {time.perf_counter() - started:.1f}s; rebuilding the summary tables...")
+    with db_tx() as tx:
+        rebuild_report_aggregates(tx.cursor)
+    return loader.counts
+
+
+def cleanup():
+    """Deletes every generated row (in batches) and rebuilds the summary tables."""
+    with db_cur() as cursor:
+        for table, column, pattern in CLEANUP_ORDER:
+            deleted = 0
+            while True:
+                cursor.execute(f"DELETE FROM {table} WHERE {column} LIKE %s LIMIT %s", (pattern, CLEANUP_BATCH))
+                deleted += cursor.rowcount
+                if cursor.rowcount < CLEANUP_BATCH:
+                    break
+            print(f"{table}: {deleted} generated rows deleted")
+    with db_tx() as tx:
+        rebuild_report_aggregates(tx.cursor)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a production-scale FLYTAU dataset.")
+    parser.add_argument('--scale', choices=sorted(SCALES), default='small', help="Dataset size preset")
+    parser.add_argument('--seed', type=int, default=1, help="Random seed (same seed, same data)")
+    parser.add_argument('--start', type=date.fromisoformat, help="First departure date (YYYY-MM-DD)")
+    for field in ('airports', 'routes', 'airplanes', 'days', 'flights_per_day', 'customers'):
+        parser.add_argument(f"--{field.replace('_', '-')}", type=int, help=f"Override the preset's {field}")
+    parser.add_argument('--method', choices=['load-data', 'insert'], default='load-data',
+                        help="LOAD DATA LOCAL INFILE or multi-row INSERTs")
+    parser.add_argument('--chunk-size', type=int, default=5000, help="Rows per multi-row INSERT")
+    parser.add_argument('--cleanup', action='store_true', help="Delete the generated data and exit")
+    args = parser.parse_args()
+
+    if args.cleanup:
+        cleanup()
+        return 0
+    try:
+        counts = generate(args.scale, seed=args.seed, start=args.start, method=args.method,
+                          chunk_size=args.chunk_size, airports=args.airports, routes=args.routes,
+                          airplanes=args.airplanes, days=args.days, flights_per_day=args.flights_per_day,
+                          customers=args.customers)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    for table, count in counts.items():
+        print(f"{table:<24} {count:>12,}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,190 @@
+import threading
+import time
+import mysql.connector
+from mysql.connector import errors
+
+
+class PoolTimeout(errors.PoolError):
+    """Raised when no connection could be checked out of the pool within the checkout timeout."""
+
+
+class ConnectionPool:
+    """
+    A thread-safe pool of MySQL connections shared by every `db_cur()` call in the process.
+    Connections are opened lazily (up to `size`), handed out most-recently-used first,
+    health-checked with a ping on checkout and recycled once they are older than `recycle_seconds`.
+    Callers that cannot get a connection within `checkout_timeout` seconds get a PoolTimeout.
+    """
+
+    def __init__(self, db_config, size=10, checkout_timeout=10.0, recycle_seconds=1800, ping_on_checkout=True):
+        self.db_config = db_config
+        self.size = size
+        self.checkout_timeout = checkout_timeout
+        self.recycle_seconds = recycle_seconds
+        self.ping_on_checkout = ping_on_checkout
+
+        self._lock = threading.Condition()
+        self._idle = []  # list of (connection, created_at), the last item is the most recently used
+        self._created_at = {}  # id(connection) -> created_at, for connections currently checked out
+        self._open = 0
+
+        # Counters (read through stats())
+        self._checkouts = 0
+        self._created = 0
+        self._recycled = 0
+        self._ping_failures = 0
+        self._discarded = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _connect(self):
+        """Opens a brand-new connection. Called without holding the pool lock."""
+        conn = mysql.connector.connect(**self.db_config)
+        with self._lock:
+            self._created += 1
+        return conn
+
+    def _is_healthy(self, conn, created_at):
+        """
+        Decides whether an idle connection may be handed out again.
+        param conn (MySQLConnection): The idle connection.
+        param created_at (float): When the connection was opened (time.monotonic()).
+        Returns: bool: False if the connection is stale (older than recycle_seconds) or failed its ping.
+        """
+        if self.recycle_seconds and time.monotonic() - created_at > self.recycle_seconds:
+            with self._lock:
+                self._recycled += 1
+            return False
+        if self.ping_on_checkout:
+            try:
+                conn.ping(reconnect=False)
+            except mysql.connector.Error:
+                with self._lock:
+                    self._ping_failures += 1
+                return False
+        return True
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def acquire(self):
+        """
+        Checks a connection out of the pool, opening a new one if the pool is not yet full.
+        Blocks for up to `checkout_timeout` seconds when all connections are in use.
+        Returns: MySQLConnection: A live connection. Must be given back with release().
+        Raises: PoolTimeout: If no connection became available in time.
+        """
+        start = time.monotonic()
+        deadline = start + self.checkout_timeout
+
+        while True:
+            conn = None
+            created_at = None
+            must_open = False
+
+            with self._lock:
+                while not self._idle and self._open >= self.size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeout(
+                            f"Could not get a database connection within {self.checkout_timeout} seconds "
+                            f"(pool size {self.size}).")
+                    self._lock.wait(remaining)
+
+                if self._idle:
+                    conn, created_at = self._idle.pop()
+                else:
+                    self._open += 1
+                    must_open = True
+
+            if must_open:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._lock:
+                        self._open -= 1
+                        self._lock.notify()
+                    raise
+                created_at = time.monotonic()
+
+            elif not self._is_healthy(conn, created_at):
+                self._close_quietly(conn)
+                with self._lock:
+                    self._open -= 1
+                    self._lock.notify()
+                continue  # Try again: either another idle connection or a fresh one
+
+            waited = time.monotonic() - start
+            with self._lock:
+                self._checkouts += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+                self._created_at[id(conn)] = created_at
+            return conn
+
+    def release(self, conn, discard=False):
+        """
+        Returns a connection to the pool.
+        Any transaction left open by the caller is rolled back so the next user starts clean.
+        param conn (MySQLConnection): A connection previously returned by acquire().
+        param discard (bool): Close the connection instead of reusing it (e.g. after a connection-level error).
+        """
+        with self._lock:
+            created_at = self._created_at.pop(id(conn), time.monotonic())
+
+        if not discard:
+            try:
+                if conn.unread_result:
+                    conn.consume_results()
+                if conn.in_transaction:
+                    conn.rollback()
+            except mysql.connector.Error:
+                discard = True
+
+        if discard:
+            self._close_quietly(conn)
+            with self._lock:
+                self._open -= 1
+                self._discarded += 1
+                self._lock.notify()
+            return
+
+        with self._lock:
+            self._idle.append((conn, created_at))
+            self._lock.notify()
+
+    def close_all(self):
+        """Closes every idle connection. Checked-out connections are closed when they are released with discard=True."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+        for conn, _ in idle:
+            self._close_quietly(conn)
+
+    def stats(self):
+        """
+        Returns a snapshot of the pool counters.
+        Returns: dict: Pool size, open/idle/in-use connections, and checkout/wait-time counters.
+        """
+        with self._lock:
+            return {
+                'size': self.size,
+                'open': self._open,
+                'idle': len(self._idle),
+                'in_use': self._open - len(self._idle),
+                'checkouts': self._checkouts,
+                'connections_created': self._created,
+                'connections_recycled': self._recycled,
+                'ping_failures': self._ping_failures,
+                'connections_discarded': self._discarded,
+                'checkout_timeouts': self._timeouts,
+                'wait_seconds_total': self._wait_total,
+                'wait_seconds_max': self._wait_max,
+                'wait_seconds_avg': self._wait_total / self._checkouts if self._checkouts else 0.0,
+            }
@@ -0,0 +1,215 @@
+"""
+EXPLAIN-based full-scan check for the application's SQL.
+
+Collects every SQL statement written in utils.py and main.py (queries assembled with `+=` are checked with
+all their optional filters applied), fills the %s placeholders with sample values,
+runs EXPLAIN on each statement and fails if any of them reads a table with a full scan that no index could
+avoid. A scan is accepted when:
+  - the table is a small reference table listed in SCAN_ALLOWED (read whole by design), or
+  - the optimizer had a usable index (possible_keys) and still chose to scan. This is normal on tiny
+    tables; run the check on realistic data (e.g. after `report_benchmark.py --scale 100`) to be sure.
+
+Run it after schema changes (exit code 1 on a regression):
+    python explain_check.py
+    python explain_check.py --verbose     # print the plan of every statement
+"""
+import argparse
+import ast
+import os
+import re
+import sys
+
+SOURCE_FILES = ['utils.py', 'main.py']
+
+# Reference tables that are small and read in full on purpose (resource pickers, route list, seat layouts)
+SCAN_ALLOWED = {'Airplanes', 'Airplane_Classes', 'Flight_Routes', 'Pilots', 'Flight_Attendants'}
+
+# Functions whose SQL is not checked, with the reason
+SKIP_FUNCTIONS = {
+    'add_user': "legacy helper for a Users table that is not part of the schema (unused)",
+}
+
+SQL_START = re.compile(r'^\s*(SELECT|UPDATE|DELETE|INSERT\s+(IGNORE\s+)?INTO\s+\w+\s*\([^)]*\)\s*SELECT)\b', re.I | re.S)
+PLACEHOLDER = re.compile(r'%s')
+
+
+def _render(node):
+    """
+    Returns the text of a string or f-string node. Interpolated fragments become '' (optional SQL fragments
+    such as `{size_sql}`), except inside `IN (...)`, where they become one placeholder (or one row of
+    placeholders for a row-value comparison such as `(a, b) IN (...)`).
+    Returns: str|None: None if a table name is interpolated, since the statement can't be resolved statically.
+    """
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    parts = []
+    for value in node.values:
+        if isinstance(value, ast.Constant):
+            parts.append(value.value)
+            continue
+        text = ''.join(parts)
+        if re.search(r'\b(FROM|JOIN|UPDATE|INTO)\s*$', text, re.I):
+            return None
+        row = re.search(r'\(([^()]*)\)\s*IN\s*\(\s*$', text, re.I)
+        if row:
+            parts.append('(' + ', '.join(['%s'] * (row.group(1).count(',') + 1)) + ')')
+        elif re.search(r'IN\s*\(\s*$', text, re.I):
+            parts.append('%s')
+        else:
+            parts.append('')
+    return ''.join(parts)
+
+
+def _is_text(node):
+    return isinstance(node, ast.JoinedStr) or (isinstance(node, ast.Constant) and isinstance(node.value, str))
+
+
+def _enclosing_functions(tree):
+    """Returns: dict: id(node) -> name of the innermost function containing it."""
+    owners = {}
+    for func in ast.walk(tree):  # Breadth-first, so inner functions overwrite their outer function
+        if isinstance(func, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            for node in ast.walk(func):
+                owners[id(node)] = func.name
+    return owners
+
+
+def _assembled_queries(tree):
+    """
+    Finds queries built in steps (`query = "SELECT ..."` followed by `query += " AND ..."`) and joins each
+    base with every fragment appended after it in the same function, i.e. with all optional filters applied.
+    Returns: tuple[list, set]: (line number, SQL) pairs and the ids of the nodes they consumed.
+    """
+    queries, used = [], set()
+    for func in ast.walk(tree):
+        if not isinstance(func, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        assigns, appends = [], []
+        for node in ast.walk(func):
+            if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name) \
+                    and _is_text(node.value):
+                assigns.append((node.lineno, node.targets[0].id, node.value))
+            elif isinstance(node, ast.AugAssign) and isinstance(node.op, ast.Add) \
+                    and isinstance(node.target, ast.Name) and _is_text(node.value):
+                appends.append((node.lineno, node.target.id, node.value))
+        for line, name, value in assigns:
+            fragments = [v for l, n, v in sorted(appends, key=lambda a: a[0]) if n == name and l > line]
+            if not fragments or not SQL_START.match(_render(value) or ''):
+                continue
+            used.add(id(value))
+            used.update(id(v) for v in fragments)
+            rendered = [_render(v) for v in [value] + fragments]
+            if None not in rendered:
+                queries.append((line, func.name, ''.join(rendered)))
+    return queries, used
+
+
+def collect_statements(path):
+    """
+    Returns: list[tuple[int, str, str]]: (line number, function name, SQL) for every EXPLAIN-able statement
+             in the file (SELECT / UPDATE / DELETE / INSERT ... SELECT), including queries assembled from
+             fragments. Statements of SKIP_FUNCTIONS and statements with an interpolated table are left out.
+    """
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    owners = _enclosing_functions(tree)
+    statements, used = _assembled_queries(tree)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.JoinedStr):
+            used.update(id(value) for value in node.values)
+    for node in ast.walk(tree):
+        if _is_text(node) and id(node) not in used:
+            sql = _render(node)
+            if sql and SQL_START.match(sql):
+                statements.append((node.lineno, owners.get(id(node), '<module>'), sql))
+    return sorted(s for s in statements if s[1] not in SKIP_FUNCTIONS)
+
+
+def sample_value(before):
+    """
+    Picks a literal for a placeholder from the SQL text that precedes it.
+    param before (str): The statement text up to the placeholder.
+    Returns: str: An SQL literal.
+    """
+    tail = before[-60:]
+    if re.search(r'LIMIT\s*$', tail, re.I):
+        return '10'
+    if re.search(r'((ADDTIME|SUBTIME)\(|TIMESTAMPDIFF\(.*,\s*)$', tail, re.I):
+        return "'12:00:00'"
+    if re.search(r'SEC_TO_TIME\(\(\s*$', tail, re.I):
+        return '60'  # Duration arithmetic such as SEC_TO_TIME((%s + 60)*60)
+    column = re.search(r'(\w+)\s*(=|!=|<>|<=|>=|<|>|LIKE)?\s*$', tail)
+    name = column.group(1).lower() if column else ''
+    if 'date' in name:
+        return "'2026-01-15'"
+    if 'time' in name:
+        return "'12:00:00'"
+    return "'0'"
+
+
+def bind_samples(sql):
+    """Returns: str: The statement with every %s replaced by a sample literal."""
+    parts = PLACEHOLDER.split(sql)
+    bound = parts[0]
+    for part in parts[1:]:
+        bound += sample_value(bound) + part
+    return bound
+
+
+def check_plan(plan):
+    """
+    Returns: tuple[list, list]: (failures, notes) - plan steps that scan a table with no usable index, and
+             scans the optimizer chose although an index was available.
+    """
+    failures, notes = [], []
+    for step in plan:
+        table = step.get('table') or ''
+        if step.get('type') != 'ALL' or table.startswith('<') or table in SCAN_ALLOWED:
+            continue
+        (notes if step.get('possible_keys') else failures).append(step)
+    return failures, notes
+
+
+def _describe(step):
+    return f"{step.get('table')} (type={step.get('type')}, possible_keys={step.get('possible_keys')}, rows={step.get('rows')})"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail if any application query needs a full table scan.")
+    parser.add_argument('--verbose', action='store_true', help="Print the plan of every statement")
+    args = parser.parse_args()
+
+    from utils import db_cur
+
+    base = os.path.dirname(os.path.abspath(__file__))
+    total = failed = 0
+    with db_cur() as cursor:
+        for filename in SOURCE_FILES:
+            for line, function, sql in collect_statements(os.path.join(base, filename)):
+                total += 1
+                label = f"{filename}:{line} ({function})"
+                try:
+                    cursor.execute("EXPLAIN " + bind_samples(sql))
+                    plan = cursor.fetchall()
+                except Exception as e:
+                    failed += 1
+                    print(f"ERROR {label}: could not EXPLAIN ({e})")
+                    continue
+
+                failures, notes = check_plan(plan)
+                if failures:
+                    failed += 1
+                    print(f"FULL SCAN {label}: " + "; ".join(_describe(s) for s in failures))
+                for step in notes:
+                    print(f"note {label}: scan chosen despite an index - {_describe(step)}")
+                if args.verbose:
+                    for step in plan:
+                        print(f"    {label}: {_describe(step)} key={step.get('key')}")
+
+    print(f"{total} statements checked, {failed} failing.")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
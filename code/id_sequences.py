@@ -0,0 +1,157 @@
+"""
+Block-reserving ID sequences.
+
+Generated IDs (worker IDs such as 'P-012', the order code node ids, ...) come from named counters in the
+Id_Sequences table. A process does not touch the table for every ID: it reserves a block of `block_size`
+values with one atomic statement and hands them out from memory, so concurrent hires never get the same ID
+and never count or lock the worker tables.
+
+Each reservation is a single autocommitted statement on its own pooled connection:
+    UPDATE Id_Sequences SET next_value = LAST_INSERT_ID(next_value + n) WHERE name = ?
+so the row lock is released immediately and never held across the caller's transaction. A missing
+counter is created on first use, starting after the highest existing ID (the sequence's seed query).
+
+IDs are unique but not gap-free: values left in a block when a process exits are never used.
+"""
+import os
+import threading
+from contextlib import contextmanager
+
+
+class Sequence:
+    __slots__ = ('name', 'fmt', 'seed_sql', 'block_size', 'next', 'end')
+
+    def __init__(self, name, fmt, seed_sql, block_size):
+        self.name = name
+        self.fmt = fmt
+        self.seed_sql = seed_sql
+        self.block_size = block_size
+        self.next = self.end = 0     # Reserved, unused values: [next, end)
+
+
+class IdSequences:
+    """Thread-safe allocator of the registered sequences, for one process."""
+
+    def __init__(self, pool, block_size=20):
+        """
+        param pool (ConnectionPool): Pool the reservations check connections out of.
+        param block_size (int): Default number of values reserved per round trip.
+        """
+        self.pool = pool
+        self.block_size = block_size
+        self.reservations = 0
+        self._sequences = {}
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def register(self, name, fmt='{}', seed_sql=None, block_size=None):
+        """
+        Declares a sequence.
+        param name (str): The counter's name in Id_Sequences.
+        param fmt (str): Format of the IDs, applied to the number (e.g. 'P-{:03d}').
+        param seed_sql (str, optional): Query returning one column, the first value to use when the counter
+                                        does not exist yet (e.g. the highest existing ID + 1). Default: 1.
+        param block_size (int, optional): Values reserved per round trip (default: the allocator's).
+        """
+        self._sequences[name] = Sequence(name, fmt, seed_sql, block_size or self.block_size)
+
+    def next_value(self, name):
+        """Returns: int: The next value of the sequence."""
+        return self.next_values(name, 1)[0]
+
+    def next_values(self, name, count):
+        """
+        Returns: list[int]: `count` new values of the sequence. Larger requests are reserved with one
+                            round trip, so a bulk insert costs one reservation however many rows it has.
+        Raises: KeyError: If the sequence is not registered.
+                mysql.connector.Error: If the reservation fails.
+        """
+        with self._lock:
+            self._check_fork()
+            seq = self._sequences[name]
+            values = []
+            while len(values) < count:
+                if seq.next >= seq.end:
+                    seq.next, seq.end = self._reserve(seq, max(seq.block_size, count - len(values)))
+                take = min(count - len(values), seq.end - seq.next)
+                values.extend(range(seq.next, seq.next + take))
+                seq.next += take
+            return values
+
+    def next_id(self, name):
+        """Returns: str: The next formatted ID of the sequence."""
+        return self.next_ids(name, 1)[0]
+
+    def next_ids(self, name, count):
+        """Returns: list[str]: `count` new formatted IDs of the sequence."""
+        fmt = self._sequences[name].fmt
+        return [fmt.format(value) for value in self.next_values(name, count)]
+
+    def resync(self, name):
+        """
+        Moves the counter past the highest existing ID (its seed query) and drops the values reserved in
+        memory - for when IDs were inserted without the sequence (e.g. a data reload), which shows as a
+        duplicate-key error on the next insert.
+        """
+        with self._lock:
+            seq = self._sequences[name]
+            seq.next = seq.end = 0
+            with self._connection() as cursor:
+                cursor.execute("UPDATE Id_Sequences SET next_value = GREATEST(next_value, %s) WHERE name = %s",
+                               (self._seed(cursor, seq), name))
+
+    def stats(self):
+        """Returns: dict: sequence name -> values left in the reserved block, plus the reservations made."""
+        with self._lock:
+            left = {name: seq.end - seq.next for name, seq in self._sequences.items()}
+        return {'reservations': self.reservations, 'reserved': left}
+
+    def _check_fork(self):
+        # A forked worker must not hand out the blocks its parent is still using
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            for seq in self._sequences.values():
+                seq.next = seq.end = 0
+
+    def _reserve(self, seq, count):
+        """Reserves `count` values. Returns: tuple[int, int]: The block [first, end)."""
+        with self._connection() as cursor:
+            for _ in range(2):
+                cursor.execute("UPDATE Id_Sequences SET next_value = LAST_INSERT_ID(next_value + %s) WHERE name = %s",
+                               (count, seq.name))
+                if cursor.rowcount:
+                    cursor.execute("SELECT LAST_INSERT_ID() AS end_value")
+                    end = int(cursor.fetchone()['end_value'])
+                    self.reservations += 1
+                    return end - count, end
+                # First use of this counter: create it (a concurrent creator wins harmlessly)
+                cursor.execute("INSERT IGNORE INTO Id_Sequences (name, next_value) VALUES (%s, %s)",
+                               (seq.name, self._seed(cursor, seq)))
+        raise RuntimeError(f"Could not reserve IDs of sequence {seq.name}")
+
+    @staticmethod
+    def _seed(cursor, seq):
+        if not seq.seed_sql:
+            return 1
+        cursor.execute(seq.seed_sql)
+        row = cursor.fetchone()
+        value = next(iter(row.values())) if row else None
+        return int(value) if value is not None else 1
+
+    @contextmanager
+    def _connection(self):
+        """Checks out an autocommit connection for a reservation and always gives it back."""
+        conn = self.pool.acquire()
+        cursor = conn.cursor(dictionary=True, buffered=True)
+        discard = False
+        try:
+            yield cursor
+        except Exception as e:
+            discard = not hasattr(e, 'errno')
+            raise
+        finally:
+            try:
+                cursor.close()
+            except Exception:
+                discard = True
+            self.pool.release(conn, discard=discard)
@@ -0,0 +1,467 @@
+"""
+End-to-end load test and regression gate for the booking flow.
+
+Virtual users run scripted journeys concurrently against the real Flask app:
+  - browse:         the departures board with random filters, then a flight's booking page
+  - guest_booking:  booking page, seat map, order summary and checkout as a guest
+  - customer:       login, my trips, a booking, logout
+  - guest_lookup:   an existing guest order looked up on /guest_manage
+  - manager:        login, the reports dashboard, logout
+Requests go either through Flask's test client in this process (--mode client, no server needed) or over
+HTTP to a running server (--mode http). Test data (flights, customers, guest orders, managers) is sampled
+from the database first, so run it against a local database, ideally filled by data_generator.py.
+
+For every endpoint the run records throughput, p50/p95/p99 latency and the SQL statements per request (from
+the app's request metrics - in http mode read from /metrics, which must be reachable from this machine).
+Results are written as JSON; `compare` checks a run against a baseline and exits non-zero on a latency,
+throughput or queries-per-request regression, so it can gate a deploy. Orders created by the run are
+deleted afterwards (and the summary tables rebuilt) unless --keep-orders is given.
+
+Usage:
+    python load_test.py run --users 20 --duration 60 --output baseline.json
+    python load_test.py run --mode http --base-url http://127.0.0.1:5000 --output new.json --baseline baseline.json
+    python load_test.py compare baseline.json new.json --max-regression 0.2
+"""
+import argparse
+import base64
+import http.cookiejar
+import json
+import math
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime
+from utils import db_cur, db_tx
+from report_aggregates import delete_test_orders
+
+# Relative frequency of each journey
+JOURNEY_MIX = {'browse': 45, 'guest_booking': 15, 'customer': 20, 'guest_lookup': 15, 'manager': 5}
+
+# Guests created by the load test use this e-mail domain
+GUEST_DOMAIN = '@loadtest.flytau.test'
+
+# Regression gate defaults
+gate_config = {
+    "max_regression": 0.20,    # Allowed relative growth of p50/p95 latency (and drop of throughput)
+    "min_delta_ms": 5.0,       # Ignore latency changes smaller than this (timer noise)
+    "min_samples": 20,         # Endpoints with fewer requests in either run are not gated
+    "max_query_growth": 0.5    # Allowed growth of the mean SQL statements per request
+}
+
+_ORDER_CODE = re.compile(r'class="order-num">\s*([^<\s]+)\s*<')
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile. Returns: float|None"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(p / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class HttpClient:
+    """One virtual user's HTTP session (own cookie jar; redirects are not followed, like the test client)."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self._opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), _NoRedirect())
+
+    def request(self, method, path, data=None):
+        body = urllib.parse.urlencode(data, doseq=True).encode() if data is not None else None
+        req = urllib.request.Request(self.base_url + path, data=body, method=method)
+        try:
+            with self._opener.open(req, timeout=60) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+
+class InProcessClient:
+    """One virtual user's session on Flask's in-process test client."""
+
+    def __init__(self, app):
+        self._client = app.test_client()
+
+    def request(self, method, path, data=None):
+        response = self._client.open(path, method=method, data=data)
+        return response.status_code, response.get_data()
+
+
+def load_fixtures():
+    """Samples the data the journeys need. Returns: dict"""
+    with db_cur() as cursor:
+        cursor.execute("""
+            SELECT flight_id, departure_date, source_airport, destination_airport FROM Flights
+            WHERE status = 'Active' AND departure_date > CURDATE()
+            ORDER BY RAND() LIMIT 300
+        """)
+        flights = cursor.fetchall()
+        cursor.execute("SELECT email, password FROM Registered_Customers LIMIT 1000")
+        customers = cursor.fetchall()
+        cursor.execute("""
+            SELECT order_code, customer_email FROM Orders
+            WHERE customer_type = 'Unregistered' AND customer_email NOT LIKE %s
+            LIMIT 1000
+        """, (f"%{GUEST_DOMAIN}",))
+        guest_orders = cursor.fetchall()
+        cursor.execute("SELECT manager_id, password FROM Managers LIMIT 20")
+        managers = cursor.fetchall()
+        cursor.execute("SELECT (SELECT COUNT(*) FROM Flights) AS flights, (SELECT COUNT(*) FROM Orders) AS orders")
+        dataset = cursor.fetchone()
+    if not flights:
+        raise ValueError("No future 'Active' flights to book - load data first (data_generator.py)")
+    return {'flights': flights, 'customers': customers, 'guest_orders': guest_orders, 'managers': managers,
+            'dataset': {key: int(value) for key, value in dataset.items()}}
+
+
+class Recorder:
+    """Thread-safe collection of (label, seconds, ok) samples and of the orders created."""
+
+    def __init__(self):
+        self.samples = {}
+        self.errors = {}
+        self.rejected = {}
+        self.order_codes = []
+        self.journeys = 0
+        self.recording = False
+        self._lock = threading.Lock()
+
+    def add(self, label, seconds, status, expected):
+        if not self.recording:
+            return
+        with self._lock:
+            self.samples.setdefault(label, []).append(seconds)
+            if status >= 400:
+                self.errors[label] = self.errors.get(label, 0) + 1
+            elif status != expected:
+                self.rejected[label] = self.rejected.get(label, 0) + 1
+
+    def add_journey(self):
+        if self.recording:
+            with self._lock:
+                self.journeys += 1
+
+    def add_order(self, order_code):
+        with self._lock:
+            self.order_codes.append(order_code)
+
+
+class VirtualUser:
+    """Runs random journeys with one client until the deadline."""
+
+    def __init__(self, client, fixtures, recorder, rng):
+        self.client = client
+        self.fixtures = fixtures
+        self.recorder = recorder
+        self.rng = rng
+
+    def step(self, label, method, path, data=None, expected=200):
+        started = time.perf_counter()
+        status, body = self.client.request(method, path, data)
+        self.recorder.add(label, time.perf_counter() - started, status, expected)
+        return status, body
+
+    def _flight(self):
+        return self.rng.choice(self.fixtures['flights'])
+
+    def _free_seats(self, flight_id, count):
+        """Picks up to `count` free seat keys from the seat-map API."""
+        status, body = self.step('api_flight_seats', 'GET', f"/api/flights/{flight_id}/seats")
+        if status != 200:
+            return []
+        seat_map = json.loads(body)
+        bits = base64.b64decode(seat_map['taken'])
+        free = []
+        bit = 0
+        for cls in seat_map['layout']:
+            for row in range(cls['first_row'], cls['first_row'] + cls['rows']):
+                for col in range(1, cls['columns'] + 1):
+                    if not bits[bit >> 3] >> (bit & 7) & 1:
+                        free.append(f"{row}-{col}-{cls['class_type']}-{seat_map['airplane_id']}")
+                    bit += 1
+        return self.rng.sample(free, min(count, len(free)))
+
+    def _book(self, guest=None):
+        flight = self._flight()
+        flight_id = flight['flight_id']
+        self.step('book_flight', 'GET', f"/book_flight/{flight_id}")
+        seats = self._free_seats(flight_id, self.rng.choice((1, 1, 2, 3)))
+        if not seats:
+            return
+        form = {'flight_id': flight_id, 'selected_seats': seats}
+        if guest:
+            form.update(guest)
+        self.step('order_summary', 'POST', '/order_summary', form)
+        status, body = self.step('finalize_booking', 'POST', '/finalize_booking', form)
+        match = _ORDER_CODE.search(body.decode('utf-8', 'replace')) if status == 200 else None
+        if match:
+            self.recorder.add_order(match.group(1))
+
+    def _login(self, user_id, password):
+        self.step('login', 'POST', '/login', {'id_or_email': user_id, 'password': password}, expected=302)
+
+    def browse(self):
+        flight = self._flight()
+        query = self.rng.choice([{}, {'date': str(flight['departure_date'])}, {'source': flight['source_airport']},
+                                 {'source': flight['source_airport'], 'dest': flight['destination_airport']}])
+        self.step('homepage', 'GET', '/?' + urllib.parse.urlencode(query))
+        self.step('book_flight', 'GET', f"/book_flight/{flight['flight_id']}")
+
+    def guest_booking(self):
+        n = self.rng.randint(1, 10 ** 6)
+        self._book({'guest_first': 'Load', 'guest_last': 'Test', 'guest_email': f"guest{n}{GUEST_DOMAIN}",
+                    'guest_phone': ''})
+
+    def customer(self):
+        if not self.fixtures['customers']:
+            return self.browse()
+        customer = self.rng.choice(self.fixtures['customers'])
+        self._login(customer['email'], customer['password'])
+        self.step('my_trips', 'GET', '/mytrips')
+        self._book()
+        self.step('logout', 'GET', '/logout', expected=302)
+
+    def guest_lookup(self):
+        if not self.fixtures['guest_orders']:
+            return self.browse()
+        order = self.rng.choice(self.fixtures['guest_orders'])
+        self.step('guest_manage', 'POST', '/guest_manage',
+                  {'order_code': order['order_code'], 'email': order['customer_email'], 'action': 'view'})
+
+    def manager(self):
+        if not self.fixtures['managers']:
+            return self.browse()
+        manager = self.rng.choice(self.fixtures['managers'])
+        self._login(manager['manager_id'], manager['password'])
+        self.step('manager_reports', 'GET', '/manager/reports')
+        self.step('logout', 'GET', '/logout', expected=302)
+
+    def run(self, deadline, mix):
+        names, weights = zip(*mix.items())
+        while time.monotonic() < deadline:
+            journey = self.rng.choices(names, weights=weights)[0]
+            try:
+                getattr(self, journey)()
+            except Exception as e:
+                print(f"{journey} journey failed: {e}")
+                self.recorder.add(journey, 0.0, 599, 200)
+                continue
+            self.recorder.add_journey()
+
+
+def _parse_metrics(text):
+    """Reads request and query counts per endpoint from the /metrics output (see metrics.py)."""
+    snapshot = {}
+    for line in text.splitlines():
+        match = re.match(r'(flytau_http_request_duration_seconds_count|flytau_db_queries_total)'
+                         r'\{endpoint="((?:[^"\\]|\\.)*)"\} (\S+)', line)
+        if match:
+            key = 'requests' if match.group(1).endswith('_count') else 'queries'
+            snapshot.setdefault(match.group(2), {})[key] = float(match.group(3))
+    return snapshot
+
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def cleanup_orders(order_codes):
+    """
+    Deletes the orders created by a run and the load-test guests, reopens flights they filled up, and
+    rebuilds the summary tables the bookings were counted in - in one transaction.
+    """
+    with db_tx() as tx:
+        delete_test_orders(tx.cursor, order_codes)
+        tx.cursor.execute("DELETE FROM Customer_Phones WHERE email LIKE %s", (f"%{GUEST_DOMAIN}",))
+        tx.cursor.execute("DELETE FROM Unregistered_Customers WHERE email LIKE %s", (f"%{GUEST_DOMAIN}",))
+
+
+def run(mode='client', base_url=None, users=10, duration=60, warmup=5, seed=1, mix=None):
+    """
+    Runs the journeys and returns the results.
+    Returns: dict: 'meta', 'totals', 'endpoints' (label -> stats) and the created 'order_codes'.
+    """
+    mix = mix or JOURNEY_MIX
+    fixtures = load_fixtures()
+    if mode == 'client':
+        from main import app
+        from metrics import request_metrics
+        make_client = lambda: InProcessClient(app)
+        read_metrics = request_metrics.snapshot
+    else:
+        make_client = lambda: HttpClient(base_url)
+        metrics_client = HttpClient(base_url)
+
+        def read_metrics():
+            status, body = metrics_client.request('GET', '/metrics')
+            return _parse_metrics(body.decode()) if status == 200 else {}
+
+    recorder = Recorder()
+    start = time.monotonic()
+    deadline = start + warmup + duration
+    threads = [threading.Thread(target=VirtualUser(make_client(), fixtures, recorder,
+                                                   random.Random(seed * 1000 + i)).run,
+                                args=(deadline, mix), daemon=True)
+               for i in range(users)]
+    for t in threads:
+        t.start()
+    time.sleep(warmup)
+    before = read_metrics()
+    recorder.recording = True
+    measured_from = time.monotonic()
+    for t in threads:
+        t.join()
+    elapsed = time.monotonic() - measured_from
+    recorder.recording = False
+    after = read_metrics()
+
+    endpoints = {}
+    total = errors = 0
+    for label, samples in sorted(recorder.samples.items()):
+        samples.sort()
+        counts = after.get(label, {})
+        base = before.get(label, {})
+        served = counts.get('requests', 0) - base.get('requests', 0)
+        queries = counts.get('queries', 0) - base.get('queries', 0)
+        endpoints[label] = {
+            'requests': len(samples),
+            'errors': recorder.errors.get(label, 0),
+            'rejected': recorder.rejected.get(label, 0),
+            'throughput_rps': round(len(samples) / elapsed, 2),
+            'mean_ms': round(sum(samples) / len(samples) * 1000, 2),
+            'p50_ms': round(percentile(samples, 50) * 1000, 2),
+            'p95_ms': round(percentile(samples, 95) * 1000, 2),
+            'p99_ms': round(percentile(samples, 99) * 1000, 2),
+            'max_ms': round(samples[-1] * 1000, 2),
+            'queries_per_request': round(queries / served, 2) if served else None,
+        }
+        total += len(samples)
+        errors += recorder.errors.get(label, 0)
+
+    return {
+        'meta': {'timestamp': datetime.now().isoformat(timespec='seconds'), 'revision': _git_revision(),
+                 'mode': mode, 'users': users, 'duration_s': duration, 'warmup_s': warmup, 'seed': seed,
+                 'mix': mix, 'dataset': fixtures['dataset']},
+        'totals': {'requests': total, 'errors': errors, 'journeys': recorder.journeys,
+                   'throughput_rps': round(total / elapsed, 2), 'elapsed_s': round(elapsed, 2)},
+        'endpoints': endpoints,
+        'order_codes': recorder.order_codes,
+    }
+
+
+def compare(baseline, current, max_regression=0.20, min_delta_ms=5.0, min_samples=20, max_query_growth=0.5):
+    """
+    Compares two runs.
+    Returns: tuple[list[str], list[str]]: (regressions, notes). Any regression fails the gate.
+    """
+    regressions, notes = [], []
+    if baseline['meta'].get('dataset') != current['meta'].get('dataset'):
+        notes.append(f"datasets differ: {baseline['meta'].get('dataset')} vs {current['meta'].get('dataset')}")
+    for key in ('mode', 'users', 'mix'):
+        if baseline['meta'].get(key) != current['meta'].get(key):
+            notes.append(f"{key} differs: {baseline['meta'].get(key)} vs {current['meta'].get(key)}")
+
+    old_rps, new_rps = baseline['totals']['throughput_rps'], current['totals']['throughput_rps']
+    if old_rps and new_rps < old_rps * (1 - max_regression):
+        regressions.append(f"throughput {old_rps} -> {new_rps} req/s")
+
+    for label, new in sorted(current['endpoints'].items()):
+        old = baseline['endpoints'].get(label)
+        if old is None:
+            notes.append(f"{label}: not in the baseline")
+            continue
+        if new['errors'] > old['errors'] and new['errors'] / new['requests'] > 0.01:
+            regressions.append(f"{label}: {new['errors']} errors (baseline {old['errors']})")
+        if old['queries_per_request'] is not None and new['queries_per_request'] is not None \
+                and new['queries_per_request'] > old['queries_per_request'] + max_query_growth:
+            regressions.append(f"{label}: queries/request {old['queries_per_request']} -> {new['queries_per_request']}")
+        if min(old['requests'], new['requests']) < min_samples:
+            notes.append(f"{label}: too few samples to gate latency")
+            continue
+        for metric in ('p50_ms', 'p95_ms'):
+            if new[metric] > old[metric] * (1 + max_regression) and new[metric] - old[metric] >= min_delta_ms:
+                regressions.append(f"{label}: {metric} {old[metric]} -> {new[metric]}")
+    return regressions, notes
+
+
+def print_results(results):
+    totals = results['totals']
+    print(f"{totals['requests']} requests, {totals['journeys']} journeys in {totals['elapsed_s']}s: "
+          f"{totals['throughput_rps']} req/s, {totals['errors']} errors")
+    print(f"{'endpoint':<18} {'requests':>8} {'err':>5} {'rej':>5} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'queries':>8}")
+    for label, e in results['endpoints'].items():
+        queries = '-' if e['queries_per_request'] is None else e['queries_per_request']
+        print(f"{label:<18} {e['requests']:>8} {e['errors']:>5} {e['rejected']:>5} {e['throughput_rps']:>8} "
+              f"{e['p50_ms']:>8} {e['p95_ms']:>8} {e['p99_ms']:>8} {queries:>8}")
+
+
+def _gate(baseline_path, results):
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions, notes = compare(baseline, results, **gate_config)
+    for note in notes:
+        print(f"note: {note}")
+    for regression in regressions:
+        print(f"REGRESSION: {regression}")
+    print("FAIL" if regressions else "PASS")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Booking-flow load test and latency regression gate.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help="Run the journeys")
+    run_parser.add_argument('--mode', choices=['client', 'http'], default='client')
+    run_parser.add_argument('--base-url', default='http://127.0.0.1:5000', help="Server URL (http mode)")
+    run_parser.add_argument('--users', type=int, default=10, help="Concurrent virtual users")
+    run_parser.add_argument('--duration', type=float, default=60, help="Measured seconds")
+    run_parser.add_argument('--warmup', type=float, default=5, help="Seconds run before measuring")
+    run_parser.add_argument('--seed', type=int, default=1)
+    run_parser.add_argument('--output', help="Write the results to this JSON file")
+    run_parser.add_argument('--baseline', help="Compare with this results file and fail on regressions")
+    run_parser.add_argument('--keep-orders', action='store_true', help="Don't delete the orders created")
+    compare_parser = commands.add_parser('compare', help="Compare two results files")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--max-regression', type=float, default=gate_config['max_regression'])
+    args = parser.parse_args()
+
+    if args.command == 'compare':
+        gate_config['max_regression'] = args.max_regression
+        with open(args.current, encoding='utf-8') as f:
+            return _gate(args.baseline, json.load(f))
+
+    try:
+        results = run(args.mode, args.base_url, args.users, args.duration, args.warmup, args.seed)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    print_results(results)
+    if not args.keep_orders and results['order_codes']:
+        cleanup_orders(results['order_codes'])
+        print(f"{len(results['order_codes'])} test orders deleted")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, default=str)
+    return _gate(args.baseline, results) if args.baseline else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,8 +1,14 @@
-from flask import Flask, render_template, request, redirect, url_for, flash
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, Response
 from flask_login import LoginManager, login_user, logout_user, current_user, login_required
 from utils import *
 import os
-from sql_queries import q1, q2, q3, q4, q5
+from sql_queries import r1, r2, r3, r4, r5
+from report_aggregates import record_flight_cancelled
+from scheduler import status_scheduler, scheduler_config
+from report_executor import report_executor
+from bulk_import import parse_schedule, import_schedule
+from metrics import request_metrics
+from order_codes import normalize as normalize_order_code
 
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 
@@ -28,25 +34,129 @@ def load_user(user_id):
     return get_user_by_id(user_id)
 
 
+@app.before_request
+def start_background_jobs():
+    """
+    Starts the status-lifecycle scheduler (flights -> 'Arrived', orders -> 'Executed')
+    the first time a request reaches this process. It replaces the UPDATE that used to run
+    on every homepage view, so '/' is now a pure read.
+    """
+    if scheduler_config["enabled"]:
+        status_scheduler.ensure_started()
+
+
+@app.before_request
+def start_request_metrics():
+    """Opens the per-request scope that counts this request's SQL statements (see metrics.py)."""
+    request_metrics.start_request()
+
+
+@app.after_request
+def finish_request_metrics(response):
+    request_metrics.finish_request(request.endpoint or '<unmatched>', response.status_code)
+    return response
+
+
+@app.teardown_request
+def finish_failed_request_metrics(error):
+    """Requests that raised never reach after_request; count them as 500s."""
+    if error is not None:
+        request_metrics.finish_request(request.endpoint or '<unmatched>', 500)
+
+
+def _collect_runtime_metrics():
+    """Connection pool and cache counters for /metrics."""
+    families = []
+    pool = db_pool.stats()
+    for key in ('open', 'idle', 'in_use'):
+        families.append((f'flytau_db_pool_{key}_connections', f"Pool connections ({key}).", 'gauge', [({}, pool[key])]))
+    for key in ('checkouts', 'checkout_timeouts', 'connections_created', 'connections_discarded'):
+        families.append((f'flytau_db_pool_{key}_total', f"Pool {key.replace('_', ' ')}.", 'counter', [({}, pool[key])]))
+
+    caches = {'flight_board': flight_board_cache, 'prices': price_cache, 'users': user_cache,
+              'crew_minutes': crew_minutes_cache}
+    cache_stats = {name: cache.stats() for name, cache in caches.items()}
+    for key, kind in (('size', 'gauge'), ('hits', 'counter'), ('misses', 'counter'),
+                      ('evictions', 'counter'), ('invalidations', 'counter')):
+        name = f'flytau_cache_{key}' + ('_total' if kind == 'counter' else '')
+        families.append((name, f"Cache {key}.", kind,
+                         [({'cache': cache}, stats[key]) for cache, stats in cache_stats.items()]))
+
+    if slow_query_log.enabled:
+        slow = slow_query_log.stats()
+        for key in ('logged', 'dropped'):
+            families.append((f'flytau_slow_queries_{key}_total', f"Slow-query log entries {key}.", 'counter',
+                             [({}, slow[key])]))
+    return families
+
+
+request_metrics.register_collector(_collect_runtime_metrics)
+
+
+@app.route('/metrics')
+def metrics():
+    """
+        Prometheus scrape endpoint: per-endpoint latency, SQL counts and timings, slowest statements,
+        plus connection pool and cache counters (see metrics.py).
+        Only served to managers or to requests from the local machine.
+    """
+    is_manager = current_user.is_authenticated and current_user.user_type == 'Manager'
+    if not is_manager and request.remote_addr not in ('127.0.0.1', '::1'):
+        return Response("Forbidden\n", status=403, mimetype='text/plain')
+    return Response(request_metrics.render(), mimetype='text/plain; version=0.0.4')
+
+
 @app.route('/')
 def homepage():
-    with db_cur() as cursor:
-        cursor.execute("""
-                UPDATE Flights 
-                SET status = 'Arrived' 
-                WHERE status = 'Active' 
-                AND TIMESTAMP(departure_date, departure_time) < NOW()
-            """)
-
     u_type = current_user.user_type if current_user.is_authenticated else 'Guest'  # Detect user type for flight dashboard visibility
 
     date = request.args.get('date')
     source = request.args.get('source')
     dest = request.args.get('dest')
     status_filter = request.args.get('status')
+    page_cursor = request.args.get('cursor')
+
+    try:
+        flights, next_cursor = get_flights_with_filters(u_type, date, source, dest, status_filter, page_cursor)
+    except ValueError:
+        # Stale or tampered "next page" link - fall back to the first page
+        flights, next_cursor = get_flights_with_filters(u_type, date, source, dest, status_filter)
+        page_cursor = None
+
+    return render_template('homepage.html', flights=flights, next_cursor=next_cursor, page_cursor=page_cursor)
 
-    flights = get_flights_with_filters(u_type, date, source, dest, status_filter)
-    return render_template('homepage.html', flights=flights)
+
+@app.route('/api/flights')
+def api_flights():
+    """
+        JSON version of the departures board, paginated the same way as the homepage.
+
+        Query parameters: date, source, dest, status (managers only), cursor (the 'next_cursor'
+        of the previous page) and limit (page size, capped at MAX_FLIGHT_PAGE_SIZE).
+
+        Returns:
+            JSON: {'flights': [...], 'next_cursor': str|None, 'page_size': int}, or 400 for a bad cursor/limit.
+    """
+    u_type = current_user.user_type if current_user.is_authenticated else 'Guest'
+
+    try:
+        page_size = int(request.args.get('limit', FLIGHT_PAGE_SIZE))
+        page_size = max(1, min(page_size, MAX_FLIGHT_PAGE_SIZE))
+        flights, next_cursor = get_flights_with_filters(u_type,
+                                                        request.args.get('date'),
+                                                        request.args.get('source'),
+                                                        request.args.get('dest'),
+                                                        request.args.get('status'),
+                                                        request.args.get('cursor'),
+                                                        page_size)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return jsonify({
+        'flights': [serialize_row(f) for f in flights],
+        'next_cursor': next_cursor,
+        'page_size': page_size
+    })
 
 
 @app.route('/login', methods=['POST'])
@@ -85,6 +195,7 @@ def login():
 
         if user_data:
             user_id = user_data.get('email') or user_data.get('manager_id')
+            invalidate_user(user_id)  # Start the session from the current DB row
             login_user(get_user_by_id(user_id))
             return redirect(url_for('homepage'))
         else:
@@ -133,6 +244,8 @@ def signup():
 @app.route('/logout')
 def logout():
     """ Handles the user/manager logout process """
+    if current_user.is_authenticated:
+        invalidate_user(current_user.get_id())
     logout_user()
     return redirect(url_for('homepage'))
 
@@ -147,10 +260,10 @@ def map_to_letter(column_num):
             column_num (int or str): The column number from the database/loop.
 
         Logic:
-        1. Input Validation: Checks if the input is already a non-digit string (to prevent errors).
-        2. Mapping: Uses a predefined dictionary to map integers 1 through 10
-           to letters 'A' through 'J'.
-        3. Fallback: If the number exceeds 10 or isn't found, returns the original input.
+        Delegates to utils.map_seat_letter, so templates and server-side messages label seats the same way:
+        1. Input Validation: A non-digit string is returned unchanged (to prevent errors).
+        2. Mapping: Integers 1 through 10 map to letters 'A' through 'J'.
+        3. Fallback: If the number is out of range, returns the original input.
 
         Usage Example in HTML:
             {{ seat.column_num | map_to_letter }} -> Outputs 'A'
@@ -158,14 +271,7 @@ def map_to_letter(column_num):
         Returns:
             str: The corresponding letter for the seat column.
         """
-    if isinstance(column_num, str) and not column_num.isdigit():
-        return column_num
-
-    mapping = {
-        1: 'A', 2: 'B', 3: 'C', 4: 'D', 5: 'E', 6: 'F',
-        7: 'G', 8: 'H', 9: 'I', 10: 'J'
-    }
-    return mapping.get(int(column_num), column_num)
+    return map_seat_letter(column_num)
 
 
 @app.route('/book_flight/<string:flight_id>')
@@ -175,7 +281,7 @@ def book_flight(flight_id):
 
         Logic:
         1. Authorization Check: Blocks 'Manager' users from booking to prevent data corruption/conflict of interest.
-        2. Data Retrieval: Calls `get_flight_seat_map` to fetch the flight details and the current status of all seats.
+        2. Data Retrieval: Calls `get_flight_seat_map` to fetch the flight details and the seat occupancy bitmap.
         3. Validation: If the flight ID is invalid, redirects to the homepage.
 
         Args:
@@ -189,7 +295,7 @@ def book_flight(flight_id):
         flash("Managers cannot perform bookings.", "danger")
         return redirect(url_for('homepage'))
 
-    flight_info, seats = get_flight_seat_map(flight_id)
+    flight_info, seat_map = get_flight_seat_map(flight_id)
 
     if not flight_info:
         flash("Flight not found.", "danger")
@@ -197,11 +303,47 @@ def book_flight(flight_id):
 
     return render_template('booking.html',
                            flight_id=flight_id,
-                           all_seats=seats,
+                           seat_map=seat_map,
                            flight_info=flight_info)
 
 
 
+@app.route('/api/flights/<string:flight_id>/seats')
+def api_flight_seats(flight_id):
+    """
+        Compact, pollable seat map for the booking page.
+
+        Logic:
+        1. Data Retrieval: Reads the flight's seat occupancy from the in-process bitmap index, copied once
+           under the index lock so the body and the ETag always describe the same state.
+        2. Encoding: Returns the class layout (first row, rows, columns per class) plus the taken-seat
+           bitmap as base64 - bit i is seat i in row-major order, least significant bit first.
+        3. Conditional GET: Sends a strong ETag derived from the bitmap, so a client polling with
+           If-None-Match gets an empty 304 until a seat is actually taken or released.
+
+        Returns:
+            JSON seat map, 304 Not Modified, or 404 if the flight does not exist.
+    """
+    flight_info, seat_map = get_flight_seat_map(flight_id)
+    if not flight_info:
+        return jsonify({'error': 'Flight not found.'}), 404
+
+    # One consistent copy of the bitmap for both the body and the ETag
+    bits, taken_count = seat_index.snapshot(seat_map)
+    response = jsonify({
+        'flight_id': flight_id,
+        'departure_date': str(flight_info['departure_date']),
+        'airplane_id': flight_info['airplane_id'],
+        'layout': seat_map.layout.class_summary(),
+        'seat_count': seat_map.layout.size,
+        'taken_count': taken_count,
+        'taken': seat_map.encoded_bits(bits)
+    })
+    response.set_etag(seat_map.etag(bits))
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+
 @app.route('/manager/set_price', methods=['POST'])
 @login_required
 def set_flights_price():
@@ -212,7 +354,7 @@ def set_flights_price():
         1. Authorization: Verifies the user is a 'Manager'.
         2. Input: Receives 'economy_price' and 'business_price' from the form.
         3. Database Update: Executes UPDATE queries on the 'Classes_In_Flights' table
-           specifically for the given flight_id.
+           specifically for the given flight_id, in one transaction.
 
         Returns:
             redirect: Redirects to the homepage.
@@ -225,9 +367,10 @@ def set_flights_price():
     econ_price = float(request.form.get('economy_price'))
     biz_price = float(request.form.get('business_price'))
 
-    with db_cur() as cursor:
-        try:
-
+    try:
+        # Both prices change together
+        with db_tx() as tx:
+            cursor = tx.cursor
             cursor.execute("""
                 UPDATE Classes_In_Flights 
                 SET price = %s 
@@ -240,14 +383,74 @@ def set_flights_price():
                 WHERE flight_id = %s AND class_type = 'Business'
             """, (biz_price, flight_id))
 
-            flash(f"Prices for flight {flight_id} updated successfully!", "success")
+            cursor.execute("SELECT departure_date, source_airport, destination_airport FROM Flights WHERE flight_id = %s",
+                           (flight_id,))
+            flights = cursor.fetchall()
 
-        except Exception as e:
-            flash(f"Error updating prices: {str(e)}", "danger")
+        for f in flights:
+            invalidate_flight_board(f['departure_date'], f['source_airport'], f['destination_airport'])
+        invalidate_prices(flight_id)
+
+        flash(f"Prices for flight {flight_id} updated successfully!", "success")
+
+    except Exception as e:
+        flash(f"Error updating prices: {str(e)}", "danger")
 
     return redirect(url_for('homepage'))
 
 
+# Rejected rows listed individually after an upload (the rest are summarised)
+MAX_FLASHED_VIOLATIONS = 20
+
+
+@app.route('/manager/import_schedule', methods=['POST'])
+@login_required
+def import_schedule_upload():
+    """
+        Imports a season schedule (CSV or JSON file of flights with prices and crew) in one batch.
+        Restricted to Managers.
+
+        Logic:
+        1. Parses the uploaded file (format chosen by its extension, see bulk_import.py).
+        2. Validates every row in one pass (runway, aircraft, crew and crew-size rules) and inserts the
+           valid rows in one transaction, unless 'dry_run' is checked.
+        3. Flashes the number of imported flights and the rejected rows with their reasons.
+
+        Returns:
+            redirect: Redirects to the homepage.
+    """
+    if current_user.user_type != 'Manager':
+        flash("Unauthorized", "danger")
+        return redirect(url_for('homepage'))
+
+    upload = request.files.get('schedule_file')
+    if not upload or not upload.filename:
+        flash("Please choose a schedule file (CSV or JSON).", "danger")
+        return redirect(url_for('homepage'))
+
+    dry_run = bool(request.form.get('dry_run'))
+    try:
+        rows = parse_schedule(upload.stream, upload.filename)
+        count, violations = import_schedule(rows, dry_run=dry_run)
+    except ValueError as e:
+        flash(f"Could not read the schedule: {e}", "danger")
+        return redirect(url_for('homepage'))
+    except Exception as e:
+        flash(f"Import failed, nothing was imported: {e}", "danger")
+        return redirect(url_for('homepage'))
+
+    rejected = len({number for number, _, _ in violations})
+    verb = "would be imported (dry run)" if dry_run else "imported"
+    flash(f"{len(rows)} rows read, {count} flights {verb}, {rejected} rows rejected.",
+          "success" if not violations else "warning")
+    for number, flight_id, message in violations[:MAX_FLASHED_VIOLATIONS]:
+        flash(f"Row {number} ({flight_id}): {message}", "danger")
+    if len(violations) > MAX_FLASHED_VIOLATIONS:
+        flash(f"... and {len(violations) - MAX_FLASHED_VIOLATIONS} more violations "
+              f"(run bulk_import.py --dry-run for the full list).", "danger")
+    return redirect(url_for('homepage'))
+
+
 @app.route('/mytrips')
 @login_required
 def my_trips():
@@ -305,9 +508,10 @@ def cancel_flight(flight_id):
         2. Time Validation (Project requirements): Checks if the flight is more than 72 hours away.
            If it's closer than 72h, cancellation is blocked.
         3. Database Updates (Transaction):
-           - Updates Flights table status to 'Cancelled'.
+           - Updates Flights table status to 'Cancelled' (only if it is still Active / Full Capacity).
            - Updates all related Orders to 'Cancelled by system'.
            - Sets ticket prices to 0 (Simulating a full refund).
+           - Updates the dashboard summary tables.
 
         Returns:
             redirect: Redirects to the homepage.
@@ -318,7 +522,10 @@ def cancel_flight(flight_id):
         return redirect(url_for('homepage'))
 
     with db_cur() as cursor:
-        query = "SELECT departure_date, departure_time FROM Flights WHERE flight_id = %s"
+        query = """
+            SELECT departure_date, departure_time, source_airport, destination_airport
+            FROM Flights WHERE flight_id = %s
+        """
         cursor.execute(query, (flight_id,))
         flight = cursor.fetchone()
 
@@ -332,14 +539,29 @@ def cancel_flight(flight_id):
             return redirect(url_for('homepage'))
 
         try:
-            cursor.execute("UPDATE Flights SET status = 'Cancelled' WHERE flight_id = %s", (flight_id,))
-            cursor.execute("""
-                UPDATE Orders O
-                JOIN Flight_Tickets FT ON O.order_code = FT.order_code
-                SET O.status = 'Cancelled by system', FT.price = 0
-                WHERE FT.flight_id = %s AND O.status = 'Active'
-            """, (flight_id,))
-
+            with db_tx(cursor) as tx:
+                cursor.execute("""
+                    UPDATE Flights SET status = 'Cancelled'
+                    WHERE flight_id = %s AND status IN ('Active', 'Full Capacity')
+                """, (flight_id,))
+                if cursor.rowcount == 0:
+                    tx.rollback()
+                    flash(f"Flight {flight_id} is no longer active.", "danger")
+                    return redirect(url_for('homepage'))
+
+                # Summaries first: they need the orders and prices from before the refund
+                record_flight_cancelled(cursor, flight_id, flight['departure_date'])
+                cursor.execute("""
+                    UPDATE Orders O
+                    JOIN Flight_Tickets FT ON O.order_code = FT.order_code
+                    SET O.status = 'Cancelled by system', FT.price = 0, FT.seat_hold = NULL
+                    WHERE FT.flight_id = %s AND O.status = 'Active'
+                """, (flight_id,))
+
+            invalidate_flight_board(flight['departure_date'], flight['source_airport'], flight['destination_airport'])
+            seat_index.drop(flight_id)
+            schedule_index.remove_flight(flight_id, flight['departure_date'])
+            crew_index.remove_flight(flight_id, flight['departure_date'])
             flash(f"Flight {flight_id} cancelled and customers refunded.", "success")
         except Exception as e:
             flash(f"Error: {str(e)}", "danger")
@@ -358,8 +580,9 @@ def add_flight():
         1. Step 1: Fetches available routes from 'Flight_Routes' to display selection.
         2. Step 2: Retrieves flight duration based on the selected route.
         3. Step 3: Validates input (Unique Flight ID and departure date, Date have not past, airplane existence, Runway availability).
-           - Checks for runway conflicts within a 1-hour buffer.
-           - Checks for resource availability (Planes, Pilots, Attendants).
+           - Checks for runway conflicts within a 1-hour buffer (in-memory schedule index, see schedule_index.py).
+           - Checks for resource availability (Planes, Pilots, Attendants; crew by duty time plus rest, see crew_index.py).
+           - Pre-selects a suggested plane and crew (assignment_solver.py); the manager can change it.
         4. Finish: Commits the new flight and updates all resource mapping tables.
 
         Returns:
@@ -420,23 +643,13 @@ def add_flight():
             return render_template('add_flight.html', step=2, source=source, dest=dest, duration=duration,
                                    prev_fid=f_id, prev_date=date, prev_time=time, prev_runway=runway)
 
-        with db_cur() as cursor:
-            conflict_query = """
-                SELECT flight_id, departure_time 
-                FROM Flights 
-                WHERE departure_date = %s 
-                  AND runway_num = %s 
-                  AND departure_time BETWEEN SUBTIME(%s, '01:00:00') AND ADDTIME(%s, '01:00:00')
-            """
-            cursor.execute(conflict_query, (date, runway, time, time))
-            conflicts = cursor.fetchall()
-
-            if conflicts:
-                flash(
-                    f"Error: Runway {runway} is busy within 1 hour of {time}. Conflicting flight(s): {[c['flight_id'] for c in conflicts]}",
-                    "danger")
-                return render_template('add_flight.html', step=2, source=source, dest=dest, duration=duration,
-                                       prev_fid=f_id, prev_date=date, prev_time=time, prev_runway=runway)
+        conflicts = get_runway_conflicts(date, time, runway)
+        if conflicts:
+            flash(
+                f"Error: Runway {runway} is busy within {schedule_config['runway_buffer_minutes']} minutes of {time}. Conflicting flight(s): {conflicts}",
+                "danger")
+            return render_template('add_flight.html', step=2, source=source, dest=dest, duration=duration,
+                                   prev_fid=f_id, prev_date=date, prev_time=time, prev_runway=runway)
 
         planes, pilots, attendants = get_available_resources(date, time, duration)
 
@@ -454,11 +667,13 @@ def add_flight():
             return render_template('add_flight.html', step=2, source=source, dest=dest, duration=duration,
                                    prev_fid=f_id, prev_date=date, prev_time=time, prev_runway=runway)
 
+        suggestion = suggest_resources(planes, pilots, attendants, duration)
+
         return render_template('add_flight.html', step=3,
                                flight_id=f_id, departure_date=date, departure_time=time, runway_num=runway,
                                source=source, dest=dest, duration=duration,
                                planes=planes, pilots=pilots, attendants=attendants,
-                               is_long_haul=is_long_haul)
+                               is_long_haul=is_long_haul, suggestion=suggestion)
 
     elif step == 'finish':
         success, msg = create_flight_final_step(request.form)
@@ -519,8 +734,8 @@ def order_summary():
 
         Logic:
         1. Validation: Ensures at least one seat is selected.
-        2. Price Calculation: Iterates through the selected seat keys (format: 'row-col-class-id'),
-           fetches the specific price for each seat's class, and sums the total (uses get_current_price).
+        2. Price Calculation: Prices all selected seat keys (format: 'row-col-class-id') with one
+           lookup of the flight's class prices and sums the total (uses quote_seats).
         3. Guest Handling: If the user is not logged in, temporarily captures their
            details from the previous form to pass to the final step.
 
@@ -537,13 +752,11 @@ def order_summary():
 
     flight_info = get_flight_details(flight_id)
 
-    total_price = 0
-    parsed_seats = []
-    for seat_key in selected_seats:
-        row, col, s_class, airplane_id = seat_key.split('-', 3)
-        price = get_current_price(flight_id, s_class)
-        total_price += price
-        parsed_seats.append({'row': row, 'col': col, 'class': s_class, 'price': price, 'key': seat_key})
+    try:
+        quote = quote_seats(flight_id, selected_seats)
+    except ValueError as e:
+        flash(str(e), "danger")
+        return redirect(url_for('book_flight', flight_id=flight_id))
 
     guest_details = {}
     if not current_user.is_authenticated:
@@ -556,8 +769,8 @@ def order_summary():
 
     return render_template('summary.html',
                            flight=flight_info,
-                           seats=parsed_seats,
-                           total=total_price,
+                           seats=quote['seats'],
+                           total=quote['total'],
                            guest=guest_details)
 
 
@@ -607,7 +820,8 @@ def manager_reports():
 
         Logic:
         1. Access Control: Enforces Manager-only access.
-        2. Data Aggregation: Executes 5 distinct SQL queries to fetch:
+        2. Data Aggregation: Reads the 5 pre-aggregated summary tables (see report_aggregates.py)
+           in parallel, each on its own connection (see report_executor.py):
            - Occupancy rates per flight.
            - Total revenue generation.
            - Crew activity logs.
@@ -621,21 +835,14 @@ def manager_reports():
         flash("Access Denied: Managers Only", "danger")
         return redirect(url_for('homepage'))
 
-    data = {}
-    with db_cur() as cursor:
-        cursor.execute(q1)
-        data['occupancy'] = cursor.fetchall()
-        cursor.execute(q2)
-        data['revenue'] = cursor.fetchall()
-
-        cursor.execute(q3)
-        data['crew'] = cursor.fetchall()
-
-        cursor.execute(q4)
-        data['cancellations'] = cursor.fetchall()
-
-        cursor.execute(q5)
-        data['plane_activity'] = cursor.fetchall()
+    # Sections that fail or time out come back as None and are rendered as unavailable
+    data, _ = report_executor.run({
+        'occupancy': r1,
+        'revenue': r2,
+        'crew': r3,
+        'cancellations': r4,
+        'plane_activity': r5,
+    })
 
     return render_template('reports.html', data=data)
 
@@ -648,7 +855,8 @@ def guest_manage():
 
         Logic:
         1. GET Request: Renders the Guest Login form.
-        2. POST Request (Authentication): Verifies if the Order Code matches the Email.
+        2. POST Request (Authentication): Verifies if the Order Code (normalized, so a typed 'O' for '0'
+           still matches) matches the Email.
         3. Action 'View': Displays the order details ('guest_order.html').
         4. Action 'Cancel': Calls `cancel_order_transaction` to cancel the booking
            and calculates any applicable fees.
@@ -659,7 +867,7 @@ def guest_manage():
 
     if request.method == 'POST':
         action = request.form.get('action')
-        order_code = request.form.get('order_code')
+        order_code = normalize_order_code(request.form.get('order_code'))
         email = request.form.get('email')
 
         order_data = get_order_by_code(order_code, email)
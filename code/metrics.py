@@ -0,0 +1,298 @@
+"""
+Per-request SQL instrumentation and Prometheus-format metrics.
+
+db_cur() wraps every cursor in an InstrumentedCursor and reports connection-acquire times here; the Flask
+hooks in main.py open and close a per-request scope around each request. For every endpoint this records:
+  - a request latency histogram and request counts per status code,
+  - a histogram of queries per request, and the total DB time and connection-acquire time,
+  - the slowest statements seen (normalized SQL).
+Queries made outside a request (status scheduler, CLI tools, report threads) are counted under the
+endpoint "<background>". render() returns everything in the Prometheus text exposition format, served
+by the /metrics route.
+"""
+import re
+import threading
+import time
+
+# Request latency buckets (seconds) and queries-per-request buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250)
+
+BACKGROUND_ENDPOINT = '<background>'
+
+_WHITESPACE = re.compile(r'\s+')
+_PLACEHOLDER_LIST = re.compile(r'%s(\s*,\s*%s)+')
+_PLACEHOLDER_ROWS = re.compile(r'\(%s(, %s)*\)(\s*,\s*\(%s(, %s)*\))+')
+
+
+def normalize_sql(sql, max_length=300):
+    """
+    Collapses a statement into a stable, single-line form: whitespace squeezed, placeholder lists such as
+    `IN (%s, %s, %s)` and multi-row VALUES reduced to one element, and long statements truncated.
+    Returns: str
+    """
+    text = _WHITESPACE.sub(' ', sql if isinstance(sql, str) else sql.decode('utf-8', 'replace')).strip()
+    text = _PLACEHOLDER_ROWS.sub(lambda m: m.group(0).split(')')[0] + '), ...', text)
+    text = _PLACEHOLDER_LIST.sub('%s, ...', text)
+    return text if len(text) <= max_length else text[:max_length - 3] + '...'
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics: each bucket counts observations <= its bound)."""
+
+    __slots__ = ('buckets', 'counts', 'total', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.total += value
+        self.count += 1
+
+
+class EndpointStats:
+    """Everything recorded for one endpoint."""
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.queries_per_request = Histogram(QUERY_COUNT_BUCKETS)
+        self.responses = {}          # status code -> count
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.acquire_seconds = 0.0
+        self.slowest = {}            # normalized SQL -> longest duration seen
+
+
+class _RequestScope:
+    __slots__ = ('started', 'queries', 'query_seconds', 'acquire_seconds', 'statements')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.acquire_seconds = 0.0
+        self.statements = []         # (duration, sql)
+
+
+class RequestMetrics:
+    """
+    Thread-safe registry of the per-endpoint stats. The current request's counters live in a thread-local
+    scope and are merged into the endpoint's stats once, when the request ends.
+    """
+
+    def __init__(self, enabled=True, slowest_statements=5):
+        self.enabled = enabled
+        self.slowest_statements = slowest_statements
+        self._endpoints = {}
+        self._collectors = []        # callables returning [(metric name, help, type, [(labels, value)])]
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stats(self, endpoint):
+        stats = self._endpoints.get(endpoint)
+        if stats is None:
+            stats = self._endpoints[endpoint] = EndpointStats()
+        return stats
+
+    def _keep_slowest(self, stats, statements):
+        for duration, sql in statements:
+            key = normalize_sql(sql)
+            if duration > stats.slowest.get(key, 0.0):
+                stats.slowest[key] = duration
+        if len(stats.slowest) > self.slowest_statements:
+            keep = sorted(stats.slowest.items(), key=lambda item: item[1], reverse=True)[:self.slowest_statements]
+            stats.slowest = dict(keep)
+
+    def start_request(self):
+        """Opens the scope of the current thread's request."""
+        if self.enabled:
+            self._local.scope = _RequestScope()
+
+    def finish_request(self, endpoint, status):
+        """
+        Closes the current request's scope and adds it to the endpoint's stats.
+        param endpoint (str): The endpoint (route) name.
+        param status (int): The response status code.
+        """
+        scope = getattr(self._local, 'scope', None)
+        if scope is None:
+            return
+        self._local.scope = None
+        elapsed = time.perf_counter() - scope.started
+        with self._lock:
+            stats = self._stats(endpoint)
+            stats.latency.observe(elapsed)
+            stats.queries_per_request.observe(scope.queries)
+            stats.responses[status] = stats.responses.get(status, 0) + 1
+            stats.queries += scope.queries
+            stats.query_seconds += scope.query_seconds
+            stats.acquire_seconds += scope.acquire_seconds
+            self._keep_slowest(stats, scope.statements)
+
+    def record_acquire(self, seconds):
+        """Records the time spent waiting for a pooled connection."""
+        if not self.enabled:
+            return
+        scope = getattr(self._local, 'scope', None)
+        if scope is not None:
+            scope.acquire_seconds += seconds
+            return
+        with self._lock:
+            self._stats(BACKGROUND_ENDPOINT).acquire_seconds += seconds
+
+    def record_query(self, sql, seconds):
+        """Records one executed statement."""
+        if not self.enabled:
+            return
+        scope = getattr(self._local, 'scope', None)
+        if scope is not None:
+            scope.queries += 1
+            scope.query_seconds += seconds
+            scope.statements.append((seconds, sql))
+            return
+        with self._lock:
+            stats = self._stats(BACKGROUND_ENDPOINT)
+            stats.queries += 1
+            stats.query_seconds += seconds
+            self._keep_slowest(stats, [(seconds, sql)])
+
+    def register_collector(self, collector):
+        """
+        Adds extra metrics to render(), e.g. pool or cache stats.
+        param collector (callable): Returns a list of (name, help, type, samples), samples being
+                                    (labels dict, value) pairs.
+        """
+        self._collectors.append(collector)
+
+    def render(self):
+        """Returns: str: Every metric in the Prometheus text exposition format."""
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            lines = []
+            _family(lines, 'flytau_http_request_duration_seconds', 'Request latency per endpoint.', 'histogram')
+            for endpoint, stats in endpoints:
+                _histogram(lines, 'flytau_http_request_duration_seconds', {'endpoint': endpoint}, stats.latency)
+            _family(lines, 'flytau_http_requests_total', 'Requests per endpoint and status code.', 'counter')
+            for endpoint, stats in endpoints:
+                for status, count in sorted(stats.responses.items()):
+                    lines.append(_sample('flytau_http_requests_total', {'endpoint': endpoint, 'status': status}, count))
+            _family(lines, 'flytau_db_queries_per_request', 'SQL statements executed per request.', 'histogram')
+            for endpoint, stats in endpoints:
+                if stats.queries_per_request.count:
+                    _histogram(lines, 'flytau_db_queries_per_request', {'endpoint': endpoint},
+                               stats.queries_per_request)
+            for name, attribute, help_text in (
+                    ('flytau_db_queries_total', 'queries', 'SQL statements executed.'),
+                    ('flytau_db_query_seconds_total', 'query_seconds', 'Time spent executing SQL.'),
+                    ('flytau_db_acquire_seconds_total', 'acquire_seconds', 'Time spent waiting for a pooled connection.')):
+                _family(lines, name, help_text, 'counter')
+                for endpoint, stats in endpoints:
+                    lines.append(_sample(name, {'endpoint': endpoint}, getattr(stats, attribute)))
+            _family(lines, 'flytau_db_slowest_statement_seconds', 'Longest duration of the slowest statements.', 'gauge')
+            for endpoint, stats in endpoints:
+                for sql, seconds in sorted(stats.slowest.items(), key=lambda item: item[1], reverse=True):
+                    lines.append(_sample('flytau_db_slowest_statement_seconds',
+                                         {'endpoint': endpoint, 'statement': sql}, seconds))
+
+        for collector in self._collectors:
+            try:
+                families = collector()
+            except Exception as e:
+                print(f"Metrics collector failed: {e}")
+                continue
+            for name, help_text, kind, samples in families:
+                _family(lines, name, help_text, kind)
+                lines.extend(_sample(name, labels, value) for labels, value in samples)
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self):
+        """Returns: dict: endpoint -> {'requests', 'queries', 'query_seconds', 'acquire_seconds'} recorded so far."""
+        with self._lock:
+            return {endpoint: {'requests': stats.latency.count, 'queries': stats.queries,
+                               'query_seconds': stats.query_seconds, 'acquire_seconds': stats.acquire_seconds}
+                    for endpoint, stats in self._endpoints.items()}
+
+    def reset(self):
+        with self._lock:
+            self._endpoints = {}
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _sample(name, labels, value):
+    value_text = str(value) if isinstance(value, int) else repr(float(value))
+    if not labels:
+        return f"{name} {value_text}"
+    label_text = ','.join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+    return f"{name}{{{label_text}}} {value_text}"
+
+
+def _family(lines, name, help_text, kind):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _histogram(lines, name, labels, histogram):
+    for bound, count in zip(histogram.buckets, histogram.counts):
+        lines.append(_sample(f"{name}_bucket", dict(labels, le=f"{bound:g}"), count))
+    lines.append(_sample(f"{name}_bucket", dict(labels, le="+Inf"), histogram.count))
+    lines.append(_sample(f"{name}_sum", labels, histogram.total))
+    lines.append(_sample(f"{name}_count", labels, histogram.count))
+
+
+class InstrumentedCursor:
+    """
+    Cursor proxy that times execute() / executemany() and reports them to a RequestMetrics registry, and to
+    a slow-query log (slow_query_log.py) when one is given.
+    Everything else (fetch*, rowcount, lastrowid, ...) is passed through to the real cursor.
+    """
+
+    __slots__ = ('_cursor', '_metrics', '_slow_log')
+
+    def __init__(self, cursor, metrics, slow_log=None):
+        self._cursor = cursor
+        self._metrics = metrics
+        self._slow_log = slow_log
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._cursor.execute(operation, params, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._metrics.record_query(operation, elapsed)
+            if self._slow_log is not None:
+                self._slow_log.record(operation, params, elapsed)
+
+    def executemany(self, operation, seq_params, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._cursor.executemany(operation, seq_params, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._metrics.record_query(operation, elapsed)
+            if self._slow_log is not None:
+                self._slow_log.record(operation, seq_params, elapsed, many=True)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+
+# Instrumentation settings
+metrics_config = {
+    "enabled": True,          # Wrap cursors and record request metrics
+    "slowest_statements": 5   # Slowest distinct statements kept per endpoint
+}
+
+request_metrics = RequestMetrics(**metrics_config)
@@ -0,0 +1,175 @@
+"""
+Versioned schema migrations.
+
+Migrations are the numbered files in "SQL code/migrations" (NNNN_description.sql) and are applied in
+version order. Every applied version is recorded in the Schema_Migrations table together with the file's
+checksum, so each migration runs once per database and later edits to an applied file are reported.
+A database created from Create_Schema_FLYTAU.sql already records the migrations it contains.
+
+Usage:
+    python migrations.py status             # applied / pending / modified migrations
+    python migrations.py up                 # apply every pending migration
+    python migrations.py baseline --to 2    # record 0001..0002 as applied without running them
+                                            # (for databases where they were applied by hand)
+"""
+import argparse
+import hashlib
+import os
+import re
+import sys
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'SQL code', 'migrations')
+MIGRATION_FILE = re.compile(r'^(\d{4})_(\w+)\.sql$')
+
+
+class Migration:
+    """One migration file: its version, name, SQL statements and checksum."""
+
+    def __init__(self, version, name, path):
+        self.version = version
+        self.name = name
+        self.path = path
+        with open(path, encoding='utf-8') as f:
+            self.sql = f.read()
+        self.checksum = hashlib.sha256(self.sql.encode('utf-8')).hexdigest()
+
+    def statements(self):
+        """
+        Splits the file into statements: '--' comment lines are dropped and a statement ends with ';' at
+        the end of a line.
+        Returns: list[str]
+        """
+        statements, current = [], []
+        for line in self.sql.splitlines():
+            if line.strip().startswith('--') or not line.strip():
+                continue
+            current.append(line)
+            if line.rstrip().endswith(';'):
+                statements.append('\n'.join(current).rstrip().rstrip(';'))
+                current = []
+        if current:
+            statements.append('\n'.join(current))
+        return statements
+
+
+def load_migrations(directory=MIGRATIONS_DIR):
+    """Returns: list[Migration]: Every migration file in the directory, in version order."""
+    migrations = []
+    for filename in os.listdir(directory):
+        match = MIGRATION_FILE.match(filename)
+        if match:
+            migrations.append(Migration(int(match.group(1)), match.group(2), os.path.join(directory, filename)))
+    migrations.sort(key=lambda m: m.version)
+
+    versions = [m.version for m in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError(f"Duplicate migration versions in {directory}")
+    return migrations
+
+
+def ensure_migrations_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS Schema_Migrations (
+            version INT PRIMARY KEY,
+            name VARCHAR(100),
+            checksum CHAR(64),
+            applied_at DATETIME
+        )
+    """)
+
+
+def applied_migrations(cursor):
+    """Returns: dict: version -> checksum (None for versions recorded by Create_Schema_FLYTAU.sql)."""
+    ensure_migrations_table(cursor)
+    cursor.execute("SELECT version, checksum FROM Schema_Migrations")
+    return {row['version']: row['checksum'] for row in cursor.fetchall()}
+
+
+def _record(cursor, migration, checksum):
+    cursor.execute("""
+        INSERT INTO Schema_Migrations (version, name, checksum, applied_at)
+        VALUES (%s, %s, %s, NOW())
+    """, (migration.version, migration.name, checksum))
+
+
+def apply_migration(cursor, migration):
+    """
+    Runs every statement of a migration, then records it.
+    MySQL commits DDL implicitly, so a failing migration is not rolled back: the statements before the
+    failing one stay applied and the migration stays pending until it is fixed and re-run.
+    Raises: mysql.connector.Error: With the failing statement number printed first.
+    """
+    for number, statement in enumerate(migration.statements(), start=1):
+        try:
+            cursor.execute(statement)
+        except Exception:
+            print(f"Migration {migration.version:04d}_{migration.name} failed at statement {number}:\n{statement}")
+            raise
+    _record(cursor, migration, migration.checksum)
+
+
+def pending_migrations(cursor, migrations):
+    applied = applied_migrations(cursor)
+    return [m for m in migrations if m.version not in applied]
+
+
+def migrate(cursor, migrations=None):
+    """
+    Applies every pending migration in version order.
+    Returns: list[Migration]: The migrations that were applied.
+    """
+    migrations = load_migrations() if migrations is None else migrations
+    applied = []
+    for migration in pending_migrations(cursor, migrations):
+        print(f"Applying {migration.version:04d}_{migration.name} ...")
+        apply_migration(cursor, migration)
+        applied.append(migration)
+    return applied
+
+
+def print_status(cursor, migrations):
+    applied = applied_migrations(cursor)
+    for migration in migrations:
+        label = f"{migration.version:04d}_{migration.name}"
+        if migration.version not in applied:
+            state = "pending"
+        elif applied[migration.version] is None:
+            state = "applied (schema script)"
+        elif applied[migration.version] != migration.checksum:
+            state = "applied, FILE MODIFIED since"
+        else:
+            state = "applied"
+        print(f"{label:<40} {state}")
+    unknown = sorted(set(applied) - {m.version for m in migrations})
+    if unknown:
+        print(f"Recorded versions without a file: {unknown}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Versioned schema migrations.")
+    parser.add_argument('command', choices=['status', 'up', 'baseline'])
+    parser.add_argument('--to', type=int, help="Last version to record (baseline only)")
+    args = parser.parse_args()
+
+    # Imported here so the migration helpers can be used without a configured connection pool
+    from utils import db_cur
+
+    migrations = load_migrations()
+    with db_cur() as cursor:
+        if args.command == 'status':
+            print_status(cursor, migrations)
+        elif args.command == 'up':
+            applied = migrate(cursor, migrations)
+            print(f"{len(applied)} migration(s) applied." if applied else "Database is up to date.")
+        else:
+            if args.to is None:
+                parser.error("baseline requires --to VERSION")
+            for migration in pending_migrations(cursor, migrations):
+                if migration.version <= args.to:
+                    _record(cursor, migration, migration.checksum)
+                    print(f"Recorded {migration.version:04d}_{migration.name} as applied")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Bulk onboarding of pilots and flight attendants.
+
+The file is a CSV with a header row, or a JSON list of objects, with the fields
+    role (Pilot / Attendant), first_name, middle_name, last_name, city, street, house_num, long_flight_training
+where long_flight_training is yes/no (also true/false, 1/0). Every worker gets an ID from the role's ID
+sequence (P-### / FA-###, see id_sequences.py); all of them are inserted in one transaction, so a bad row
+leaves nothing half-imported.
+
+Usage:
+    python onboard_crew.py new_crew.csv
+    python onboard_crew.py new_crew.json --dry-run   # only validate the file
+"""
+import argparse
+import os
+import sys
+from utils import add_new_workers
+from bulk_import import read_records
+
+FIELDS = ['role', 'first_name', 'middle_name', 'last_name', 'city', 'street', 'house_num', 'long_flight_training']
+REQUIRED_FIELDS = ['role', 'first_name', 'last_name']
+ROLES = {'pilot': 'Pilot', 'attendant': 'Attendant', 'flight attendant': 'Attendant'}
+TRUE_VALUES = {'yes', 'y', 'true', '1', 'on'}
+FALSE_VALUES = {'no', 'n', 'false', '0', 'off', ''}
+
+
+def parse_workers(stream, filename):
+    """
+    Reads and validates a crew file.
+    param stream (file): The file contents (text or bytes).
+    param filename (str): Its name; '.json' files are read as JSON, anything else as CSV.
+    Returns: tuple[list[dict], list[tuple]]: The workers (add_new_worker fields) and the
+                                             (row number, message) violations.
+    Raises: ValueError: If the file can't be parsed.
+    """
+    workers, violations = [], []
+    for number, record in enumerate(read_records(stream, filename), start=1):
+        worker = {field: record.get(field) for field in FIELDS}
+        for field in FIELDS:
+            worker[field] = str(worker[field]).strip() if worker[field] is not None else None
+        missing = [field for field in REQUIRED_FIELDS if not worker[field]]
+        if missing:
+            violations.append((number, f"missing {', '.join(missing)}"))
+            continue
+        role = ROLES.get(worker['role'].lower())
+        training = (worker['long_flight_training'] or '').lower()
+        if role is None:
+            violations.append((number, f"unknown role '{worker['role']}' (Pilot or Attendant)"))
+        elif training not in TRUE_VALUES | FALSE_VALUES:
+            violations.append((number, f"long_flight_training must be yes or no, not '{worker['long_flight_training']}'"))
+        else:
+            worker['role'] = role
+            worker['long_flight_training'] = training in TRUE_VALUES
+            workers.append(worker)
+    return workers, violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk onboarding of pilots and flight attendants (CSV or JSON).")
+    parser.add_argument('path', help="Crew file (.csv or .json)")
+    parser.add_argument('--dry-run', action='store_true', help="Only validate, don't insert anything")
+    args = parser.parse_args()
+
+    try:
+        with open(args.path, encoding='utf-8-sig') as f:
+            workers, violations = parse_workers(f, os.path.basename(args.path))
+    except (OSError, ValueError) as e:
+        print(f"Could not read {args.path}: {e}")
+        return 1
+
+    for number, message in violations:
+        print(f"row {number}: {message}")
+    if violations:
+        print(f"{len(violations)} invalid rows, nothing was imported.")
+        return 1
+    if args.dry_run:
+        print(f"{len(workers)} workers would be added.")
+        return 0
+
+    success, message, new_ids = add_new_workers(workers)
+    if not success:
+        print(f"Import failed, nothing was imported: {message}")
+        return 1
+    for worker, worker_id in zip(workers, new_ids):
+        print(f"{worker_id}: {worker['first_name']} {worker['last_name']} ({worker['role']})")
+    print(message)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+Insert-throughput benchmark for order code schemes.
+
+Inserts the same number of order rows into a scratch table shaped like Orders (VARCHAR(20) primary key)
+once per scheme:
+  - random:       8 random capitals/digits, the previous create_booking scheme,
+  - time-ordered: order_codes.OrderCodeGenerator, what create_booking uses now.
+For each scheme it reports the overall and per-segment insert rate (random keys slow down as the table outgrows
+the buffer pool, because every insert lands on a different leaf page), primary-key collisions, and the
+table's size on disk afterwards (page splits from random inserts leave half-empty pages).
+
+Usage (against a local/test database - creates and drops the table Order_Code_Benchmark):
+    python order_code_benchmark.py                        # 100000 rows, 100 rows per transaction
+    python order_code_benchmark.py --rows 1000000 --batch 1
+"""
+import argparse
+import random
+import string
+import sys
+import time
+import mysql.connector
+from utils import db_cur
+from order_codes import OrderCodeGenerator
+
+BENCH_TABLE = 'Order_Code_Benchmark'
+SEGMENTS = 5
+
+
+def random_codes(seed):
+    rng = random.Random(seed)
+    chars = string.ascii_uppercase + string.digits
+    while True:
+        yield ''.join(rng.choices(chars, k=8))
+
+
+def time_ordered_codes(seed):
+    generator = OrderCodeGenerator(lambda: seed)
+    while True:
+        yield generator.next_code()
+
+
+SCHEMES = {'random': random_codes, 'time-ordered': time_ordered_codes}
+
+
+def _create_table(cursor):
+    cursor.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE}")
+    cursor.execute(f"""
+        CREATE TABLE {BENCH_TABLE} (
+            order_code VARCHAR(20) PRIMARY KEY,
+            customer_email VARCHAR(100),
+            status VARCHAR(30),
+            order_date DATE,
+            customer_type VARCHAR(20)
+        ) ENGINE=InnoDB
+    """)
+
+
+def _table_size(cursor):
+    """Returns: tuple[int, int]: (data bytes, free bytes) of the scratch table."""
+    cursor.execute(f"ANALYZE TABLE {BENCH_TABLE}")
+    cursor.fetchall()
+    cursor.execute("""
+        SELECT data_length, data_free FROM information_schema.TABLES
+        WHERE table_schema = DATABASE() AND table_name = %s
+    """, (BENCH_TABLE,))
+    row = cursor.fetchone()
+    return int(row['data_length']), int(row['data_free'])
+
+
+def run_scheme(cursor, codes, rows, batch):
+    """
+    Inserts `rows` orders with codes from `codes`, `batch` rows per transaction.
+    Returns: dict: rows/s overall and per segment, collisions, data size.
+    """
+    _create_table(cursor)
+    sql = f"""
+        INSERT INTO {BENCH_TABLE} (order_code, customer_email, status, order_date, customer_type)
+        VALUES (%s, 'bench@flytau.test', 'Active', CURDATE(), 'Registered')
+    """
+    segment_size = max(1, rows // SEGMENTS)
+    segment_rates = []
+    collisions = inserted = 0
+    started = segment_started = time.perf_counter()
+    while inserted < rows:
+        cursor.execute("START TRANSACTION")
+        for _ in range(min(batch, rows - inserted)):
+            try:
+                cursor.execute(sql, (next(codes),))
+            except mysql.connector.IntegrityError as err:
+                if err.errno != 1062:
+                    raise
+                collisions += 1    # The booking path would retry with a new code
+                continue
+            inserted += 1
+            if inserted % segment_size == 0:
+                now = time.perf_counter()
+                segment_rates.append(segment_size / (now - segment_started))
+                segment_started = now
+        cursor.execute("COMMIT")
+    elapsed = time.perf_counter() - started
+    data_bytes, free_bytes = _table_size(cursor)
+    return {'rate': rows / elapsed, 'segments': segment_rates, 'collisions': collisions,
+            'data_mb': data_bytes / 2 ** 20, 'free_mb': free_bytes / 2 ** 20}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Order code insert-throughput benchmark.")
+    parser.add_argument('--rows', type=int, default=100000, help="Orders inserted per scheme")
+    parser.add_argument('--batch', type=int, default=100, help="Rows per transaction (1 = one order per booking)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--scheme', choices=sorted(SCHEMES), action='append', help="Only run these schemes")
+    args = parser.parse_args()
+
+    results = {}
+    with db_cur() as cursor:
+        try:
+            for name in args.scheme or SCHEMES:
+                print(f"Inserting {args.rows} rows with {name} codes...")
+                results[name] = run_scheme(cursor, SCHEMES[name](args.seed), args.rows, args.batch)
+        finally:
+            cursor.execute(f"DROP TABLE IF EXISTS {BENCH_TABLE}")
+
+    print(f"\n{'scheme':<14} {'rows/s':>9} {'collisions':>10} {'data MB':>8} {'free MB':>8}  rows/s per {100 // SEGMENTS}% of rows")
+    for name, r in results.items():
+        segments = ' '.join(f"{rate:>8.0f}" for rate in r['segments'])
+        print(f"{name:<14} {r['rate']:>9.0f} {r['collisions']:>10} {r['data_mb']:>8.1f} {r['free_mb']:>8.1f}  {segments}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
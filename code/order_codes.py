@@ -0,0 +1,112 @@
+"""
+Time-ordered order codes.
+
+A code is a 60-bit number written as 12 Crockford base32 characters (digits and capitals without I, L, O, U):
+  - 41 bits: milliseconds since ORDER_CODE_EPOCH (good for ~69 years),
+  - 8 bits:  the node id of the issuing process,
+  - 11 bits: a per-millisecond sequence (2048 codes per millisecond per node).
+A generator never repeats a code, and because the alphabet is in ASCII order the codes sort by creation
+time - new orders are appended at the right edge of the Orders primary key instead of being scattered
+across the B-tree like random codes.
+
+Node ids come from a callable (see utils.order_code_generator), fetched on first use and again after a fork,
+and only their low NODE_BITS bits are kept. The node id makes collisions between processes unlikely, not
+impossible: two running processes can end up with the same node id (e.g. the source wrapped past MAX_NODES)
+and then issue the same code in the same millisecond. Uniqueness across processes is guaranteed by the
+Orders primary key - create_booking retries a colliding insert with a fresh code, so a collision costs a
+retry, never a failed booking.
+"""
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+ALPHABET = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+ORDER_CODE_EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+CODE_LENGTH = 12
+
+NODE_BITS = 8
+SEQUENCE_BITS = 11
+MAX_NODES = 1 << NODE_BITS
+_SEQUENCE_MASK = (1 << SEQUENCE_BITS) - 1
+_EPOCH_MS = int(ORDER_CODE_EPOCH.timestamp() * 1000)
+_DECODE = {char: value for value, char in enumerate(ALPHABET)}
+_DECODE.update({'O': 0, 'I': 1, 'L': 1})   # Crockford: read the look-alike letters as digits
+
+
+def encode(value):
+    """Returns: str: `value` as CODE_LENGTH Crockford base32 characters."""
+    chars = []
+    for _ in range(CODE_LENGTH):
+        chars.append(ALPHABET[value & 31])
+        value >>= 5
+    return ''.join(reversed(chars))
+
+
+def normalize(code):
+    """
+    Canonical form of a typed order code: upper case, spaces and dashes removed, and - for codes of this
+    format - the look-alike letters O, I, L read as 0, 1, 1. Other (older) codes are only trimmed and upper-cased.
+    Returns: str
+    """
+    text = (code or '').strip().upper()
+    compact = text.replace('-', '').replace(' ', '')
+    if len(compact) == CODE_LENGTH and all(char in _DECODE for char in compact):
+        return ''.join(ALPHABET[_DECODE[char]] for char in compact)
+    return text
+
+
+def decode(code):
+    """
+    Splits a code into its parts.
+    Returns: tuple[datetime, int, int]: (creation time in UTC, node id, sequence)
+    Raises: ValueError: If `code` is not a code of this format.
+    """
+    text = normalize(code)
+    if len(text) != CODE_LENGTH or any(char not in _DECODE for char in text):
+        raise ValueError(f"Not a time-ordered order code: {code}")
+    value = 0
+    for char in text:
+        value = value << 5 | _DECODE[char]
+    sequence = value & _SEQUENCE_MASK
+    node = value >> SEQUENCE_BITS & (MAX_NODES - 1)
+    ms = value >> (SEQUENCE_BITS + NODE_BITS)
+    return ORDER_CODE_EPOCH + timedelta(milliseconds=ms), node, sequence
+
+
+class OrderCodeGenerator:
+    """Thread-safe generator of unique, time-ordered order codes for one process."""
+
+    def __init__(self, node_id_source):
+        """
+        param node_id_source (callable): Returns this process's node id; only the low NODE_BITS bits are used.
+        """
+        self._node_id_source = node_id_source
+        self._node = None
+        self._pid = None
+        self._last_ms = 0
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    @property
+    def node_id(self):
+        return self._node
+
+    def next_code(self):
+        """Returns: str: A new order code."""
+        with self._lock:
+            if self._pid != os.getpid():
+                # First use, or a forked worker that must not reuse its parent's node id
+                self._node = self._node_id_source() % MAX_NODES
+                self._pid = os.getpid()
+                self._last_ms = 0
+            now = int(time.time() * 1000) - _EPOCH_MS
+            if now > self._last_ms:
+                self._last_ms = now
+                self._sequence = 0
+            else:
+                # Same millisecond (or the clock stepped back): keep counting on the last timestamp
+                self._sequence = (self._sequence + 1) & _SEQUENCE_MASK
+                if self._sequence == 0:
+                    self._last_ms += 1    # Sequence exhausted: borrow the next millisecond
+            return encode(self._last_ms << (NODE_BITS + SEQUENCE_BITS) | self._node << SEQUENCE_BITS | self._sequence)
@@ -0,0 +1,418 @@
+"""
+Incrementally maintained summary tables behind the manager dashboard.
+
+Every write path that changes a report input calls one of the record_* functions below with its own
+cursor, so the summary rows are updated in the same unit of work as the change itself:
+
+    create_flight_final_step  -> record_flight_created
+    bulk schedule import      -> record_flights_created
+    create_booking            -> record_booking
+    cancel_order_transaction  -> record_customer_cancellation
+    cancel_flight             -> record_flight_cancelled
+    status scheduler          -> record_flights_arrived
+
+The dashboard then reads the summary tables with the r1..r5 queries in sql_queries.py instead of
+re-aggregating the full history. rebuild_report_aggregates() recomputes everything from the base
+tables (initial load, or repair after manual data changes):
+
+    python report_aggregates.py --rebuild
+"""
+
+# Month bucket used by q4/q5 (YYYY-MM)
+MONTH_SQL = "DATE_FORMAT({}, '%Y-%m')"
+
+
+def _add_order_revenue(cursor, order_code, sign, price_sql="FT.price"):
+    """
+    Adds (sign=+1) or removes (sign=-1) an order's tickets from the revenue summary.
+    param price_sql (str): SQL expression for the per-ticket amount (defaults to the stored price).
+    """
+    cursor.execute(f"""
+        INSERT INTO Report_Revenue (manufacturer, size, class_type, total_revenue, ticket_count)
+        SELECT A.manufacturer, A.size, FT.class_type, %s * SUM({price_sql}), %s * COUNT(*)
+        FROM Flight_Tickets FT
+        JOIN Airplanes A ON FT.airplane_id = A.airplane_id
+        WHERE FT.order_code = %s
+        GROUP BY A.manufacturer, A.size, FT.class_type
+        ON DUPLICATE KEY UPDATE total_revenue = total_revenue + VALUES(total_revenue),
+                                ticket_count = ticket_count + VALUES(ticket_count)
+    """, (sign, sign, order_code))
+
+
+def record_flight_created(cursor, flight_id, departure_date, airplane_id):
+    """
+    Registers a new flight in the occupancy and plane-activity summaries.
+    param cursor (MySQLCursorDict): The cursor of the transaction that inserted the flight.
+    """
+    cursor.execute("""
+        INSERT INTO Report_Flight_Occupancy (flight_id, departure_date, airplane_id, status, total_seats, occupied_seats)
+        SELECT %s, %s, %s, 'Active', COALESCE(SUM(rows_count * columns_count), 0), 0
+        FROM Airplane_Classes
+        WHERE airplane_id = %s
+        ON DUPLICATE KEY UPDATE airplane_id = VALUES(airplane_id), total_seats = VALUES(total_seats)
+    """, (flight_id, departure_date, airplane_id, airplane_id))
+
+    cursor.execute(f"""
+        INSERT IGNORE INTO Report_Plane_Monthly (airplane_id, activity_month)
+        VALUES (%s, {MONTH_SQL.format('%s')})
+    """, (airplane_id, departure_date))
+
+
+def record_flights_created(cursor, flights):
+    """
+    Batch form of record_flight_created, used by the bulk schedule import: two multi-row inserts in total.
+    param flights (list[tuple]): (flight_id, departure_date, airplane_id) of every new flight.
+    """
+    if not flights:
+        return
+    cursor.execute("""
+        SELECT airplane_id, SUM(rows_count * columns_count) AS total_seats
+        FROM Airplane_Classes
+        GROUP BY airplane_id
+    """)
+    seats = {row['airplane_id']: int(row['total_seats'] or 0) for row in cursor.fetchall()}
+
+    cursor.executemany("""
+        INSERT INTO Report_Flight_Occupancy (flight_id, departure_date, airplane_id, status, total_seats, occupied_seats)
+        VALUES (%s, %s, %s, 'Active', %s, 0)
+        ON DUPLICATE KEY UPDATE airplane_id = VALUES(airplane_id), total_seats = VALUES(total_seats)
+    """, [(flight_id, departure_date, airplane_id, seats.get(airplane_id, 0))
+          for flight_id, departure_date, airplane_id in flights])
+
+    plane_months = sorted({(airplane_id, str(departure_date)[:7]) for _, departure_date, airplane_id in flights})
+    cursor.executemany("""
+        INSERT IGNORE INTO Report_Plane_Monthly (airplane_id, activity_month)
+        VALUES (%s, %s)
+    """, plane_months)
+
+
+def record_booking(cursor, order_code, flight_id, departure_date, ticket_count):
+    """
+    Adds a new order (created today) to the occupancy, revenue and monthly order summaries.
+    param cursor (MySQLCursorDict): The cursor of the booking transaction, after the tickets were inserted.
+    param ticket_count (int): Number of tickets in the order.
+    """
+    cursor.execute("""
+        UPDATE Report_Flight_Occupancy
+        SET occupied_seats = occupied_seats + %s
+        WHERE flight_id = %s AND departure_date = %s
+    """, (ticket_count, flight_id, departure_date))
+
+    _add_order_revenue(cursor, order_code, 1)
+
+    cursor.execute(f"""
+        INSERT INTO Report_Monthly_Orders (order_month, total_orders, cancelled_orders)
+        VALUES ({MONTH_SQL.format('CURDATE()')}, 1, 0)
+        ON DUPLICATE KEY UPDATE total_orders = total_orders + 1
+    """)
+
+
+def record_customer_cancellation(cursor, order_code, fee_per_ticket):
+    """
+    Applies a customer cancellation of an 'Active' order to the summaries.
+    Must run BEFORE the order's ticket prices are replaced by the cancellation fee.
+    param cursor (MySQLCursorDict): The cursor of the cancellation transaction.
+    param fee_per_ticket (float): The fee each ticket will be charged (stored rounded to cents).
+    """
+    cursor.execute("""
+        UPDATE Report_Flight_Occupancy R
+        JOIN (SELECT flight_id, departure_date, COUNT(*) AS tickets
+              FROM Flight_Tickets WHERE order_code = %s
+              GROUP BY flight_id, departure_date) T
+          ON R.flight_id = T.flight_id AND R.departure_date = T.departure_date
+        SET R.occupied_seats = R.occupied_seats - T.tickets
+    """, (order_code,))
+
+    # Revenue keeps the fee (customer cancellations still count), so only the difference is applied
+    cursor.execute("""
+        INSERT INTO Report_Revenue (manufacturer, size, class_type, total_revenue, ticket_count)
+        SELECT A.manufacturer, A.size, FT.class_type, SUM(ROUND(%s, 2) - FT.price), 0
+        FROM Flight_Tickets FT
+        JOIN Airplanes A ON FT.airplane_id = A.airplane_id
+        WHERE FT.order_code = %s
+        GROUP BY A.manufacturer, A.size, FT.class_type
+        ON DUPLICATE KEY UPDATE total_revenue = total_revenue + VALUES(total_revenue)
+    """, (fee_per_ticket, order_code))
+
+    cursor.execute(f"""
+        INSERT INTO Report_Monthly_Orders (order_month, total_orders, cancelled_orders)
+        SELECT {MONTH_SQL.format('order_date')}, 0, 1 FROM Orders WHERE order_code = %s
+        ON DUPLICATE KEY UPDATE cancelled_orders = cancelled_orders + 1
+    """, (order_code,))
+
+
+def record_flight_cancelled(cursor, flight_id, departure_date):
+    """
+    Applies a system cancellation of a flight to the summaries.
+    Must run BEFORE the flight's active orders are marked 'Cancelled by system' and refunded.
+    param cursor (MySQLCursorDict): The cursor of the cancellation transaction.
+    """
+    cursor.execute("""
+        SELECT DISTINCT O.order_code
+        FROM Orders O
+        JOIN Flight_Tickets FT ON O.order_code = FT.order_code
+        WHERE FT.flight_id = %s AND FT.departure_date = %s AND O.status = 'Active'
+    """, (flight_id, departure_date))
+    order_codes = [row['order_code'] for row in cursor.fetchall()]
+
+    # System-cancelled orders produce no revenue
+    for order_code in order_codes:
+        _add_order_revenue(cursor, order_code, -1)
+
+    if order_codes:
+        placeholders = ", ".join(["%s"] * len(order_codes))
+        cursor.execute(f"""
+            INSERT INTO Report_Monthly_Orders (order_month, total_orders, cancelled_orders)
+            SELECT {MONTH_SQL.format('order_date')}, 0, COUNT(*)
+            FROM Orders WHERE order_code IN ({placeholders})
+            GROUP BY {MONTH_SQL.format('order_date')}
+            ON DUPLICATE KEY UPDATE cancelled_orders = cancelled_orders + VALUES(cancelled_orders)
+        """, tuple(order_codes))
+
+    cursor.execute("""
+        UPDATE Report_Flight_Occupancy
+        SET status = 'Cancelled', occupied_seats = 0
+        WHERE flight_id = %s AND departure_date = %s
+    """, (flight_id, departure_date))
+
+    cursor.execute(f"""
+        INSERT INTO Report_Plane_Monthly (airplane_id, activity_month, flights_cancelled)
+        SELECT airplane_id, {MONTH_SQL.format('departure_date')}, 1
+        FROM Flights WHERE flight_id = %s AND departure_date = %s
+        ON DUPLICATE KEY UPDATE flights_cancelled = flights_cancelled + 1
+    """, (flight_id, departure_date))
+
+
+def _refresh_plane_months(cursor, plane_months):
+    """
+    Recomputes days_flown and dominant_route for the given (airplane_id, 'YYYY-MM') pairs.
+    Each recount only reads one plane's arrived flights in one month.
+    """
+    for airplane_id, month in plane_months:
+        month_start = f"{month}-01"
+        cursor.execute("""
+            UPDATE Report_Plane_Monthly R
+            JOIN (SELECT COUNT(DISTINCT departure_date) AS days_flown
+                  FROM Flights
+                  WHERE airplane_id = %s AND status = 'Arrived'
+                    AND departure_date >= %s AND departure_date < %s + INTERVAL 1 MONTH) D
+            JOIN (SELECT CONCAT(source_airport, '-', destination_airport) AS route
+                  FROM Flights
+                  WHERE airplane_id = %s AND status = 'Arrived'
+                    AND departure_date >= %s AND departure_date < %s + INTERVAL 1 MONTH
+                  GROUP BY source_airport, destination_airport
+                  ORDER BY COUNT(*) DESC, route
+                  LIMIT 1) T
+            SET R.days_flown = D.days_flown, R.dominant_route = T.route
+            WHERE R.airplane_id = %s AND R.activity_month = %s
+        """, (airplane_id, month_start, month_start, airplane_id, month_start, month_start, airplane_id, month))
+
+
+def record_flights_arrived(cursor, flight_keys):
+    """
+    Applies a batch of 'Arrived' transitions to the occupancy, crew-hours and plane-activity summaries.
+    Must run in the same transaction as (and after) the status UPDATE of those flights.
+    param flight_keys (list[tuple]): (flight_id, departure_date) of the flights that just arrived.
+    """
+    if not flight_keys:
+        return
+    placeholders = ", ".join(["(%s, %s)"] * len(flight_keys))
+    params = tuple(value for key in flight_keys for value in key)
+
+    # 1. Occupancy: freeze the flight's ratio into the running average
+    cursor.execute(f"""
+        UPDATE Report_Flight_Occupancy SET status = 'Arrived'
+        WHERE (flight_id, departure_date) IN ({placeholders})
+    """, params)
+    cursor.execute(f"""
+        UPDATE Report_Occupancy_Summary S
+        JOIN (SELECT COUNT(*) AS flights, SUM((occupied_seats * 100.0) / total_seats) AS pct_sum
+              FROM Report_Flight_Occupancy
+              WHERE (flight_id, departure_date) IN ({placeholders}) AND total_seats > 0) B
+        SET S.arrived_flights = S.arrived_flights + B.flights,
+            S.occupancy_pct_sum = S.occupancy_pct_sum + COALESCE(B.pct_sum, 0)
+        WHERE S.id = 1
+    """, params)
+
+    # 2. Crew hours (short <= 360 minutes < long)
+    for role, table, id_col, crew_table in (('Pilot', 'Pilots_In_Flights', 'pilot_id', 'Pilots'),
+                                            ('Attendant', 'Attendants_In_Flights', 'attendant_id', 'Flight_Attendants')):
+        cursor.execute(f"""
+            INSERT INTO Report_Crew_Hours (employee_id, role, first_name, last_name, short_minutes, long_minutes)
+            SELECT C.{id_col}, '{role}', C.first_name, C.last_name,
+                   SUM(CASE WHEN R.flight_duration <= 360 THEN R.flight_duration ELSE 0 END),
+                   SUM(CASE WHEN R.flight_duration > 360 THEN R.flight_duration ELSE 0 END)
+            FROM {table} X
+            JOIN {crew_table} C ON X.{id_col} = C.{id_col}
+            JOIN Flights F ON X.flight_id = F.flight_id AND X.departure_date = F.departure_date
+            JOIN Flight_Routes R ON F.source_airport = R.source_airport AND F.destination_airport = R.destination_airport
+            WHERE (F.flight_id, F.departure_date) IN ({placeholders})
+            GROUP BY C.{id_col}, C.first_name, C.last_name
+            ON DUPLICATE KEY UPDATE short_minutes = short_minutes + VALUES(short_minutes),
+                                    long_minutes = long_minutes + VALUES(long_minutes)
+        """, params)
+
+    # 3. Plane activity per month
+    cursor.execute(f"""
+        INSERT INTO Report_Plane_Monthly (airplane_id, activity_month, flights_executed)
+        SELECT airplane_id, {MONTH_SQL.format('departure_date')}, COUNT(*)
+        FROM Flights
+        WHERE (flight_id, departure_date) IN ({placeholders})
+        GROUP BY airplane_id, {MONTH_SQL.format('departure_date')}
+        ON DUPLICATE KEY UPDATE flights_executed = flights_executed + VALUES(flights_executed)
+    """, params)
+    cursor.execute(f"""
+        SELECT DISTINCT airplane_id, {MONTH_SQL.format('departure_date')} AS activity_month
+        FROM Flights
+        WHERE (flight_id, departure_date) IN ({placeholders})
+    """, params)
+    _refresh_plane_months(cursor, [(r['airplane_id'], r['activity_month']) for r in cursor.fetchall()])
+
+
+# Full recomputation from the base tables (same semantics as q1..q5 in sql_queries.py)
+REBUILD_STATEMENTS = [
+    "DELETE FROM Report_Flight_Occupancy",
+    "DELETE FROM Report_Occupancy_Summary",
+    "DELETE FROM Report_Revenue",
+    "DELETE FROM Report_Crew_Hours",
+    "DELETE FROM Report_Monthly_Orders",
+    "DELETE FROM Report_Plane_Monthly",
+    """
+    INSERT INTO Report_Flight_Occupancy (flight_id, departure_date, airplane_id, status, total_seats, occupied_seats)
+    SELECT F.flight_id, F.departure_date, F.airplane_id,
+           CASE WHEN F.status IN ('Arrived', 'Cancelled') THEN F.status ELSE 'Active' END,
+           COALESCE(S.total_seats, 0), COALESCE(T.occupied, 0)
+    FROM Flights F
+    LEFT JOIN (SELECT airplane_id, SUM(rows_count * columns_count) AS total_seats
+               FROM Airplane_Classes GROUP BY airplane_id) S ON S.airplane_id = F.airplane_id
+    LEFT JOIN (SELECT FT.flight_id, FT.departure_date, COUNT(*) AS occupied
+               FROM Flight_Tickets FT JOIN Orders O ON FT.order_code = O.order_code
+               WHERE O.status IN ('Active', 'Executed')
+               GROUP BY FT.flight_id, FT.departure_date) T
+           ON T.flight_id = F.flight_id AND T.departure_date = F.departure_date
+    """,
+    """
+    INSERT INTO Report_Occupancy_Summary (id, arrived_flights, occupancy_pct_sum)
+    SELECT 1, COUNT(*), COALESCE(SUM((occupied_seats * 100.0) / total_seats), 0)
+    FROM Report_Flight_Occupancy
+    WHERE status = 'Arrived' AND total_seats > 0
+    """,
+    """
+    INSERT INTO Report_Revenue (manufacturer, size, class_type, total_revenue, ticket_count)
+    SELECT A.manufacturer, A.size, FT.class_type, SUM(FT.price), COUNT(*)
+    FROM Flight_Tickets FT
+    JOIN Orders O ON FT.order_code = O.order_code
+    JOIN Airplanes A ON FT.airplane_id = A.airplane_id
+    WHERE O.status IN ('Active', 'Executed', 'Cancelled by customer')
+    GROUP BY A.manufacturer, A.size, FT.class_type
+    """,
+    """
+    INSERT INTO Report_Crew_Hours (employee_id, role, first_name, last_name, short_minutes, long_minutes)
+    SELECT Employee_ID, Role, first_name, last_name,
+           SUM(CASE WHEN flight_duration <= 360 THEN flight_duration ELSE 0 END),
+           SUM(CASE WHEN flight_duration > 360 THEN flight_duration ELSE 0 END)
+    FROM (
+        SELECT P.pilot_id AS Employee_ID, 'Pilot' AS Role, P.first_name, P.last_name, R.flight_duration
+        FROM Pilots P
+        JOIN Pilots_In_Flights PIF ON P.pilot_id = PIF.pilot_id
+        JOIN Flights F ON PIF.flight_id = F.flight_id AND PIF.departure_date = F.departure_date
+        JOIN Flight_Routes R ON F.source_airport = R.source_airport AND F.destination_airport = R.destination_airport
+        WHERE F.status = 'Arrived'
+        UNION ALL
+        SELECT FA.attendant_id, 'Attendant', FA.first_name, FA.last_name, R.flight_duration
+        FROM Flight_Attendants FA
+        JOIN Attendants_In_Flights AIF ON FA.attendant_id = AIF.attendant_id
+        JOIN Flights F ON AIF.flight_id = F.flight_id AND AIF.departure_date = F.departure_date
+        JOIN Flight_Routes R ON F.source_airport = R.source_airport AND F.destination_airport = R.destination_airport
+        WHERE F.status = 'Arrived'
+    ) AS All_Crew_Flights
+    GROUP BY Employee_ID, Role, first_name, last_name
+    """,
+    """
+    INSERT INTO Report_Monthly_Orders (order_month, total_orders, cancelled_orders)
+    SELECT DATE_FORMAT(order_date, '%Y-%m'), COUNT(*),
+           SUM(CASE WHEN status IN ('Cancelled by customer', 'Cancelled by system') THEN 1 ELSE 0 END)
+    FROM Orders
+    GROUP BY DATE_FORMAT(order_date, '%Y-%m')
+    """,
+    """
+    INSERT INTO Report_Plane_Monthly (airplane_id, activity_month, flights_executed, flights_cancelled, days_flown)
+    SELECT airplane_id, DATE_FORMAT(departure_date, '%Y-%m'),
+           SUM(CASE WHEN status = 'Arrived' THEN 1 ELSE 0 END),
+           SUM(CASE WHEN status = 'Cancelled' THEN 1 ELSE 0 END),
+           COUNT(DISTINCT CASE WHEN status = 'Arrived' THEN departure_date END)
+    FROM Flights
+    GROUP BY airplane_id, DATE_FORMAT(departure_date, '%Y-%m')
+    """,
+    """
+    UPDATE Report_Plane_Monthly R
+    JOIN (SELECT airplane_id, activity_month, route
+          FROM (SELECT airplane_id, DATE_FORMAT(departure_date, '%Y-%m') AS activity_month,
+                       CONCAT(source_airport, '-', destination_airport) AS route,
+                       ROW_NUMBER() OVER (PARTITION BY airplane_id, DATE_FORMAT(departure_date, '%Y-%m')
+                                          ORDER BY COUNT(*) DESC, CONCAT(source_airport, '-', destination_airport)) AS rn
+                FROM Flights
+                WHERE status = 'Arrived'
+                GROUP BY airplane_id, DATE_FORMAT(departure_date, '%Y-%m'), source_airport, destination_airport) ranked
+          WHERE rn = 1) D
+      ON R.airplane_id = D.airplane_id AND R.activity_month = D.activity_month
+    SET R.dominant_route = D.route
+    """,
+]
+
+
+def rebuild_report_aggregates(cursor):
+    """
+    Recomputes every summary table from the base tables.
+    param cursor (MySQLCursorDict): A cursor; the caller is responsible for running this in one transaction.
+    """
+    for statement in REBUILD_STATEMENTS:
+        cursor.execute(statement)
+
+
+# Order codes per statement when deleting test orders
+DELETE_CHUNK_SIZE = 500
+
+
+def delete_test_orders(cursor, order_codes):
+    """
+    Deletes orders created by a test tool (stress_booking.py, load_test.py) with their tickets, reopens the
+    flights they had filled up, and rebuilds the summary tables the bookings were counted in.
+    param cursor (MySQLCursorDict): A cursor; the caller is responsible for running this in one transaction.
+    param order_codes (list[str]): The orders to delete.
+    """
+    for i in range(0, len(order_codes), DELETE_CHUNK_SIZE):
+        chunk = tuple(order_codes[i:i + DELETE_CHUNK_SIZE])
+        placeholders = ", ".join(["%s"] * len(chunk))
+        cursor.execute(f"""
+            SELECT DISTINCT flight_id, departure_date FROM Flight_Tickets WHERE order_code IN ({placeholders})
+        """, chunk)
+        flights = cursor.fetchall()
+        cursor.execute(f"DELETE FROM Flight_Tickets WHERE order_code IN ({placeholders})", chunk)
+        cursor.execute(f"DELETE FROM Orders WHERE order_code IN ({placeholders})", chunk)
+        for f in flights:
+            cursor.execute("""
+                UPDATE Flights F SET status = 'Active'
+                WHERE flight_id = %s AND departure_date = %s AND status = 'Full Capacity'
+                  AND (SELECT COUNT(*) FROM Flight_Tickets FT
+                       WHERE FT.flight_id = F.flight_id AND FT.departure_date = F.departure_date
+                         AND FT.seat_hold = 1)
+                      < (SELECT COUNT(*) FROM Seats S WHERE S.airplane_id = F.airplane_id)
+            """, (f['flight_id'], f['departure_date']))
+    rebuild_report_aggregates(cursor)
+
+
+if __name__ == '__main__':
+    import argparse
+    from utils import db_tx
+
+    parser = argparse.ArgumentParser(description="Maintain the manager dashboard summary tables.")
+    parser.add_argument('--rebuild', action='store_true', help="Recompute all summary tables from the base tables")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        with db_tx() as tx:
+            rebuild_report_aggregates(tx.cursor)
+        print("Report aggregates rebuilt.")
+    else:
+        parser.print_help()
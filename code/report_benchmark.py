@@ -0,0 +1,171 @@
+"""
+Benchmark and equivalence check for the dashboard report queries.
+
+For every report that has a rewritten form it runs both versions on the same data and checks that the
+results are identical. It then compares their timings and EXPLAIN plans: full scans, dependent (correlated)
+subqueries and the optimizer's row estimates. With --summary it also checks the dashboard's summary-table
+queries (r1..r5) against the base-table queries, which verifies the incrementally maintained aggregates.
+
+Usage (against a local/test database - --scale and --cleanup write to it):
+    python report_benchmark.py                  # benchmark on the current data
+    python report_benchmark.py --scale medium   # first load a generated dataset (data_generator.py)
+    python report_benchmark.py --summary        # also compare r1..r5 with q1..q5
+    python report_benchmark.py --cleanup        # remove the generated rows again
+"""
+import argparse
+import statistics
+import sys
+import time
+from decimal import Decimal
+from utils import db_cur
+from data_generator import SCALES, generate, cleanup
+from sql_queries import q1_correlated, q1, q2, q3, q4, q5_correlated, q5, r1, r2, r3, r4, r5
+
+# (name, reference query, candidate query)
+COMPARISONS = [
+    ('q1 occupancy', q1_correlated, q1),
+    ('q5 plane activity', q5_correlated, q5),
+]
+SUMMARY_COMPARISONS = [
+    ('r1 occupancy', q1, r1),
+    ('r2 revenue', q2, r2),
+    ('r3 crew hours', q3, r3),
+    ('r4 cancellations', q4, r4),
+    ('r5 plane activity', q5, r5),
+]
+
+
+def _normalize(rows):
+    """Returns: list[tuple]: The rows as sorted (column, value) tuples, numbers as floats, in a stable order."""
+    normalized = []
+    for row in rows:
+        items = []
+        for column, value in sorted(row.items()):
+            if isinstance(value, (Decimal, float, int)) and not isinstance(value, bool):
+                value = float(value)
+            items.append((column, value))
+        normalized.append(tuple(items))
+    return sorted(normalized, key=lambda r: [(c, round(v, 2) if isinstance(v, float) else str(v)) for c, v in r])
+
+
+def _same_value(a, b):
+    if isinstance(a, float) and isinstance(b, float):
+        return abs(a - b) <= 1e-6 * max(1.0, abs(a), abs(b))
+    return a == b
+
+
+def results_match(reference, candidate):
+    """
+    Compares two result sets ignoring row order and numeric representation (Decimal vs float).
+    Returns: str|None: A description of the first difference, or None if they are identical.
+    """
+    ref, cand = _normalize(reference), _normalize(candidate)
+    if len(ref) != len(cand):
+        return f"row count {len(ref)} != {len(cand)}"
+    for ref_row, cand_row in zip(ref, cand):
+        if [c for c, _ in ref_row] != [c for c, _ in cand_row]:
+            return f"columns differ: {[c for c, _ in ref_row]} != {[c for c, _ in cand_row]}"
+        if not all(_same_value(a, b) for (_, a), (_, b) in zip(ref_row, cand_row)):
+            return f"row differs: {dict(ref_row)} != {dict(cand_row)}"
+    return None
+
+
+def time_query(cursor, sql, repeats):
+    """
+    Runs a query `repeats` times.
+    Returns: tuple[list, list[float]]: The rows of the last run and the elapsed seconds of each run.
+    """
+    timings = []
+    rows = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        cursor.execute(sql)
+        rows = cursor.fetchall()
+        timings.append(time.perf_counter() - start)
+    return rows, timings
+
+
+def explain(cursor, sql):
+    """
+    Returns: tuple[list, dict]: The EXPLAIN rows and a summary with the number of full table scans,
+             dependent (correlated) subqueries and the sum of the optimizer's row estimates.
+    """
+    cursor.execute("EXPLAIN " + sql.strip().rstrip(';'))
+    plan = cursor.fetchall()
+    summary = {
+        'full_scans': sum(1 for step in plan if step.get('type') == 'ALL'),
+        'dependent': sum(1 for step in plan if 'DEPENDENT' in (step.get('select_type') or '')),
+        'est_rows': sum(int(step.get('rows') or 0) for step in plan),
+    }
+    return plan, summary
+
+
+def _print_plan(plan):
+    for step in plan:
+        print(f"      {step.get('id')!s:>3} {step.get('select_type', ''):<20} {str(step.get('table')):<22} "
+              f"{str(step.get('type')):<7} key={step.get('key')} rows={step.get('rows')} {step.get('Extra') or ''}")
+
+
+def run_comparisons(comparisons, repeats, show_plans):
+    """
+    Benchmarks each (reference, candidate) pair and prints one line per query version.
+    Returns: bool: True if every candidate returned the same results as its reference.
+    """
+    all_match = True
+    print(f"{'report':<20} {'version':<10} {'median ms':>10} {'min ms':>9} {'rows':>6} "
+          f"{'full scans':>10} {'dependent':>9} {'est. rows':>10}")
+    with db_cur() as cursor:
+        for name, reference, candidate in comparisons:
+            medians = {}
+            results = {}
+            for version, sql in (('reference', reference), ('candidate', candidate)):
+                rows, timings = time_query(cursor, sql, repeats)
+                plan, summary = explain(cursor, sql)
+                results[version] = rows
+                medians[version] = statistics.median(timings)
+                print(f"{name:<20} {version:<10} {medians[version] * 1000:>10.2f} {min(timings) * 1000:>9.2f} "
+                      f"{len(rows):>6} {summary['full_scans']:>10} {summary['dependent']:>9} {summary['est_rows']:>10}")
+                if show_plans:
+                    _print_plan(plan)
+
+            difference = results_match(results['reference'], results['candidate'])
+            speedup = medians['reference'] / medians['candidate'] if medians['candidate'] else float('inf')
+            if difference:
+                all_match = False
+                print(f"{'':<20} MISMATCH: {difference}")
+            else:
+                print(f"{'':<20} results identical, {speedup:.1f}x faster")
+    return all_match
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report query equivalence check and benchmark.")
+    parser.add_argument('--scale', choices=sorted(SCALES), help="Load a generated dataset of this size first")
+    parser.add_argument('--seed', type=int, default=1, help="Random seed of the generated dataset")
+    parser.add_argument('--cleanup', action='store_true', help="Delete the generated rows and exit")
+    parser.add_argument('--repeats', type=int, default=5, help="Timed runs per query")
+    parser.add_argument('--summary', action='store_true', help="Also compare the summary-table queries r1..r5")
+    parser.add_argument('--explain', action='store_true', help="Print the full EXPLAIN plans")
+    args = parser.parse_args()
+
+    if args.cleanup:
+        cleanup()
+        return
+    if args.scale:
+        try:
+            generate(args.scale, seed=args.seed)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+    ok = run_comparisons(COMPARISONS, args.repeats, args.explain)
+    if args.summary:
+        print()
+        ok = run_comparisons(SUMMARY_COMPARISONS, args.repeats, args.explain) and ok
+
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
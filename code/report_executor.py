@@ -0,0 +1,78 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from utils import db_cur
+
+# Dashboard report execution settings
+report_executor_config = {
+    "max_workers": 5,         # Report queries running at the same time (each holds one pooled connection)
+    "timeout_seconds": 5.0    # Budget for the whole dashboard; queries still running after it are dropped
+}
+
+# Server error raised when MAX_EXECUTION_TIME interrupts a query
+QUERY_TIMEOUT_ERRNO = 3024
+
+
+class ReportExecutor:
+    """
+    Runs independent report queries concurrently, each on its own pooled connection.
+    The page waits at most `timeout_seconds` in total: a query that fails or is still running by then
+    is reported as unavailable (None) instead of holding up the others. The same limit is set as the
+    session's MAX_EXECUTION_TIME, so the server stops a slow query too and its connection is freed.
+    """
+
+    def __init__(self, max_workers=5, timeout_seconds=5.0):
+        self.timeout_seconds = timeout_seconds
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report")
+
+    @staticmethod
+    def _run_query(sql, timeout_ms):
+        """
+        Runs one query on a fresh pooled connection.
+        Returns: tuple[list, float]: The rows and the elapsed seconds.
+        """
+        start = time.perf_counter()
+        with db_cur() as cursor:
+            cursor.execute("SET SESSION MAX_EXECUTION_TIME = %s", (timeout_ms,))
+            try:
+                cursor.execute(sql)
+                rows = cursor.fetchall()
+            finally:
+                # The connection goes back to the pool, so don't leave the limit on it
+                cursor.execute("SET SESSION MAX_EXECUTION_TIME = 0")
+        return rows, time.perf_counter() - start
+
+    def run(self, queries, timeout_seconds=None):
+        """
+        Runs every query in parallel and collects whatever finished within the time budget.
+        param queries (dict): Report name -> SQL.
+        param timeout_seconds (float, optional): Overrides the executor's default budget.
+        Returns: tuple[dict, dict]: (results, timings) - results[name] is the list of rows, or None if the
+                 query failed or timed out; timings[name] is the elapsed seconds of each completed query.
+        """
+        timeout = self.timeout_seconds if timeout_seconds is None else timeout_seconds
+        start = time.perf_counter()
+        futures = {name: self._pool.submit(self._run_query, sql, int(timeout * 1000))
+                   for name, sql in queries.items()}
+        done, _ = wait(futures.values(), timeout=timeout)
+
+        results, timings = {}, {}
+        for name, future in futures.items():
+            if future not in done:
+                future.cancel()  # Only succeeds if it never started; a running query is stopped by the server
+                results[name] = None
+                print(f"Report '{name}' timed out after {timeout:.1f}s")
+                continue
+            try:
+                results[name], timings[name] = future.result()
+                print(f"Report '{name}': {timings[name] * 1000:.1f} ms, {len(results[name])} rows")
+            except Exception as e:
+                results[name] = None
+                reason = "timed out on the server" if getattr(e, 'errno', None) == QUERY_TIMEOUT_ERRNO else f"failed: {e}"
+                print(f"Report '{name}' {reason}")
+
+        print(f"Reports finished in {(time.perf_counter() - start) * 1000:.1f} ms "
+              f"({len(timings)}/{len(queries)} available)")
+        return results, timings
+
+
+report_executor = ReportExecutor(report_executor_config["max_workers"], report_executor_config["timeout_seconds"])
@@ -0,0 +1,180 @@
+import threading
+import time
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+
+# Rows needed to place a flight on the runway and aircraft timelines
+SCHEDULE_QUERY = """
+    SELECT F.flight_id, F.departure_date, F.departure_time, F.airplane_id, F.runway_num, R.flight_duration
+    FROM Flights F
+    JOIN Flight_Routes R ON F.source_airport = R.source_airport AND F.destination_airport = R.destination_airport
+    WHERE F.status != 'Cancelled'
+"""
+
+
+def to_datetime(departure_date, departure_time):
+    """
+    Combines a departure date and time as they come from the DB or from a form.
+    param departure_date (date|str): A date or 'YYYY-MM-DD'.
+    param departure_time (timedelta|time|str): A TIME column value (timedelta), a time, or 'HH:MM[:SS]'.
+    Returns: datetime
+    """
+    if isinstance(departure_date, str):
+        departure_date = datetime.strptime(departure_date, '%Y-%m-%d').date()
+    elif isinstance(departure_date, datetime):
+        departure_date = departure_date.date()
+    start = datetime.combine(departure_date, datetime.min.time())
+    if isinstance(departure_time, timedelta):
+        return start + departure_time
+    if isinstance(departure_time, str):
+        parts = [int(p) for p in departure_time.split(':')]
+        return start + timedelta(hours=parts[0], minutes=parts[1], seconds=parts[2] if len(parts) > 2 else 0)
+    return datetime.combine(departure_date, departure_time)
+
+
+class IntervalIndex:
+    """
+    Half-open intervals [start, end) grouped by a key (a runway or an airplane).
+    Each key keeps its intervals sorted by start, plus the length of its longest interval. Any interval
+    overlapping [s, e) must start in [s - longest, e), so an overlap query is one binary search plus a
+    scan of that window: O(log n + k) per key, like a query against an interval tree.
+    """
+
+    def __init__(self):
+        self._entries = {}   # key -> sorted list of (start, end, item)
+        self._longest = {}   # key -> timedelta
+
+    def add(self, key, start, end, item):
+        insort(self._entries.setdefault(key, []), (start, end, item))
+        if end - start > self._longest.get(key, timedelta(0)):
+            self._longest[key] = end - start
+
+    def remove(self, item):
+        """Removes every interval of `item` (under any key). Linear, but only used for cancellations."""
+        for key, entries in self._entries.items():
+            entries[:] = [entry for entry in entries if entry[2] != item]
+
+    def overlapping(self, key, start, end):
+        """Returns: list[tuple]: The (start, end, item) entries of `key` that overlap [start, end)."""
+        entries = self._entries.get(key)
+        if not entries:
+            return []
+        lo = bisect_left(entries, (start - self._longest[key],))
+        hi = bisect_left(entries, (end,))
+        return [entry for entry in entries[lo:hi] if entry[1] > start]
+
+    def keys(self):
+        return list(self._entries)
+
+
+class ScheduleIndex:
+    """
+    In-process index of the runway and aircraft timelines of every non-cancelled flight.
+      - Runways: a departure occupies its runway for `runway_buffer_minutes`, so two departures on the
+        same runway conflict when they are less than the buffer apart.
+      - Airplanes: a flight occupies its airplane from departure until `flight_duration + turnaround_minutes`
+        later (the same rule the old SQL checks used), across midnight too.
+    The index is loaded on first use and rebuilt after `ttl` seconds so flights created by other processes
+    are picked up; this process's writes update it directly (add_flight / remove_flight). Checks that must
+    be exact under concurrency (the final step of flight creation) build a private index from rows locked
+    in their own transaction instead (see load_window).
+    """
+
+    def __init__(self, ttl=300, runway_buffer_minutes=60, turnaround_minutes=60):
+        self.ttl = ttl
+        self.runway_buffer = timedelta(minutes=runway_buffer_minutes)
+        self.turnaround = timedelta(minutes=turnaround_minutes)
+        self._runways = IntervalIndex()
+        self._planes = IntervalIndex()
+        self._loaded_at = None
+        self._lock = threading.RLock()
+
+
+    def _add_row(self, row):
+        start = to_datetime(row['departure_date'], row['departure_time'])
+        key = (row['flight_id'], str(row['departure_date']))
+        self._runways.add(row['runway_num'], start, start + self.runway_buffer, key)
+        self._planes.add(row['airplane_id'], start,
+                         start + timedelta(minutes=int(row['flight_duration'])) + self.turnaround, key)
+
+    def load(self, cursor):
+        """
+        (Re)builds the index from the DB. Flights that landed before yesterday can't conflict with
+        a new flight (flights can't be added in the past), so only those from yesterday on are loaded.
+        """
+        cursor.execute(SCHEDULE_QUERY + " AND F.departure_date >= CURDATE() - INTERVAL 1 DAY")
+        rows = cursor.fetchall()
+        with self._lock:
+            self._runways, self._planes = IntervalIndex(), IntervalIndex()
+            for row in rows:
+                self._add_row(row)
+            self._loaded_at = time.monotonic()
+
+    def _ensure_loaded(self, cursor):
+        if self._loaded_at is None or time.monotonic() - self._loaded_at >= self.ttl:
+            self.load(cursor)
+
+    @classmethod
+    def load_window(cls, cursor, departure_date, lock=False, last_date=None, **settings):
+        """
+        Builds a private index holding only the flights departing within a day of `departure_date`
+        (or of the range `departure_date`..`last_date`).
+        param lock (bool): Lock the rows read (SELECT ... FOR UPDATE) so no conflicting flight can be
+                           inserted until the caller's transaction ends.
+        Returns: ScheduleIndex
+        """
+        index = cls(**settings)
+        cursor.execute(SCHEDULE_QUERY + """
+              AND F.departure_date BETWEEN %s - INTERVAL 1 DAY AND %s + INTERVAL 1 DAY
+        """ + (" FOR UPDATE OF F" if lock else ""), (departure_date, last_date or departure_date))
+        for row in cursor.fetchall():
+            index._add_row(row)
+        index._loaded_at = time.monotonic()
+        return index
+
+
+    def add_flight(self, flight_id, departure_date, departure_time, duration, airplane_id, runway):
+        """Adds a newly created flight (no-op until the index is first loaded)."""
+        with self._lock:
+            if self._loaded_at is not None:
+                self._add_row({'flight_id': flight_id, 'departure_date': departure_date,
+                               'departure_time': departure_time, 'airplane_id': airplane_id,
+                               'runway_num': runway, 'flight_duration': duration})
+
+    def remove_flight(self, flight_id, departure_date):
+        """Frees the runway slot and aircraft time of a cancelled flight."""
+        key = (flight_id, str(departure_date))
+        with self._lock:
+            self._runways.remove(key)
+            self._planes.remove(key)
+
+
+    def runway_conflicts(self, cursor, departure_date, departure_time, runway):
+        """
+        Returns: list[tuple]: (flight_id, departure datetime) of the flights departing from `runway`
+                 less than the runway buffer before or after the given departure.
+        """
+        start = to_datetime(departure_date, departure_time)
+        with self._lock:
+            if cursor is not None:
+                self._ensure_loaded(cursor)
+            hits = self._runways.overlapping(runway, start, start + self.runway_buffer)
+        return [(item[0], entry_start) for entry_start, _, item in hits]
+
+    def plane_conflicts(self, cursor, airplane_id, departure_date, departure_time, duration):
+        """Returns: list[str]: IDs of the flights that keep `airplane_id` busy during the new flight."""
+        start = to_datetime(departure_date, departure_time)
+        end = start + timedelta(minutes=int(duration)) + self.turnaround
+        with self._lock:
+            if cursor is not None:
+                self._ensure_loaded(cursor)
+            return [item[0] for _, _, item in self._planes.overlapping(airplane_id, start, end)]
+
+    def busy_planes(self, cursor, departure_date, departure_time, duration):
+        """Returns: set[str]: Airplanes that are busy at some point during the new flight."""
+        start = to_datetime(departure_date, departure_time)
+        end = start + timedelta(minutes=int(duration)) + self.turnaround
+        with self._lock:
+            if cursor is not None:
+                self._ensure_loaded(cursor)
+            return {key for key in self._planes.keys() if self._planes.overlapping(key, start, end)}
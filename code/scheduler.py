@@ -0,0 +1,168 @@
+import threading
+import time
+from utils import db_cur, db_tx, invalidate_flight_board
+from report_aggregates import record_flights_arrived
+
+# Background status-lifecycle settings
+scheduler_config = {
+    "enabled": True,
+    "interval_seconds": 60,   # How often the transitions run
+    "batch_size": 500         # Max rows touched by a single UPDATE statement
+}
+
+
+class StatusScheduler:
+    """
+    Background worker that moves flights and orders through their status lifecycle:
+      - Flights: 'Active' / 'Full Capacity' -> 'Arrived' once the departure time has passed.
+      - Orders:  'Active' -> 'Executed' once their flight has arrived.
+    Work is done in bounded batches (each batch is its own short statement) so the row locks
+    taken here never block bookings for long. Listeners registered with add_listener() are called
+    after every batch that changed rows (used to invalidate in-process caches).
+    """
+
+    def __init__(self, interval_seconds=60, batch_size=500):
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self._listeners = []
+        self._stop = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self.last_run = None
+
+    def add_listener(self, callback):
+        """
+        Registers a callback for status transitions.
+        param callback (callable): Called as callback(arrived_flights, executed_orders) where
+                                   arrived_flights is a list of (flight_id, departure_date) tuples and
+                                   executed_orders is a list of order codes.
+        """
+        self._listeners.append(callback)
+
+    def _notify(self, arrived_flights, executed_orders):
+        for callback in self._listeners:
+            try:
+                callback(arrived_flights, executed_orders)
+            except Exception as e:
+                print(f"Scheduler listener error: {e}")
+
+    def _mark_flights_arrived(self):
+        """
+        Runs one batch of the flight transition together with the dashboard summary update, in one transaction.
+        Returns: list[tuple]: The (flight_id, departure_date) keys updated.
+        """
+        with db_tx() as tx:
+            cursor = tx.cursor
+            # departure_date <= CURDATE() keeps the scan on the date range instead of the whole table.
+            # FOR UPDATE: a flight cancelled concurrently is either cancelled first (and skipped) or waits
+            cursor.execute("""
+                SELECT flight_id, departure_date
+                FROM Flights
+                WHERE status IN ('Active', 'Full Capacity')
+                  AND departure_date <= CURDATE()
+                  AND TIMESTAMP(departure_date, departure_time) < NOW()
+                ORDER BY departure_date
+                LIMIT %s
+                FOR UPDATE
+            """, (self.batch_size,))
+            keys = [(row['flight_id'], row['departure_date']) for row in cursor.fetchall()]
+            if not keys:
+                return []
+
+            placeholders = ", ".join(["(%s, %s)"] * len(keys))
+            params = [value for key in keys for value in key]
+            cursor.execute(f"""
+                UPDATE Flights
+                SET status = 'Arrived'
+                WHERE status IN ('Active', 'Full Capacity')
+                  AND (flight_id, departure_date) IN ({placeholders})
+            """, tuple(params))
+            record_flights_arrived(cursor, keys)
+        return keys
+
+    def _mark_orders_executed(self):
+        """Runs one batch of the order transition. Returns: list[str]: The order codes updated."""
+        with db_cur() as cursor:
+            cursor.execute("""
+                SELECT DISTINCT O.order_code
+                FROM Orders O
+                JOIN Flight_Tickets FT ON O.order_code = FT.order_code
+                JOIN Flights F ON FT.flight_id = F.flight_id AND FT.departure_date = F.departure_date
+                WHERE O.status = 'Active'
+                  AND F.status = 'Arrived'
+                LIMIT %s
+            """, (self.batch_size,))
+            codes = [row['order_code'] for row in cursor.fetchall()]
+            if not codes:
+                return []
+
+            placeholders = ", ".join(["%s"] * len(codes))
+            cursor.execute(f"""
+                UPDATE Orders
+                SET status = 'Executed'
+                WHERE status = 'Active'
+                  AND order_code IN ({placeholders})
+            """, tuple(codes))
+            return codes
+
+    def run_once(self):
+        """
+        Runs all transitions until there is nothing left to update, one batch at a time.
+        Returns: dict: Number of flights marked 'Arrived' and orders marked 'Executed'.
+        """
+        counts = {'flights_arrived': 0, 'orders_executed': 0}
+
+        while True:
+            keys = self._mark_flights_arrived()
+            if not keys:
+                break
+            counts['flights_arrived'] += len(keys)
+            self._notify(keys, [])
+            if len(keys) < self.batch_size:
+                break
+
+        while True:
+            codes = self._mark_orders_executed()
+            if not codes:
+                break
+            counts['orders_executed'] += len(codes)
+            self._notify([], codes)
+            if len(codes) < self.batch_size:
+                break
+
+        self.last_run = time.time()
+        return counts
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                # Never let a DB hiccup kill the worker; the next tick will retry
+                print(f"Status scheduler error: {e}")
+            self._stop.wait(self.interval_seconds)
+
+    def ensure_started(self):
+        """Starts the background thread once per process. Safe to call on every request."""
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._loop, name="status-scheduler", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        """Signals the background thread to exit after its current tick."""
+        self._stop.set()
+        self._thread = None
+
+
+def _invalidate_caches(arrived_flights, executed_orders):
+    """Drops the board pages for every date that had flights land in this batch."""
+    for departure_date in {key[1] for key in arrived_flights}:
+        invalidate_flight_board(date=departure_date)
+
+
+status_scheduler = StatusScheduler(scheduler_config["interval_seconds"], scheduler_config["batch_size"])
+status_scheduler.add_listener(_invalidate_caches)
@@ -0,0 +1,237 @@
+import base64
+import hashlib
+import threading
+import time
+
+# Cabin order: Business rows come first, Economy rows continue the numbering after them
+CLASS_ORDER = ('Business', 'Economy')
+
+
+class SeatLayout:
+    """
+    The seat grid of one airplane, built once from its Airplane_Classes rows.
+    Every seat maps to one bit: rows are numbered consecutively across classes (in CLASS_ORDER)
+    and seats are laid out row by row, so seat (row, col) is bit `row_base + col - 1`.
+    """
+
+    __slots__ = ('airplane_id', 'rows', 'size', '_row_base', '_row_cols')
+
+    def __init__(self, airplane_id, classes):
+        """
+        param airplane_id (str): The airplane this layout belongs to.
+        param classes (list[dict]): Airplane_Classes rows (class_type, rows_count, columns_count).
+        """
+        self.airplane_id = airplane_id
+        self.rows = []  # (row_num, class_type, columns_count, bit_base)
+        self._row_base = {}
+        self._row_cols = {}
+
+        by_class = {c['class_type']: c for c in classes}
+        row_num = 0
+        bit = 0
+        for class_type in CLASS_ORDER:
+            cls = by_class.get(class_type)
+            if not cls:
+                continue
+            for _ in range(cls['rows_count']):
+                row_num += 1
+                self.rows.append((row_num, class_type, cls['columns_count'], bit))
+                self._row_base[row_num] = bit
+                self._row_cols[row_num] = cls['columns_count']
+                bit += cls['columns_count']
+        self.size = bit
+
+    def bit(self, row, col):
+        """
+        Returns: int|None: The bit position of seat (row, col), or None if the seat doesn't exist on this airplane.
+        """
+        row, col = int(row), int(col)
+        base = self._row_base.get(row)
+        if base is None or not 1 <= col <= self._row_cols[row]:
+            return None
+        return base + col - 1
+
+    def class_summary(self):
+        """Returns: list[dict]: One entry per class with its first row, row count and column count."""
+        summary = []
+        for row_num, class_type, cols, _ in self.rows:
+            if summary and summary[-1]['class_type'] == class_type:
+                summary[-1]['rows'] += 1
+            else:
+                summary.append({'class_type': class_type, 'first_row': row_num, 'rows': 1, 'columns': cols})
+        return summary
+
+
+class SeatOccupancy:
+    """
+    Taken/free state of every seat on one flight, stored as a bit array over the airplane's SeatLayout.
+    Only seats of 'Active' orders count as taken.
+    """
+
+    __slots__ = ('layout', 'bits', 'taken_count', 'loaded_at')
+
+    def __init__(self, layout):
+        self.layout = layout
+        self.bits = bytearray((layout.size + 7) // 8)
+        self.taken_count = 0
+        self.loaded_at = time.monotonic()
+
+    def is_taken_bit(self, bit):
+        return bool(self.bits[bit >> 3] & (1 << (bit & 7)))
+
+    def is_taken(self, row, col):
+        bit = self.layout.bit(row, col)
+        return bit is not None and self.is_taken_bit(bit)
+
+    def set_seat(self, row, col, taken):
+        """
+        Marks a seat taken or free, keeping taken_count in sync.
+        Returns: bool: False if the seat does not exist on this airplane.
+        """
+        bit = self.layout.bit(row, col)
+        if bit is None:
+            return False
+        mask = 1 << (bit & 7)
+        was_taken = bool(self.bits[bit >> 3] & mask)
+        if taken and not was_taken:
+            self.bits[bit >> 3] |= mask
+            self.taken_count += 1
+        elif not taken and was_taken:
+            self.bits[bit >> 3] &= ~mask
+            self.taken_count -= 1
+        return True
+
+    def encoded_bits(self, bits=None):
+        """
+        param bits (bytes, optional): A copy of the bitmap (SeatIndex.snapshot); by default the live one.
+        Returns: str: The occupancy bitmap as base64 (bit i is seat i, least significant bit first in each byte).
+        """
+        return base64.b64encode(bytes(self.bits) if bits is None else bits).decode()
+
+    def etag(self, bits=None):
+        """
+        Returns a strong validator for the occupancy.
+        It is derived from the bitmap itself, so it only changes when a seat is taken or freed
+        and is identical across worker processes.
+        param bits (bytes, optional): A copy of the bitmap (SeatIndex.snapshot); by default the live one.
+        Returns: str: A short hex digest.
+        """
+        data = bytes(self.bits) if bits is None else bits
+        digest = hashlib.blake2b(self.layout.airplane_id.encode() + b'|' + data, digest_size=12)
+        return digest.hexdigest()
+
+    @property
+    def free_count(self):
+        return self.layout.size - self.taken_count
+
+    @property
+    def is_full(self):
+        return self.taken_count >= self.layout.size
+
+
+class SeatIndex:
+    """
+    Process-wide index of SeatOccupancy bitmaps keyed by (flight_id, departure_date).
+    Layouts are loaded once per airplane; occupancy is loaded on first use and then kept current by
+    the booking/cancellation paths (mark_taken / release / drop). Entries are reloaded after `ttl`
+    seconds so changes made by other worker processes are picked up.
+    """
+
+    def __init__(self, ttl=60):
+        self.ttl = ttl
+        self._layouts = {}
+        self._occupancy = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(flight_id, departure_date):
+        return flight_id, str(departure_date)
+
+    def get_layout(self, cursor, airplane_id):
+        """
+        Returns the seat layout of an airplane, loading it from Airplane_Classes on first use.
+        param cursor (MySQLCursorDict): An open cursor used on a cache miss.
+        param airplane_id (str): The airplane ID.
+        Returns: SeatLayout
+        """
+        layout = self._layouts.get(airplane_id)
+        if layout is None:
+            cursor.execute("""
+                SELECT class_type, rows_count, columns_count
+                FROM Airplane_Classes
+                WHERE airplane_id = %s
+            """, (airplane_id,))
+            layout = SeatLayout(airplane_id, cursor.fetchall())
+            with self._lock:
+                self._layouts[airplane_id] = layout
+        return layout
+
+    def get(self, cursor, flight_id, departure_date, airplane_id):
+        """
+        Returns the occupancy bitmap of a flight, (re)loading it when missing or older than the TTL.
+        param cursor (MySQLCursorDict): An open cursor used on a cache miss.
+        param flight_id (str): The flight ID.
+        param departure_date (date|str): The flight's departure date.
+        param airplane_id (str): The airplane assigned to the flight.
+        Returns: SeatOccupancy
+        """
+        key = self._key(flight_id, departure_date)
+        with self._lock:
+            occupancy = self._occupancy.get(key)
+        if occupancy is not None and time.monotonic() - occupancy.loaded_at < self.ttl:
+            return occupancy
+
+        occupancy = SeatOccupancy(self.get_layout(cursor, airplane_id))
+        cursor.execute("""
+            SELECT t.row_num, t.column_num
+            FROM Flight_Tickets t
+            JOIN Orders o ON t.order_code = o.order_code
+            WHERE t.flight_id = %s
+              AND t.departure_date = %s
+              AND o.status = 'Active'
+        """, (flight_id, departure_date))
+        for seat in cursor.fetchall():
+            occupancy.set_seat(seat['row_num'], seat['column_num'], True)
+
+        with self._lock:
+            self._occupancy[key] = occupancy
+        return occupancy
+
+    def snapshot(self, occupancy):
+        """
+        Copies an occupancy's bitmap and taken count under the index lock, so a concurrent mark_taken /
+        release can't change them between two reads (e.g. a response body and its ETag).
+        Returns: tuple[bytes, int]: (bitmap copy, taken_count)
+        """
+        with self._lock:
+            return bytes(occupancy.bits), occupancy.taken_count
+
+    def _update(self, flight_id, departure_date, seats, taken):
+        with self._lock:
+            occupancy = self._occupancy.get(self._key(flight_id, departure_date))
+            if occupancy is not None:
+                for row, col in seats:
+                    occupancy.set_seat(row, col, taken)
+
+    def mark_taken(self, flight_id, departure_date, seats):
+        """
+        Marks seats as taken after a booking. Flights that are not loaded are left alone.
+        param seats (list[tuple]): (row_num, column_num) pairs.
+        """
+        self._update(flight_id, departure_date, seats, True)
+
+    def release(self, flight_id, departure_date, seats):
+        """
+        Marks seats as free again after an order cancellation.
+        param seats (list[tuple]): (row_num, column_num) pairs.
+        """
+        self._update(flight_id, departure_date, seats, False)
+
+    def drop(self, flight_id, departure_date=None):
+        """Forgets a flight's occupancy (all departure dates when departure_date is None)."""
+        with self._lock:
+            if departure_date is not None:
+                self._occupancy.pop(self._key(flight_id, departure_date), None)
+            else:
+                for key in [k for k in self._occupancy if k[0] == flight_id]:
+                    del self._occupancy[key]
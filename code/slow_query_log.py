@@ -0,0 +1,160 @@
+"""
+Opt-in slow-query log.
+
+When enabled (slow_query_config in utils.py), every statement run through db_cur() that takes longer than
+`threshold_ms` is written to a rotating log file as one JSON line with:
+  - the normalized SQL and the shape of its parameters (types only, never values),
+  - the duration and the calling function (e.g. utils.get_customer_history:412),
+  - the statement's EXPLAIN plan, captured on a separate pooled connection.
+The EXPLAIN and the file write happen on a background thread, so the slow request is not delayed further;
+if the queue is full (a burst of slow queries) further entries are dropped and counted.
+
+Read the log with e.g.:
+    tail -f logs/slow_queries.log | python -m json.tool --json-lines
+"""
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from metrics import normalize_sql
+
+DEFAULT_LOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'logs', 'slow_queries.log')
+
+# Statements EXPLAIN can describe
+EXPLAINABLE = ('SELECT', 'UPDATE', 'DELETE', 'INSERT', 'REPLACE', 'WITH')
+
+
+def parameter_shape(params, many=False):
+    """
+    Describes bound parameters without their values.
+    param many (bool): `params` is an executemany() sequence.
+    Returns: str: e.g. "(str, int, date)", "{email: str}" or "120 x (str, str)".
+    """
+    if params is None:
+        return "()"
+    if many:
+        rows = list(params)
+        return f"{len(rows)} x {parameter_shape(rows[0])}" if rows else "0 rows"
+    if isinstance(params, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in params.items()) + "}"
+    return "(" + ", ".join(type(value).__name__ for value in params) + ")"
+
+
+def _caller(skip_files):
+    """Returns: str: 'module.function:line' of the innermost frame outside the instrumentation."""
+    frame = sys._getframe(2)
+    while frame and os.path.basename(frame.f_code.co_filename) in skip_files:
+        frame = frame.f_back
+    if frame is None:
+        return "<unknown>"
+    module = os.path.splitext(os.path.basename(frame.f_code.co_filename))[0]
+    return f"{module}.{frame.f_code.co_name}:{frame.f_lineno}"
+
+
+class SlowQueryLog:
+    """
+    Records statements slower than a threshold, with their EXPLAIN, to a size-rotated file.
+    param pool (ConnectionPool): Where the EXPLAIN connections come from.
+    """
+
+    _SKIP_FILES = {'slow_query_log.py', 'metrics.py', 'contextlib.py'}
+
+    def __init__(self, pool, enabled=False, threshold_ms=200, explain=True, path=DEFAULT_LOG_PATH,
+                 max_bytes=5 * 1024 * 1024, backup_count=5, queue_size=100):
+        self.pool = pool
+        self.enabled = enabled
+        self.threshold = threshold_ms / 1000.0
+        self.explain = explain
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.dropped = 0
+        self.logged = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._logger = None
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._worker is not None:
+                return
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            handler = RotatingFileHandler(self.path, maxBytes=self.max_bytes, backupCount=self.backup_count,
+                                          encoding='utf-8')
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            self._logger = logging.getLogger('flytau.slow_queries')
+            self._logger.setLevel(logging.INFO)
+            self._logger.propagate = False
+            self._logger.addHandler(handler)
+            self._worker = threading.Thread(target=self._run, name="slow-query-log", daemon=True)
+            self._worker.start()
+
+    def record(self, sql, params, seconds, many=False):
+        """
+        Called for every executed statement; queues it for logging if it exceeded the threshold.
+        param many (bool): The statement was run with executemany().
+        """
+        if not self.enabled or seconds < self.threshold:
+            return
+        entry = {
+            'time': datetime.now().isoformat(timespec='milliseconds'),
+            'duration_ms': round(seconds * 1000, 1),
+            'caller': _caller(self._SKIP_FILES),
+            'sql': normalize_sql(sql, max_length=4000),
+            'params': parameter_shape(params, many),
+        }
+        explain_params = (list(params)[0] if params else None) if many else params
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((entry, sql, explain_params))
+        except queue.Full:
+            self.dropped += 1
+
+    def _explain(self, sql, params):
+        """Runs EXPLAIN for the statement on its own connection. Returns: list|str: The plan or an error."""
+        statement = sql if isinstance(sql, str) else sql.decode('utf-8', 'replace')
+        if not statement.lstrip().upper().startswith(EXPLAINABLE):
+            return None
+        conn = cursor = None
+        discard = False
+        try:
+            conn = self.pool.acquire()
+            cursor = conn.cursor(dictionary=True, buffered=True)
+            cursor.execute("EXPLAIN " + statement.strip().rstrip(';'), params)
+            return cursor.fetchall()
+        except Exception as e:
+            discard = not hasattr(e, 'errno')
+            return f"EXPLAIN failed: {e}"
+        finally:
+            if cursor is not None:
+                try:
+                    cursor.close()
+                except Exception:
+                    discard = True
+            if conn is not None:
+                self.pool.release(conn, discard=discard)
+
+    def _run(self):
+        while True:
+            entry, sql, params = self._queue.get()
+            try:
+                if self.explain:
+                    started = time.perf_counter()
+                    plan = self._explain(sql, params)
+                    if plan is not None:
+                        entry['explain'] = plan
+                        entry['explain_ms'] = round((time.perf_counter() - started) * 1000, 1)
+                self._logger.info(json.dumps(entry, default=str))
+                self.logged += 1
+            except Exception as e:
+                print(f"Slow query log failed: {e}")
+
+    def stats(self):
+        """Returns: dict: Entries logged, dropped and waiting."""
+        return {'logged': self.logged, 'dropped': self.dropped, 'queued': self._queue.qsize()}
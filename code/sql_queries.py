@@ -4,8 +4,10 @@
 #   1. Counts tickets sold per flight (Active or Executed orders).
 #   2. Calculates total physical seats per airplane model.
 #   3. Computes the ratio (Occupied / Total) and averages it across all flights.
+# q1_correlated is the original formulation (two correlated subqueries per arrived flight);
+# q1 computes the same value with each count aggregated once in a derived table.
 
-q1 = """
+q1_correlated = """
 SELECT AVG((occupied_seats * 100.0)/ total_seats)  AS avg_capacity_percentage
 FROM (
 SELECT F.flight_id, F.departure_date,
@@ -27,6 +29,25 @@ SELECT F.flight_id, F.departure_date,
 ) AS flight_occupancy_data;
 """
 
+q1 = """
+SELECT AVG((COALESCE(T.occupied_seats, 0) * 100.0) / S.total_seats) AS avg_capacity_percentage
+FROM Flights F
+-- Seats per airplane, computed once per airplane instead of once per flight
+JOIN (SELECT airplane_id, SUM(rows_count * columns_count) AS total_seats
+      FROM Airplane_Classes
+      GROUP BY airplane_id) S ON S.airplane_id = F.airplane_id
+-- Tickets sold per arrived flight, in a single pass over the tickets
+LEFT JOIN (SELECT FT.flight_id, FT.departure_date, COUNT(*) AS occupied_seats
+           FROM Flight_Tickets FT
+           JOIN Orders O ON FT.order_code = O.order_code
+           JOIN Flights AF ON FT.flight_id = AF.flight_id AND FT.departure_date = AF.departure_date
+           WHERE O.status IN ('Active', 'Executed')
+             AND AF.status = 'Arrived'
+           GROUP BY FT.flight_id, FT.departure_date) T
+       ON T.flight_id = F.flight_id AND T.departure_date = F.departure_date
+WHERE F.status = 'Arrived';
+"""
+
 # QUERY 2: Revenue Analysis by Aircraft & Class
 # Purpose: Shows which aircraft models and seat classes generate the most revenue.
 # Logic:
@@ -108,9 +129,12 @@ q4 = """
 # - Activity Month: Grouping by Year-Month.
 # - Flights Executed/Cancelled: Simple counts based on status.
 # - Utilization %: Calculated as (Distinct Days Flown / 30).
-# - Dominant Route: Subquery to find the most frequent route flown by that specific plane in that specific month.
+# - Dominant Route: Subquery to find the most frequent route flown by that specific plane in that specific month
+#   (ties go to the alphabetically first route).
+# q5_correlated is the original formulation (one Flights scan per airplane-month, with a DATE_FORMAT predicate
+# that can't use an index); q5 ranks the routes of every airplane-month in one pass with ROW_NUMBER().
 
-q5 = """
+q5_correlated = """
 SELECT 
     Stats.airplane_id,
     Stats.activity_month,
@@ -126,7 +150,7 @@ SELECT
         AND DATE_FORMAT(F2.departure_date, '%Y-%m') = Stats.activity_month
         AND F2.status = 'Arrived'
       GROUP BY source_airport, destination_airport
-      ORDER BY COUNT(*) DESC
+      ORDER BY COUNT(*) DESC, CONCAT(source_airport, '-', destination_airport)
       LIMIT 1
      ) AS dominant_route
 
@@ -144,4 +168,92 @@ SELECT
      GROUP BY F.airplane_id, DATE_FORMAT(F.departure_date, '%Y-%m')
  ) AS Stats
  ORDER BY Stats.airplane_id, Stats.activity_month; 
-"""
\ No newline at end of file
+"""
+
+q5 = """
+SELECT
+    Stats.airplane_id,
+    Stats.activity_month,
+    Stats.flights_executed,
+    Stats.flights_cancelled,
+    ROUND((Stats.days_flown / 30) * 100.0, 2) AS utilization_percentage,
+    Dominant.route AS dominant_route
+FROM (
+    SELECT
+        airplane_id,
+        DATE_FORMAT(departure_date, '%Y-%m') AS activity_month,
+        SUM(CASE WHEN status = 'Arrived' THEN 1 ELSE 0 END) AS flights_executed,
+        SUM(CASE WHEN status = 'Cancelled' THEN 1 ELSE 0 END) AS flights_cancelled,
+        COUNT(DISTINCT CASE WHEN status = 'Arrived' THEN departure_date END) AS days_flown
+    FROM Flights
+    GROUP BY airplane_id, DATE_FORMAT(departure_date, '%Y-%m')
+) AS Stats
+LEFT JOIN (
+    -- Most frequent arrived route per airplane-month
+    SELECT airplane_id, activity_month, route
+    FROM (
+        SELECT
+            airplane_id,
+            DATE_FORMAT(departure_date, '%Y-%m') AS activity_month,
+            CONCAT(source_airport, '-', destination_airport) AS route,
+            ROW_NUMBER() OVER (PARTITION BY airplane_id, DATE_FORMAT(departure_date, '%Y-%m')
+                               ORDER BY COUNT(*) DESC, CONCAT(source_airport, '-', destination_airport)) AS route_rank
+        FROM Flights
+        WHERE status = 'Arrived'
+        GROUP BY airplane_id, DATE_FORMAT(departure_date, '%Y-%m'), source_airport, destination_airport
+    ) AS Ranked_Routes
+    WHERE route_rank = 1
+) AS Dominant ON Dominant.airplane_id = Stats.airplane_id AND Dominant.activity_month = Stats.activity_month
+ORDER BY Stats.airplane_id, Stats.activity_month;
+"""
+
+# ==========================================================
+# Dashboard queries over the summary tables
+# The Report_* tables are kept current by report_aggregates.py on every booking, cancellation,
+# flight creation and arrival, so each query below reads a handful of pre-aggregated rows instead of
+# scanning the order/ticket/flight history. r1..r5 return the same columns as q1..q5 above
+# (which remain the reference definitions; `report_aggregates.py --rebuild` recomputes the tables with the same rules).
+# ==========================================================
+
+# REPORT 1: Average Flight Occupancy (single-row running total)
+r1 = """
+SELECT CASE WHEN arrived_flights > 0 THEN occupancy_pct_sum / arrived_flights END AS avg_capacity_percentage
+FROM Report_Occupancy_Summary
+WHERE id = 1
+"""
+
+# REPORT 2: Revenue Analysis by Aircraft & Class
+r2 = """
+SELECT CONCAT(manufacturer, ' ', size, ' (', class_type, ')') AS label,
+       total_revenue
+FROM Report_Revenue
+WHERE ticket_count > 0
+ORDER BY total_revenue DESC
+"""
+
+# REPORT 3: Crew Workload Analysis (Flight Hours)
+r3 = """
+SELECT employee_id AS Employee_ID, first_name AS First_Name, last_name AS Last_Name, role AS Role,
+       ROUND(short_minutes / 60, 2) AS Short_Flight_Hours,
+       ROUND(long_minutes / 60, 2) AS Long_Flight_Hours,
+       ROUND((short_minutes + long_minutes) / 60, 2) AS Total_Hours
+FROM Report_Crew_Hours
+"""
+
+# REPORT 4: Monthly Order & Cancellation Trends
+r4 = """
+SELECT order_month, total_orders, cancelled_orders,
+       ROUND((cancelled_orders / total_orders) * 100, 2) AS cancellation_rate_percent
+FROM Report_Monthly_Orders
+WHERE total_orders > 0
+ORDER BY order_month
+"""
+
+# REPORT 5: Aircraft Utilization & Dominant Routes
+r5 = """
+SELECT airplane_id, activity_month, flights_executed, flights_cancelled,
+       ROUND((days_flown / 30) * 100.0, 2) AS utilization_percentage,
+       dominant_route
+FROM Report_Plane_Monthly
+ORDER BY airplane_id, activity_month
+"""
@@ -0,0 +1,112 @@
+"""
+Concurrency stress test for seat reservation.
+
+Fires many simultaneous create_booking() calls for the same seats of one flight and checks that
+exactly one buyer wins each seat and that no seat ends up held by two orders.
+
+Usage (against a local/test database - it creates real orders):
+    python stress_booking.py FL-109 --workers 20 --rounds 5
+"""
+import argparse
+import random
+import sys
+import threading
+from flask_login import AnonymousUserMixin
+from utils import db_cur, db_tx, create_booking, get_flight_seat_map
+from report_aggregates import delete_test_orders
+
+
+def find_free_seats(flight_id, count):
+    """Returns: list[str]: Up to `count` random free seat keys ('row-col-class-airplane_id') of the flight."""
+    flight, seat_map = get_flight_seat_map(flight_id)
+    if not flight:
+        raise SystemExit(f"Flight {flight_id} not found.")
+    free = [f"{row}-{col}-{class_type}-{flight['airplane_id']}"
+            for row, class_type, cols, base in seat_map.layout.rows
+            for col in range(1, cols + 1)
+            if not seat_map.is_taken_bit(base + col - 1)]
+    return random.sample(free, min(count, len(free)))
+
+
+def run_round(flight_id, seat_key, workers):
+    """
+    Lets `workers` threads try to book the same seat at the same moment.
+    Returns: tuple[list, list]: The winning order codes and the failure messages.
+    """
+    barrier = threading.Barrier(workers)
+    wins, failures = [], []
+    lock = threading.Lock()
+
+    def buyer(n):
+        guest = {'first_name': 'Stress', 'last_name': f'Buyer{n}', 'email': f'stress{n}@load.test', 'phone': None}
+        barrier.wait()
+        success, message, order_code = create_booking(flight_id, [seat_key], AnonymousUserMixin(), guest)
+        with lock:
+            (wins if success else failures).append(order_code if success else message)
+
+    threads = [threading.Thread(target=buyer, args=(n,)) for n in range(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return wins, failures
+
+
+def find_double_bookings(flight_id):
+    """Returns: list[dict]: Seats of the flight held by more than one active order (must be empty)."""
+    with db_cur() as cursor:
+        cursor.execute("""
+            SELECT FT.row_num, FT.column_num, COUNT(*) AS holders
+            FROM Flight_Tickets FT
+            JOIN Orders O ON FT.order_code = O.order_code
+            WHERE FT.flight_id = %s AND O.status = 'Active'
+            GROUP BY FT.departure_date, FT.row_num, FT.column_num
+            HAVING COUNT(*) > 1
+        """, (flight_id,))
+        return cursor.fetchall()
+
+
+def cleanup(order_codes):
+    """
+    Deletes the orders created by the stress test, reopens a flight they filled up, and rebuilds the
+    summary tables the bookings were counted in - all in one transaction.
+    """
+    if not order_codes:
+        return
+    with db_tx() as tx:
+        delete_test_orders(tx.cursor, order_codes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent checkout stress test for one flight.")
+    parser.add_argument('flight_id')
+    parser.add_argument('--workers', type=int, default=20, help="Concurrent buyers per seat")
+    parser.add_argument('--rounds', type=int, default=5, help="Number of seats to fight over")
+    parser.add_argument('--keep', action='store_true', help="Keep the created orders instead of deleting them")
+    args = parser.parse_args()
+
+    all_wins = []
+    ok = True
+    for seat_key in find_free_seats(args.flight_id, args.rounds):
+        wins, failures = run_round(args.flight_id, seat_key, args.workers)
+        all_wins.extend(wins)
+        unexpected = [m for m in failures if 'just taken' not in m]
+        print(f"Seat {seat_key}: {len(wins)} winner(s), {len(failures)} rejected"
+              + (f", unexpected errors: {set(unexpected)}" if unexpected else ""))
+        if len(wins) != 1:
+            ok = False
+
+    doubles = find_double_bookings(args.flight_id)
+    if doubles:
+        ok = False
+        print(f"DOUBLE BOOKINGS FOUND: {doubles}")
+
+    if not args.keep:
+        cleanup(all_wins)
+
+    print("PASS" if ok else "FAIL")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,22 @@
-import random
+import base64
+import json
 import string
-from flask_login import UserMixin
+import time
 import mysql.connector
 from contextlib import contextmanager
+from datetime import datetime, timedelta
+from decimal import Decimal
+from db_pool import ConnectionPool
+from cache import TTLCache
+from metrics import InstrumentedCursor, request_metrics
+from slow_query_log import SlowQueryLog
+from id_sequences import IdSequences
+from seat_index import SeatIndex
+from schedule_index import ScheduleIndex
+from crew_index import CrewIndex
+from assignment_solver import CREW_SIZE, LONG_HAUL_MINUTES, load_crew_minutes, pick_crew, pick_plane
+from order_codes import OrderCodeGenerator
+from report_aggregates import record_booking, record_customer_cancellation, record_flight_created
 
 """
 # Configuration for database connection locally
@@ -24,29 +38,155 @@ db_config = {
 }
 
 
+# Connection pool settings (one pool per process, shared by every db_cur() call)
+pool_config = {
+    "size": 10,                # Max open connections per process
+    "checkout_timeout": 10,    # Seconds to wait for a free connection before failing
+    "recycle_seconds": 1800,   # Reopen connections older than this (server wait_timeout is longer)
+    "ping_on_checkout": True   # Verify the connection is alive before handing it out
+}
+
+db_pool = ConnectionPool(db_config, **pool_config)
+
+# Slow-query log (opt-in): statements slower than the threshold are logged with their EXPLAIN
+slow_query_config = {
+    "enabled": False,              # Turn on to collect slow statements
+    "threshold_ms": 200,           # Log statements that take longer than this
+    "explain": True,               # Capture EXPLAIN on a separate pooled connection
+    "max_bytes": 5 * 1024 * 1024,  # Rotate the log file at this size
+    "backup_count": 5              # Rotated files kept (logs/slow_queries.log.1 ...)
+}
+
+slow_query_log = SlowQueryLog(db_pool, **slow_query_config)
+
+# Generated IDs (see id_sequences.py): each process reserves blocks of values from the Id_Sequences table
+id_sequence_config = {
+    "block_size": 10    # IDs reserved per round trip (unused ones are skipped when the process exits)
+}
+
+id_sequences = IdSequences(db_pool, **id_sequence_config)
+id_sequences.register('pilot', 'P-{:03d}', seed_sql="""
+    SELECT COALESCE(MAX(CAST(SUBSTRING(pilot_id, 3) AS UNSIGNED)), 0) + 1
+    FROM Pilots WHERE pilot_id REGEXP '^P-[0-9]+$'
+""")
+id_sequences.register('attendant', 'FA-{:03d}', seed_sql="""
+    SELECT COALESCE(MAX(CAST(SUBSTRING(attendant_id, 4) AS UNSIGNED)), 0) + 1
+    FROM Flight_Attendants WHERE attendant_id REGEXP '^FA-[0-9]+$'
+""")
+id_sequences.register('order_code_node', block_size=1)
+
+
 # Context manager to handle database connection and cursor lifecycle.
 @contextmanager
 def db_cur():
     """
-    Context manager that establishes a database connection and yields a
-    dictionary cursor for executing SQL queries.
+    Context manager that checks a connection out of the pool and yields a
+    dictionary cursor for executing SQL queries. The connection is returned to the pool on exit.
     Yields: MySQLCursorDict: A cursor object that returns query results as dictionaries.
     Raises: mysql.connector.Error: If a database connection error occurs.
     """
     mydb = None
     cursor = None
+    discard = False
     try:
-        mydb = mysql.connector.connect(**db_config)
-        cursor = mydb.cursor(dictionary=True)
-        yield cursor
+        acquire_started = time.perf_counter()
+        mydb = db_pool.acquire()
+        request_metrics.record_acquire(time.perf_counter() - acquire_started)
+        # Buffered, so a connection never goes back to the pool with unread rows
+        cursor = mydb.cursor(dictionary=True, buffered=True)
+        # Statements are timed and counted per request (see metrics.py), slow ones logged (slow_query_log.py)
+        if request_metrics.enabled or slow_query_log.enabled:
+            yield InstrumentedCursor(cursor, request_metrics,
+                                     slow_query_log if slow_query_log.enabled else None)
+        else:
+            yield cursor
     except mysql.connector.Error as err:
         print(f"Database Error: {err}")
+        # Connection-level failures mean the connection can't be trusted anymore
+        discard = isinstance(err, (mysql.connector.InterfaceError, mysql.connector.OperationalError))
         raise err
     finally:
         if cursor:
-            cursor.close()
+            try:
+                cursor.close()
+            except mysql.connector.Error:
+                discard = True
         if mydb:
-            mydb.close()
+            db_pool.release(mydb, discard=discard)
+
+
+class Transaction:
+    """
+    Unit of work yielded by db_tx(). Connections run in autocommit mode, so without it every statement of a
+    multi-step write is committed (and flushed to disk) on its own.
+    """
+    __slots__ = ('cursor', 'active', '_savepoints')
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+        self.active = True
+        self._savepoints = 0
+
+    def rollback(self):
+        """Undoes the transaction now (for early 'return False, msg' exits); db_tx() won't commit it."""
+        if self.active:
+            self.active = False
+            self.cursor.execute("ROLLBACK")
+
+    @contextmanager
+    def savepoint(self, name=None):
+        """
+        Nested unit of work: if the block raises, only its own statements are undone (ROLLBACK TO SAVEPOINT)
+        and the exception is re-raised; the caller may catch it and carry on with the transaction.
+        param name (str, optional): Savepoint identifier (generated if omitted).
+        Yields: The transaction's cursor.
+        """
+        self._savepoints += 1
+        name = name or f"sp_{self._savepoints}"
+        if not name.isidentifier():
+            raise ValueError(f"Invalid savepoint name: {name}")
+        self.cursor.execute(f"SAVEPOINT {name}")
+        try:
+            yield self.cursor
+        except BaseException:
+            if self.active:
+                self.cursor.execute(f"ROLLBACK TO SAVEPOINT {name}")
+            raise
+        if self.active:
+            self.cursor.execute(f"RELEASE SAVEPOINT {name}")
+
+
+@contextmanager
+def db_tx(cursor=None):
+    """
+    Context manager that runs a block as one transaction: committed once when the block ends, rolled back if
+    it raises or calls tx.rollback(). Note that a plain `return` inside the block commits.
+    param cursor (optional): Run the transaction on this cursor's connection (e.g. after reads made through
+                             db_cur()); by default a connection is checked out for the block.
+    Yields: Transaction: With `cursor`, rollback() and savepoint().
+    Raises: mysql.connector.Error: If a statement or the commit fails (after rolling back).
+    """
+    if cursor is None:
+        with db_cur() as cursor:
+            with db_tx(cursor) as tx:
+                yield tx
+        return
+
+    tx = Transaction(cursor)
+    cursor.execute("START TRANSACTION")
+    try:
+        yield tx
+    except BaseException:
+        if tx.active:
+            tx.active = False
+            try:
+                cursor.execute("ROLLBACK")
+            except mysql.connector.Error:
+                pass  # The pool rolls back (or discards) the connection on release anyway
+        raise
+    if tx.active:
+        tx.active = False
+        cursor.execute("COMMIT")
 
 
 def register_new_customer(data):
@@ -73,8 +213,10 @@ def register_new_customer(data):
 
     if middle_name and not all(c in allowed_chars for c in middle_name):
         return False, "Registration failed: Middle name must contain only English letters."
-    with db_cur() as cursor:
-        try:
+    try:
+        # The customer and the phones are committed together (a failure leaves no account without phones)
+        with db_tx() as tx:
+            cursor = tx.cursor
             # 1. Validation: Check if email exists
             cursor.execute("SELECT email FROM Registered_Customers WHERE email = %s", (data['email'],))
             if cursor.fetchone():
@@ -107,39 +249,170 @@ def register_new_customer(data):
             if not isinstance(phone_list, list):
                 phone_list = [phone_list]
 
-            for phone in phone_list:
-                if phone and str(phone).strip():
-                    cursor.execute(insert_phone, (str(phone).strip(), data['email']))
+            phone_rows = [(str(phone).strip(), data['email']) for phone in phone_list if phone and str(phone).strip()]
+            if phone_rows:
+                cursor.executemany(insert_phone, phone_rows)
+
+    except mysql.connector.Error as err:
+        if err.errno == 1062:  # Duplicate entry code
+            return False, "Registration failed: Email or Passport already exists."
+        print(f"DB Error in signup: {err}")  # Print to console for debugging
+        return False, "Database error during registration."
+    except Exception as e:
+        print(f"General Error in signup: {e}")
+        return False, f"System error: {str(e)}"
 
-            return True, "Account created successfully!"
+    invalidate_user(data['email'])  # Drop a cached "no such user" from an earlier lookup
+    return True, "Account created successfully!"
+
+# Departures board cache. Entries are dropped by the write paths that change the board
+# (see invalidate_flight_board); the TTL bounds staleness caused by writes in other processes.
+board_cache_config = {
+    "maxsize": 512,
+    "ttl": 30
+}
+
+flight_board_cache = TTLCache(**board_cache_config)
+
+
+def _clean_filter(value):
+    """Normalizes an optional board filter: empty strings become None, airport codes are upper-cased."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value.upper() or None
+
+
+# Flight board pagination: pages are ordered by (departure_date, departure_time, flight_id)
+FLIGHT_PAGE_SIZE = 50
+MAX_FLIGHT_PAGE_SIZE = 100
+
+
+def _board_key(user_type, date, source, destination, status, cursor, page_size):
+    """
+    Builds the flight-board cache key (user_type, date, source, dest, status, cursor, page_size).
+    Every non-manager sees the same board, and the status filter only applies to managers.
+    """
+    if user_type == 'Manager':
+        board_type = 'Manager'
+        status = None if not status or status == 'All' else status
+    else:
+        board_type = 'Public'
+        status = None
+    return (board_type, str(date) if date else None, _clean_filter(source), _clean_filter(destination), status,
+            cursor, page_size)
+
+
+def invalidate_flight_board(date=None, source=None, destination=None):
+    """
+    Drops the cached board pages that could contain a flight on the given date/route.
+    A cached page is affected if each of its filters is either unset or equal to the changed value;
+    pages filtered on a different date or route are kept.
+    param date (str|date, optional): Departure date of the changed flight (None matches every date).
+    param source (str, optional): Source airport of the changed flight (None matches every source).
+    param destination (str, optional): Destination airport of the changed flight (None matches every destination).
+    Returns: int: The number of cache entries removed.
+    """
+    date = str(date) if date else None
+    source = _clean_filter(source)
+    destination = _clean_filter(destination)
+
+    def affected(key):
+        k_date, k_source, k_dest = key[1], key[2], key[3]
+        return ((date is None or k_date is None or k_date == date) and
+                (source is None or k_source is None or k_source == source) and
+                (destination is None or k_dest is None or k_dest == destination))
+
+    return flight_board_cache.invalidate_where(affected)
+
+
+def _format_time(value):
+    """Formats a MySQL TIME value (returned as timedelta) as HH:MM:SS."""
+    if isinstance(value, timedelta):
+        total = int(value.total_seconds())
+        return f"{total // 3600:02d}:{total % 3600 // 60:02d}:{total % 60:02d}"
+    return str(value)
+
+
+def encode_flight_cursor(flight):
+    """
+    Builds the opaque "next page" token pointing just after the given flight row.
+    param flight (dict): The last flight row of a page.
+    Returns: str: A URL-safe token.
+    """
+    position = [str(flight['departure_date']), _format_time(flight['departure_time']), flight['flight_id']]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode().rstrip('=')
 
-        except mysql.connector.Error as err:
-            if err.errno == 1062:  # Duplicate entry code
-                return False, "Registration failed: Email or Passport already exists."
-            print(f"DB Error in signup: {err}")  # Print to console for debugging
-            return False, "Database error during registration."
-        except Exception as e:
-            print(f"General Error in signup: {e}")
-            return False, f"System error: {str(e)}"
 
-def get_flights_with_filters(user_type, date=None, source=None, destination=None, status=None):
+def decode_flight_cursor(token):
     """
-    Retrieves a list of flights based on the user type and optional filters.
+    Decodes a token produced by encode_flight_cursor.
+    param token (str): The "next page" token.
+    Returns: tuple: (departure_date, departure_time, flight_id) as strings.
+    Raises: ValueError: If the token is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        date, time, flight_id = json.loads(raw)
+        datetime.strptime(date, '%Y-%m-%d')
+        datetime.strptime(time, '%H:%M:%S')
+    except Exception:
+        raise ValueError("Invalid page cursor.")
+    return date, time, str(flight_id)
+
+
+def serialize_row(row):
+    """
+    Converts a DB row into JSON-friendly values (dates as ISO strings, TIME as HH:MM:SS, decimals as floats).
+    param row (dict): A row returned by a dictionary cursor.
+    Returns: dict: A new dictionary safe to pass to jsonify.
+    """
+    result = {}
+    for key, value in row.items():
+        if isinstance(value, timedelta):
+            value = _format_time(value)
+        elif hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        elif isinstance(value, Decimal):
+            value = float(value)
+        result[key] = value
+    return result
+
+
+def get_flights_with_filters(user_type, date=None, source=None, destination=None, status=None, cursor=None,
+                             page_size=FLIGHT_PAGE_SIZE):
+    """
+    Retrieves one page of flights based on the user type and optional filters.
     Managers see all flights; others see only 'Active' flights.
+    Pages are ordered by (departure_date, departure_time, flight_id) and use keyset pagination,
+    so every page costs the same regardless of how much history the table holds.
+    Results are served from the in-process flight board cache when possible.
     param: user_type (str): The type of user requesting the data ('Manager' or other).
     param date (str, optional): Filter by departure date (YYYY-MM-DD).
     param source (str, optional): Filter by source airport code.
     param destination (str, optional): Filter by destination airport code.
-    Returns: list[dict]: A list of flight records matching the criteria.
+    param status (str, optional): Status filter (managers only, 'All' for no filter).
+    param cursor (str, optional): The "next page" token of the previous page.
+    param page_size (int, optional): Rows per page, capped at MAX_FLIGHT_PAGE_SIZE.
+    Returns: tuple[list[dict], str|None]: The flights of the page (shared with the cache - do not modify)
+             and the token of the next page, or None on the last page.
+    Raises: ValueError: If the cursor token is malformed.
     """
+    page_size = max(1, min(int(page_size or FLIGHT_PAGE_SIZE), MAX_FLIGHT_PAGE_SIZE))
+    after = decode_flight_cursor(cursor) if cursor else None
+    key = _board_key(user_type, date, source, destination, status, cursor or None, page_size)
+    return flight_board_cache.get_or_load(key, lambda: _load_flights_page(*key[:5], after, page_size))
+
 
+def _load_flights_page(board_type, date, source, destination, status, after, page_size):
+    """Runs the departures board query for an already-normalized cache key."""
     with db_cur() as cursor:
         params = []
 
-        if user_type == 'Manager':
+        if board_type == 'Manager':
             query = "SELECT * FROM Flights WHERE 1=1"
 
-            if status and status != 'All':
+            if status:
                 query += " AND status = %s"
                 params.append(status)
 
@@ -156,11 +429,28 @@ def get_flights_with_filters(user_type, date=None, source=None, destination=None
             query += " AND destination_airport = %s"
             params.append(destination)
 
+        if after:
+            # Expanded form of (date, time, id) > (...) so the date range can use an index
+            a_date, a_time, a_id = after
+            query += """ AND departure_date >= %s
+                AND (departure_date > %s
+                     OR (departure_date = %s AND (departure_time > %s
+                                                  OR (departure_time = %s AND flight_id > %s))))"""
+            params.extend([a_date, a_date, a_date, a_time, a_time, a_id])
+
+        # Fetch one extra row to know whether there is a next page
+        query += " ORDER BY departure_date, departure_time, flight_id LIMIT %s"
+        params.append(page_size + 1)
+
         cursor.execute(query, tuple(params))
-        return cursor.fetchall()
+        rows = cursor.fetchall()
 
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_flight_cursor(rows[-1])
+    return rows, next_cursor
 
-from datetime import datetime, timedelta
 
 def get_order_by_code(order_code, email):
     """
@@ -265,24 +555,29 @@ def cancel_order_transaction(order_code):
     Executes an order cancellation process.
     Validates the cancellation window (up to 36 hours before flight), calculates a 5% fee,
     updates the order status, and adjusts ticket prices to reflect the fee.
+    Only 'Active' orders can be cancelled; the status change, the new prices and the dashboard
+    summaries are written in one transaction.
     param order_code (str): The code of the order to cancel.
     Returns: tuple: (bool, str) - (True, "Success Message") or (False, "Error Message").
     """
 
     with db_cur() as cursor:
         query_check = """
-            SELECT F.departure_date, F.departure_time, SUM(FT.price) as current_total
+            SELECT O.status, F.departure_date, F.departure_time, SUM(FT.price) as current_total,
+                   COUNT(*) as ticket_count
             FROM Orders O
             JOIN Flight_Tickets FT ON O.order_code = FT.order_code
             JOIN Flights F ON FT.flight_id = F.flight_id
             WHERE O.order_code = %s
-            GROUP BY F.departure_date, F.departure_time
+            GROUP BY O.status, F.departure_date, F.departure_time
         """
         cursor.execute(query_check, (order_code,))
         res = cursor.fetchone()
 
         if not res:
             return False, "Order not found."
+        if res['status'] != 'Active':
+            return False, "Only active orders can be cancelled."
         flight_dt = datetime.combine(res['departure_date'], (datetime.min + res['departure_time']).time())
         limit_time = datetime.now() + timedelta(hours=36)
         if limit_time > flight_dt:
@@ -291,18 +586,39 @@ def cancel_order_transaction(order_code):
         cancellation_fee = original_price * 0.05
 
         try:
-            cursor.execute("UPDATE Orders SET status = 'Cancelled by customer' WHERE order_code = %s", (order_code,))
-            cursor.execute("""
-                UPDATE Flight_Tickets 
-                SET price = %s / (SELECT count FROM (SELECT COUNT(*) as count FROM Flight_Tickets WHERE order_code = %s) as tmp)
-                WHERE order_code = %s
-            """, (cancellation_fee, order_code, order_code))
-
-            return True, f"Order cancelled. You were charged a 5% fee (${cancellation_fee:.2f})."
+            with db_tx(cursor) as tx:
+                # The status guard makes a concurrent second cancellation of the same order a no-op
+                cursor.execute("""
+                    UPDATE Orders SET status = 'Cancelled by customer'
+                    WHERE order_code = %s AND status = 'Active'
+                """, (order_code,))
+                if cursor.rowcount == 0:
+                    tx.rollback()
+                    return False, "Only active orders can be cancelled."
+
+                # Summaries first: they need the ticket prices from before the fee replaces them
+                record_customer_cancellation(cursor, order_code, cancellation_fee / res['ticket_count'])
+                cursor.execute("""
+                    UPDATE Flight_Tickets
+                    SET price = %s / (SELECT count FROM (SELECT COUNT(*) as count FROM Flight_Tickets WHERE order_code = %s) as tmp),
+                        seat_hold = NULL
+                    WHERE order_code = %s
+                """, (cancellation_fee, order_code, order_code))
 
+                cursor.execute("""
+                    SELECT flight_id, departure_date, row_num, column_num
+                    FROM Flight_Tickets WHERE order_code = %s
+                """, (order_code,))
+                tickets = cursor.fetchall()
         except Exception as e:
             return False, f"Database error: {e}"
 
+        if tickets:
+            seat_index.release(tickets[0]['flight_id'], tickets[0]['departure_date'],
+                               [(t['row_num'], t['column_num']) for t in tickets])
+
+        return True, f"Order cancelled. You were charged a 5% fee (${cancellation_fee:.2f})."
+
 
 def get_flight_details(flight_id):
     """
@@ -317,12 +633,18 @@ def get_flight_details(flight_id):
         return cursor.fetchone()
 
 
+# Per-flight seat occupancy bitmaps, kept current by the booking and cancellation paths
+seat_index = SeatIndex(ttl=60)
+
+
 def get_flight_seat_map(flight_id):
     """
     Generates a seat map for a flight, indicating occupied seats.
     Only seats belonging to 'Active' orders are marked as taken.
+    The map is served from the in-process seat occupancy index (one bit per seat).
     param flight_id (str): The unique identifier of the flight.
-    Returns: tuple: (dict, dict) - Flight details and a seat map dictionary {row: {col: seat_data}}.
+    Returns: tuple: (dict, SeatOccupancy) - Flight details and the flight's seat occupancy
+             (layout rows via .layout.rows, taken state via .is_taken(row, col)), or (None, None).
     """
     with db_cur() as cursor:
         # 1. Fetch flight info
@@ -334,41 +656,42 @@ def get_flight_seat_map(flight_id):
         """
         cursor.execute(query_flight, (flight_id,))
         flight = cursor.fetchone()
-        if not flight: return None, {}
-
-        # 2. Fetch seats. 
-        query_seats = """
-            SELECT s.row_num, s.column_num, s.class_type, s.airplane_id,
-                   CASE 
-                       WHEN t.order_code IS NOT NULL AND o.status = 'Active' THEN 1 
-                       ELSE 0 
-                   END AS is_taken
-            FROM Seats s
-            LEFT JOIN Flight_Tickets t 
-                ON s.row_num = t.row_num 
-                AND s.column_num = t.column_num 
-                AND s.airplane_id = t.airplane_id
-                AND t.flight_id = %s
-                AND t.departure_date = %s
-            LEFT JOIN Orders o ON t.order_code = o.order_code
-            WHERE s.airplane_id = %s
-            ORDER BY s.row_num, s.column_num
-        """
-        cursor.execute(query_seats, (flight_id, flight['departure_date'], flight['airplane_id']))
-        raw_seats = cursor.fetchall()
-
-        # 3. Reorganize map
-        seat_map = {}
-        max_row = 0
-        for seat in raw_seats:
-            r = seat['row_num']
-            c = seat['column_num']
-            if r not in seat_map:
-                seat_map[r] = {}
-            seat_map[r][c] = seat
-            if r > max_row: max_row = r
-
-        return flight, {'map': seat_map, 'max_row': max_row}
+        if not flight: return None, None
+
+        # 2. Fetch occupancy (loaded from the DB only on the first view or after the TTL)
+        occupancy = seat_index.get(cursor, flight_id, flight['departure_date'], flight['airplane_id'])
+
+        return flight, occupancy
+
+# Short-lived cache of Classes_In_Flights prices: flight_id -> {class_type: price}
+price_cache = TTLCache(maxsize=1024, ttl=30)
+
+
+def get_flight_prices(flight_id):
+    """
+    Retrieves the current ticket price of every class of a flight, using the short-lived price cache.
+    param flight_id (str): The flight identifier.
+    Returns: dict: {class_type: price} (empty if the flight has no prices).
+    """
+
+    def load():
+        with db_cur() as cursor:
+            cursor.execute("""
+                SELECT cif.class_type, cif.price 
+                FROM Classes_In_Flights cif
+                JOIN Flights f ON cif.flight_id = f.flight_id 
+                              AND cif.departure_date = f.departure_date
+                WHERE cif.flight_id = %s
+            """, (flight_id,))
+            return {row['class_type']: float(row['price']) for row in cursor.fetchall()}
+
+    return price_cache.get_or_load(flight_id, load)
+
+
+def invalidate_prices(flight_id):
+    """Drops the cached prices of a flight (call after any change to its Classes_In_Flights rows)."""
+    price_cache.invalidate(flight_id)
+
 
 def get_current_price(flight_id, class_type):
     """
@@ -379,51 +702,239 @@ def get_current_price(flight_id, class_type):
     Raises: ValueError: If no price is found for the specified class and flight.
     """
 
-    with db_cur() as cursor:
-        query = """
-            SELECT cif.price 
-            FROM Classes_In_Flights cif
-            JOIN Flights f ON cif.flight_id = f.flight_id 
-                          AND cif.departure_date = f.departure_date
-            WHERE cif.flight_id = %s AND cif.class_type = %s
-        """
-        cursor.execute(query, (flight_id, class_type))
-        result = cursor.fetchone()
+    price = get_flight_prices(flight_id).get(class_type)
+    if price is not None:
+        return price
+
+    # Raise an error to stop execution immediately if data is missing
+    raise ValueError(
+        f"CRITICAL: No price set for Flight {flight_id} in {class_type} class. Please choose a different ticket")
+
+
+def quote_seats(flight_id, seat_keys):
+    """
+    Prices a list of selected seats with a single price lookup for the whole flight.
+    param flight_id (str): The flight identifier.
+    param seat_keys (list[str]): Seat identifiers in the format 'row-col-class-airplane_id'.
+    Returns: dict: {'seats': [{'row', 'col', 'class', 'price', 'key'}, ...], 'total': float}.
+    Raises: ValueError: If a seat key is malformed or a class has no price for this flight.
+    """
+    prices = get_flight_prices(flight_id)
+
+    quoted = []
+    total = 0
+    for seat_key in seat_keys:
+        parts = seat_key.split('-', 3)
+        if len(parts) != 4:
+            raise ValueError(f"Invalid seat selection: {seat_key}")
+        row, col, s_class, _ = parts
+        price = prices.get(s_class)
+        if price is None:
+            raise ValueError(
+                f"CRITICAL: No price set for Flight {flight_id} in {s_class} class. Please choose a different ticket")
+        total += price
+        quoted.append({'row': row, 'col': col, 'class': s_class, 'price': price, 'key': seat_key})
+
+    return {'seats': quoted, 'total': total}
+
+
+def _parse_seat_keys(selected_seats):
+    """
+    Parses seat keys of the booking form.
+    param selected_seats (list[str]): Seat identifiers in the format 'row-col-class-airplane_id'.
+    Returns: list[tuple]: (row_num, column_num, class_type, airplane_id) per distinct seat, in input order.
+    Raises: ValueError: If a key is malformed.
+    """
+    seats = []
+    seen = set()
+    for seat_key in selected_seats:
+        parts = seat_key.split('-')
+        if len(parts) < 4 or not parts[0].isdigit() or not parts[1].isdigit():
+            raise ValueError(f"Invalid seat selection: {seat_key}")
+        row, col, s_class = int(parts[0]), int(parts[1]), parts[2]
+        airplane_id = "-".join(parts[3:])  # Re-join if ID contains dashes
+        if (row, col) not in seen:
+            seen.add((row, col))
+            seats.append((row, col, s_class, airplane_id))
+    return seats
+
+
+# Deadlock / lock-wait timeout: the whole booking transaction is retried with a fresh order code
+BOOKING_RETRY_ERRNOS = (1213, 1205)
+BOOKING_ATTEMPTS = 3
+
+
+def _order_code_node():
+    """
+    Node id for this process's order codes: the next value of the 'order_code_node' sequence. The generator
+    keeps it modulo MAX_NODES (256), so processes started one after another get different node ids, but a
+    process started 256 starts after a still-running one shares its node id. Such collisions are rare and are
+    handled by create_booking's retry on a duplicate order code; the node id is not a uniqueness guarantee.
+    Returns: int
+    """
+    return id_sequences.next_value('order_code_node')
+
+
+# Unique, time-ordered order codes (see order_codes.py)
+order_code_generator = OrderCodeGenerator(_order_code_node)
+
+
+class OrderCodeTakenError(Exception):
+    """Raised when a new order's code already exists (the booking is retried with a fresh code)."""
+
+
+class SeatTakenError(Exception):
+    """Raised when another order already holds one of the requested seats."""
+
+    def __init__(self, seats):
+        self.seats = seats
+        labels = ", ".join(f"{row}{map_seat_letter(col)}" for row, col in seats)
+        super().__init__(f"Seat {labels} was just taken by another customer. Please choose different seats.")
+
+
+def map_seat_letter(column_num):
+    """
+    Converts a seat column number to its letter (1 -> 'A', ..., 10 -> 'J'). Used for every seat label,
+    including the `map_to_letter` template filter.
+    param column_num (int|str): The column number; a non-numeric string is returned unchanged.
+    Returns: str|int: The letter, or the input if it is not a column number from 1 to 10.
+    """
+    if isinstance(column_num, str) and not column_num.isdigit():
+        return column_num
+    number = int(column_num)
+    return "ABCDEFGHIJ"[number - 1] if 1 <= number <= 10 else column_num
+
 
-        if result:
-            return float(result['price'])
+def _held_seats(cursor, flight_id, departure_date, seats):
+    """
+    Returns the subset of `seats` that is currently held by an order on this flight.
+    param seats (list[tuple]): (row_num, column_num) pairs.
+    Returns: list[tuple]: The held (row_num, column_num) pairs.
+    """
+    placeholders = ", ".join(["(%s, %s)"] * len(seats))
+    cursor.execute(f"""
+        SELECT row_num, column_num FROM Flight_Tickets
+        WHERE flight_id = %s AND departure_date = %s AND seat_hold = 1
+          AND (row_num, column_num) IN ({placeholders})
+    """, (flight_id, departure_date, *[v for seat in seats for v in seat]))
+    return [(r['row_num'], r['column_num']) for r in cursor.fetchall()]
+
+
+def _write_booking(cursor, order_code, flight_id, departure_date, seats, email, customer_type, guest_data):
+    """
+    Writes one booking atomically: guest details, the order and all its tickets.
+    Seat ownership is enforced by the uq_active_seat key on Flight_Tickets, so two concurrent buyers
+    of the same seat can never both commit; the loser gets SeatTakenError and nothing is written.
+    Raises: SeatTakenError: If a requested seat is already held.
+            OrderCodeTakenError: If `order_code` is already used by another order.
+            ValueError: If the flight is no longer open for booking or a class has no price.
+            mysql.connector.Error: On other database errors (including deadlocks, retried by the caller).
+    """
+    with db_tx(cursor) as tx:
+        # Shared lock: concurrent bookings don't block each other, but a concurrent flight
+        # cancellation waits until this booking is committed (and vice versa)
+        cursor.execute("""
+            SELECT status FROM Flights
+            WHERE flight_id = %s AND departure_date = %s
+            LOCK IN SHARE MODE
+        """, (flight_id, departure_date))
+        flight = cursor.fetchone()
+        if not flight or flight['status'] != 'Active':
+            raise ValueError("This flight is no longer open for booking.")
 
-        # Raise an error to stop execution immediately if data is missing
-        raise ValueError(
-            f"CRITICAL: No price set for Flight {flight_id} in {class_type} class. Please choose a different ticket")
+        if customer_type == 'Unregistered':
+            cursor.execute("""
+                    INSERT IGNORE INTO Unregistered_Customers (email, first_name, middle_name, last_name, customer_type)
+                    VALUES (%s, %s, %s, %s, 'Unregistered')
+                """, (email, guest_data['first_name'], guest_data.get('middle_name'), guest_data['last_name']))
+
+            if guest_data.get('phone'):
+                cursor.execute("""
+                        INSERT IGNORE INTO Customer_Phones (phone_num, email, customer_type)
+                        VALUES (%s, %s, 'Unregistered')
+                    """, (guest_data['phone'], email))
+
+        # Create Order
+        try:
+            cursor.execute("""
+                    INSERT INTO Orders (order_code, customer_email, status, order_date, customer_type)
+                    VALUES (%s, %s, 'Active', CURDATE(), %s)
+                """, (order_code, email, customer_type))
+        except mysql.connector.IntegrityError as err:
+            if err.errno == 1062:
+                raise OrderCodeTakenError(f"Order code {order_code} already exists") from err
+            raise
+
+        # Prices for every class of this flight in one lookup
+        cursor.execute("""
+                SELECT class_type, airplane_id, price FROM Classes_In_Flights
+                WHERE flight_id = %s AND departure_date = %s
+            """, (flight_id, departure_date))
+        prices = {(p['class_type'], p['airplane_id']): p['price'] for p in cursor.fetchall()}
+
+        ticket_rows = []
+        for row, col, s_class, airplane_id in seats:
+            price = prices.get((s_class, airplane_id))
+            if price is None:
+                raise ValueError(f"Price not set for class {s_class}")
+            ticket_rows.append((order_code, flight_id, departure_date, row, col, s_class, airplane_id, price))
+
+        # Insert all tickets (executemany is sent as a single multi-row INSERT)
+        try:
+            cursor.executemany("""
+                    INSERT INTO Flight_Tickets 
+                    (order_code, flight_id, departure_date, row_num, column_num, class_type, airplane_id, price, seat_hold)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, 1)
+                """, ticket_rows)
+        except mysql.connector.IntegrityError as err:
+            if err.errno == 1062 and 'uq_active_seat' in str(err):
+                tx.rollback()
+                taken = _held_seats(cursor, flight_id, departure_date, [(row, col) for row, col, _, _ in seats])
+                raise SeatTakenError(taken or [(seats[0][0], seats[0][1])])
+            raise
+
+        record_booking(cursor, order_code, flight_id, departure_date, len(ticket_rows))
 
 
 def create_booking(flight_id, selected_seats, user, guest_data=None):
     """
     Handles the creation of a flight booking for both registered users and guests.
     Validates flight availability, manages guest registration if needed, creates the order,
-    processes individual tickets, and updates the flight status to 'Full Capacity' if necessary.
+    inserts all tickets with a single multi-row INSERT, and updates the flight status to
+    'Full Capacity' if necessary. All writes run in one transaction, so a failure leaves no partial order.
+
+    Concurrency: a seat can only be held by one order (unique uq_active_seat key). If another buyer
+    commits the same seat first, the booking is rolled back and a "seat just taken" message is returned.
+    Deadlocks, lock-wait timeouts and order code collisions are retried up to BOOKING_ATTEMPTS times.
+    Order codes are time-ordered and unique per process (order_code_generator); across processes the Orders
+    primary key and the retry make them unique.
 
     param: flight_id (str): The unique identifier of the flight to book.
     param: selected_seats (list[str]): A list of seat identifiers (format: 'row-col-class-airplane_id').
-    param: user (UserMixin): The current user object. Used to check authentication and prevent Managers from booking.
+    param: user (SlottedUserMixin): The current user object. Used to check authentication and prevent Managers from booking.
     param: guest_data (dict, optional): Details for unregistered users (email, name, phone). Required if user is not authenticated.
     Returns: tuple[bool, str, str|None]: A tuple containing success status, a status message, and the generated order code (or None on failure).
     """
 
     with db_cur() as cursor:
         try:
-            # 1. Validate Flight
-            cursor.execute("SELECT departure_date FROM Flights WHERE flight_id = %s", (flight_id,))
+            # 1. Validate Flight & Seats
+            cursor.execute("""
+                SELECT departure_date, airplane_id, source_airport, destination_airport
+                FROM Flights WHERE flight_id = %s
+            """, (flight_id,))
             res = cursor.fetchone()
             if not res:
                 return False, "Flight not found", None
             departure_date = res['departure_date']
 
-            # 2. Generate Order Code
-            order_code = ''.join(random.choices(string.ascii_uppercase + string.digits, k=8))
+            seats = _parse_seat_keys(selected_seats)
+            if not seats:
+                return False, "No seats selected", None
+            if any(airplane_id != res['airplane_id'] for _, _, _, airplane_id in seats):
+                return False, "Selected seats do not belong to this flight's aircraft.", None
 
-            # 3. Determine User & Handle Guest Logic
+            # 2. Determine User
             if user.is_authenticated:
                 if getattr(user, 'user_type', '') == 'Manager':
                     return False, "Managers cannot book flights!", None
@@ -441,77 +952,50 @@ def create_booking(flight_id, selected_seats, user, guest_data=None):
 
                 customer_type = 'Unregistered'
 
-                cursor.execute("""
-                        INSERT IGNORE INTO Unregistered_Customers (email, first_name, middle_name, last_name, customer_type)
-                        VALUES (%s, %s, %s, %s, 'Unregistered')
-                    """, (email, guest_data['first_name'], guest_data.get('middle_name'), guest_data['last_name']))
-
-                if guest_data.get('phone'):
-                    cursor.execute("""
-                            INSERT IGNORE INTO Customer_Phones (phone_num, email, customer_type)
-                            VALUES (%s, %s, 'Unregistered')
-                        """, (guest_data['phone'], email))
-
-            # 4. Create Order
+            # 3. Write the booking (retried on deadlock or an order code collision with a fresh order code)
+            for attempt in range(1, BOOKING_ATTEMPTS + 1):
+                order_code = order_code_generator.next_code()
+                try:
+                    _write_booking(cursor, order_code, flight_id, departure_date, seats, email, customer_type,
+                                   guest_data)
+                    break
+                except OrderCodeTakenError:
+                    if attempt == BOOKING_ATTEMPTS:
+                        raise
+                except mysql.connector.Error as err:
+                    if err.errno not in BOOKING_RETRY_ERRNOS or attempt == BOOKING_ATTEMPTS:
+                        raise
+                    time.sleep(0.05 * attempt)
+
+            seat_index.mark_taken(flight_id, departure_date, [(row, col) for row, col, _, _ in seats])
+
+            # 4. Capacity check after commit: it sees every committed booking, so the last buyer
+            #    always flips the flight, without holding locks across concurrent checkouts
+            total_seats = seat_index.get_layout(cursor, res['airplane_id']).size
             cursor.execute("""
-                    INSERT INTO Orders (order_code, customer_email, status, order_date, customer_type)
-                    VALUES (%s, %s, 'Active', CURDATE(), %s)
-                """, (order_code, email, customer_type))
-
-            # 5. Process Tickets
-            for seat_key in selected_seats:
-                # Format: "row-col-class-airplane_id"
-                parts = seat_key.split('-')
-                row, col, s_class = parts[0], parts[1], parts[2]
-                airplane_id = "-".join(parts[3:])  # Re-join if ID contains dashes
-
-                # Get Price
+                           SELECT COUNT(*) as booked
+                           FROM Flight_Tickets
+                           WHERE flight_id = %s
+                             AND departure_date = %s
+                             AND seat_hold = 1
+                           """, (flight_id, departure_date))
+            booked_seats = cursor.fetchone()['booked']
+
+            if booked_seats >= total_seats:
                 cursor.execute("""
-                        SELECT price FROM Classes_In_Flights
-                        WHERE flight_id = %s AND departure_date = %s AND class_type = %s AND airplane_id = %s
-                    """, (flight_id, departure_date, s_class, airplane_id))
-
-                price_res = cursor.fetchone()
-                if not price_res:
-                    raise ValueError(f"Price not set for class {s_class}")
-
-                current_price = price_res['price']
-
-                # Insert Ticket
-                cursor.execute("""
-                        INSERT INTO Flight_Tickets 
-                        (order_code, flight_id, departure_date, row_num, column_num, class_type, airplane_id, price)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                    """, (order_code, flight_id, departure_date, row, col, s_class, airplane_id, current_price))
-                 #change status if full:
-                #Count Total Seats on Plane
-                cursor.execute("SELECT COUNT(*) as total FROM Seats WHERE airplane_id = %s", (airplane_id,))
-                total_seats = cursor.fetchone()['total']
-
-                #Count Booked Seats (Only for Active orders)
-                cursor.execute("""
-                               SELECT COUNT(*) as booked
-                               FROM Flight_Tickets t
-                                        JOIN Orders o ON t.order_code = o.order_code
-                               WHERE t.flight_id = %s
-                                 AND t.departure_date = %s
-                                 AND o.status = 'Active'
+                               UPDATE Flights
+                               SET status = 'Full Capacity'
+                               WHERE flight_id = %s
+                                 AND departure_date = %s
+                                 AND status = 'Active'
                                """, (flight_id, departure_date))
-                booked_seats = cursor.fetchone()['booked']
-
-                #Check and Update
-                if booked_seats >= total_seats:
-                    cursor.execute("""
-                                   UPDATE Flights
-                                   SET status = 'Full Capacity'
-                                   WHERE flight_id = %s
-                                     AND departure_date = %s
-                                   """, (flight_id, departure_date))
-                # ----------------------------------
-
+                invalidate_flight_board(departure_date, res['source_airport'], res['destination_airport'])
 
             return True, "Booking successful!", order_code
 
+        except SeatTakenError as e:
+            seat_index.mark_taken(flight_id, departure_date, e.seats)
+            return False, str(e), None
         except mysql.connector.Error as err:
             # Print error to PythonAnywhere error log
             print(f"SQL Error in create_booking: {err}")
@@ -521,9 +1005,45 @@ def create_booking(flight_id, selected_seats, user, guest_data=None):
             return False, f"Error: {str(e)}", None
 
 def cancel_order_in_db(order_code):
-    """Updates order status to 'Cancelled by customer'."""
-    with db_cur() as cursor:
-        cursor.execute("UPDATE Orders SET status='Cancelled by customer' WHERE order_code=%s", (order_code,))
+    """Updates order status to 'Cancelled by customer' and releases its seats, in one transaction."""
+    with db_tx() as tx:
+        tx.cursor.execute("UPDATE Orders SET status='Cancelled by customer' WHERE order_code=%s", (order_code,))
+        tx.cursor.execute("UPDATE Flight_Tickets SET seat_hold = NULL WHERE order_code=%s", (order_code,))
+
+
+class SlottedUserMixin:
+    """
+    Flask-Login's UserMixin for classes with __slots__ (UserMixin itself gives every instance a __dict__).
+    Expects the class to define an `id` slot.
+    """
+    __slots__ = ()
+
+    @property
+    def is_active(self):
+        return True
+
+    @property
+    def is_authenticated(self):
+        return self.is_active
+
+    @property
+    def is_anonymous(self):
+        return False
+
+    def get_id(self):
+        return str(self.id)
+
+    def __eq__(self, other):
+        if isinstance(other, SlottedUserMixin):
+            return self.get_id() == other.get_id()
+        return NotImplemented
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    # Defining __eq__ would otherwise make instances unhashable
+    __hash__ = object.__hash__
 
 
 class Worker:
@@ -531,6 +1051,7 @@ class Worker:
     Base class representing a general employee/worker in the system.
     Stores common attributes like name and address.
     """
+    __slots__ = ('first_name', 'middle_name', 'last_name', 'city', 'street', 'house_num', 'start_date')
 
     def __init__(self, first_name, middle_name, last_name, city, street, house_num, start_date):
         self.first_name = first_name
@@ -552,11 +1073,12 @@ class Worker:
         return f"{self.street} {self.house_num}, {self.city}"
 
 
-class Manager(Worker, UserMixin):
+class Manager(Worker, SlottedUserMixin):
     """
-    Represents a Manager user, inheriting from Worker and UserMixin for Flask-Login compatibility.
+    Represents a Manager user, inheriting from Worker and SlottedUserMixin for Flask-Login compatibility.
     Includes login credentials (manager_id, password).
     """
+    __slots__ = ('id', 'password', 'user_type')
 
     def __init__(self, manager_id, password, first_name, middle_name, last_name, city, street, house_num, start_date):
         super().__init__(first_name, middle_name, last_name, city, street, house_num, start_date)
@@ -569,10 +1091,11 @@ class Manager(Worker, UserMixin):
         return "Manager"
 
 
-class User(UserMixin):
+class User(SlottedUserMixin):
     """
     Base class representing a generic user (e.g., Guest/Unregistered).
     """
+    __slots__ = ('id', 'email', 'first_name', 'last_name', 'middle_name', 'user_type')
 
     def __init__(self, email, first_name, last_name, middle_name=None):
         self.id = email
@@ -594,6 +1117,7 @@ class RegisteredUser(User):
     Represents a registered customer with extended details like passport and password.
     Inherits from User.
     """
+    __slots__ = ('passport_num', 'birth_date', 'password', 'registration_date')
 
     def __init__(self, email, first_name, last_name, passport_num, birth_date, password, registration_date,
                  middle_name=None):
@@ -605,10 +1129,48 @@ class RegisteredUser(User):
         self.user_type = 'Registered'
 
 
-# Helper to check Runway Availability (15 min buffer)
+# Runway and aircraft timelines used by the flight-creation conflict checks
+schedule_config = {
+    "ttl": 300,                    # Seconds before the index is rebuilt (picks up flights created elsewhere)
+    "runway_buffer_minutes": 60,   # Minimum gap between two departures from the same runway
+    "turnaround_minutes": 60       # Ground time an aircraft needs after landing
+}
+
+schedule_index = ScheduleIndex(**schedule_config)
+
+# Crew duty timelines used to offer (and re-check) free pilots and attendants
+crew_config = {
+    "ttl": 300,                    # Seconds before the index is rebuilt (picks up assignments made elsewhere)
+    "rest_buffer_minutes": 120     # Minimum rest between landing and the crew member's next departure
+}
+
+crew_index = CrewIndex(**crew_config)
+
+# Flight minutes per crew member, used only to pre-select crew on the add-flight form (the
+# assignment itself is re-checked on submit), so a few minutes of staleness is harmless
+crew_minutes_config = {
+    "maxsize": 1,
+    "ttl": 120
+}
+
+crew_minutes_cache = TTLCache(**crew_minutes_config)
+
+
+def get_runway_conflicts(date, time, runway):
+    """
+    Lists the flights departing from the same runway too close to the requested departure.
+    param date (str): Departure date.
+    param time (str): Departure time.
+    param runway (str): Runway number.
+    Returns: list[str]: The conflicting flight IDs (empty if the runway is free).
+    """
+    with db_cur() as cursor:
+        return [flight_id for flight_id, _ in schedule_index.runway_conflicts(cursor, date, time, runway)]
+
+
 def check_runway_conflict(date, time, runway):
     """
-    Validates if a runway is free for a given time window (15-minute buffer).
+    Validates if a runway is free for a given departure (runway_buffer_minutes between departures).
     param date (str): Departure date.
     param time (str): Departure time.
     param runway (str): Runway number.
@@ -616,16 +1178,10 @@ def check_runway_conflict(date, time, runway):
     """
 
     with db_cur() as cursor:
-        cursor.execute("""
-            SELECT flight_id, departure_time FROM Flights 
-            WHERE departure_date = %s 
-              AND runway_num = %s 
-              AND status != 'Cancelled'
-              AND ABS(TIMESTAMPDIFF(MINUTE, departure_time, %s)) < 15
-        """, (date, runway, time))
-        conflict = cursor.fetchone()
-        if conflict:
-            return f"Runway Collision: Flight {conflict['flight_id']} is scheduled at {conflict['departure_time']}."
+        conflicts = schedule_index.runway_conflicts(cursor, date, time, runway)
+    if conflicts:
+        flight_id, departure = conflicts[0]
+        return f"Runway Collision: Flight {flight_id} is scheduled at {departure.strftime('%H:%M')}."
     return None
 
 
@@ -642,51 +1198,53 @@ def get_available_resources(date, new_start_time, new_duration):
 
     with db_cur() as cursor:
         # 1. AVAILABLE PLANES
-        size_sql = "AND size = 'Big'" if is_long_haul else ""
-
-        # We exclude planes that match the overlap criteria
-        cursor.execute(f"""
-            SELECT * FROM Airplanes 
-            WHERE airplane_id NOT IN (
-                SELECT f.airplane_id
-                FROM Flights f
-                JOIN Flight_Routes r ON f.source_airport = r.source_airport AND f.destination_airport = r.destination_airport
-                WHERE f.departure_date = %s
-                  AND f.status != 'Cancelled'
-                  AND (
-                      f.departure_time < ADDTIME(%s, SEC_TO_TIME((%s + 60)*60))
-                      AND 
-                      %s < ADDTIME(f.departure_time, SEC_TO_TIME((r.flight_duration + 60)*60))
-                  )
-            )
-            {size_sql}
-        """, (date, new_start_time, new_duration, new_start_time))
-        planes = cursor.fetchall()
-
-        # 2. AVAILABLE PILOTS (Simple day check)
-        training_sql = "AND long_flight_training = 1" if is_long_haul else ""
-        cursor.execute(f"""
-            SELECT * FROM Pilots 
-            WHERE pilot_id NOT IN (SELECT pilot_id FROM Pilots_In_Flights WHERE departure_date = %s)
-            {training_sql}
-        """, (date,))
-        pilots = cursor.fetchall()
-
-        # 3. AVAILABLE ATTENDANTS
-        cursor.execute(f"""
-            SELECT * FROM Flight_Attendants 
-            WHERE attendant_id NOT IN (SELECT attendant_id FROM Attendants_In_Flights WHERE departure_date = %s)
-            {training_sql}
-        """, (date,))
-        attendants = cursor.fetchall()
+        size_sql = "WHERE size = 'Big'" if is_long_haul else ""
+
+        # We exclude planes whose timeline overlaps the new flight (flight time + turnaround)
+        busy = schedule_index.busy_planes(cursor, date, new_start_time, new_duration)
+        cursor.execute(f"SELECT * FROM Airplanes {size_sql}")
+        planes = [plane for plane in cursor.fetchall() if plane['airplane_id'] not in busy]
+
+        # 2. AVAILABLE CREW
+        # Free means no duty (flight time + rest buffer) overlaps the new flight's duty, on any day
+        pilots = crew_index.available(cursor, 'Pilot', date, new_start_time, new_duration, is_long_haul)
+        attendants = crew_index.available(cursor, 'Attendant', date, new_start_time, new_duration, is_long_haul)
 
     return planes, pilots, attendants
 
 
+def _load_crew_minutes():
+    with db_cur() as cursor:
+        return load_crew_minutes(cursor)
+
+
+def suggest_resources(planes, pilots, attendants, duration):
+    """
+    Picks a plane and crew among the available resources, the way the assignment solver does
+    (Small planes for short-haul flights, crew with the fewest flight hours first). The flight hours
+    come from crew_minutes_cache.
+    param planes, pilots, attendants (list[dict]): The lists returned by get_available_resources.
+    param duration (int): Flight duration in minutes.
+    Returns: dict: {'airplane_id', 'pilots', 'attendants'} to pre-select (empty if nothing fits).
+    """
+    is_long_haul = int(duration) > LONG_HAUL_MINUTES
+    plane = pick_plane(planes, is_long_haul)
+    if plane is None:
+        return {}
+    req_pilots, req_attendants = CREW_SIZE.get(plane['size'], CREW_SIZE['Small'])
+
+    crew_minutes = crew_minutes_cache.get_or_load('all', _load_crew_minutes)
+    return {
+        'airplane_id': plane['airplane_id'],
+        'pilots': pick_crew(pilots, 'Pilot', req_pilots, is_long_haul, crew_minutes) or [],
+        'attendants': pick_crew(attendants, 'Attendant', req_attendants, is_long_haul, crew_minutes) or [],
+    }
+
+
 def check_plane_availability(plane_id, date, new_start_time, new_duration):
     """
     Checks if a specific plane is available during the requested time window,
-    considering the duration of both the new flight and existing flights.
+    considering the duration of both the new flight and existing flights (plus turnaround).
     param plane_id (str): The ID of the aircraft.
     param date (str): Flight date.
     param new_start_time (str): Flight start time.
@@ -695,25 +1253,9 @@ def check_plane_availability(plane_id, date, new_start_time, new_duration):
     """
 
     with db_cur() as cursor:
-        cursor.execute("""
-            SELECT f.flight_id, f.departure_time, r.flight_duration
-            FROM Flights f
-            JOIN Flight_Routes r ON f.source_airport = r.source_airport AND f.destination_airport = r.destination_airport
-            WHERE f.departure_date = %s
-              AND f.airplane_id = %s
-              AND f.status != 'Cancelled'
-              AND (
-                  -- 1. Existing flight starts inside new flight's window
-                  f.departure_time < ADDTIME(%s, SEC_TO_TIME((%s + 60)*60))
-                  AND 
-                  -- 2. New flight starts inside existing flight's window
-                  %s < ADDTIME(f.departure_time, SEC_TO_TIME((r.flight_duration + 60)*60))
-              )
-        """, (date, plane_id, new_start_time, new_duration, new_start_time))
-
-        conflict = cursor.fetchone()
-        if conflict:
-            return f"Aircraft Conflict: Plane {plane_id} is busy with Flight {conflict['flight_id']}."
+        conflicts = schedule_index.plane_conflicts(cursor, plane_id, date, new_start_time, new_duration)
+    if conflicts:
+        return f"Aircraft Conflict: Plane {plane_id} is busy with Flight {conflicts[0]}."
     return None
 
 
@@ -785,47 +1327,68 @@ def create_flight_final_step(form_data):
     if check_flight_id_exists(f_id):
         return False, f"CRITICAL: Flight ID {f_id} was taken by another manager just now."
 
-    if check_runway_conflict(date, time, runway):
-        return False, "CRITICAL: Runway conflict detected (Race Condition)."
-
-    plane_conflict = check_plane_availability(plane_id, date, time, duration)
-    if plane_conflict:
-        return False, f"CRITICAL: {plane_conflict}"
+    # 3. INSERT DATA (flight, crew and prices committed together)
+    try:
+        with db_tx() as tx:
+            cursor = tx.cursor
+            # Runway and aircraft are re-checked against the flights around this date, locked until commit,
+            # so a concurrent creation can't take the same slot between the check and the insert
+            window = ScheduleIndex.load_window(cursor, date, lock=True, **schedule_config)
+            if window.runway_conflicts(None, date, time, runway):
+                tx.rollback()
+                return False, "CRITICAL: Runway conflict detected (Race Condition)."
+            plane_conflicts = window.plane_conflicts(None, plane_id, date, time, duration)
+            if plane_conflicts:
+                tx.rollback()
+                return False, f"CRITICAL: Aircraft Conflict: Plane {plane_id} is busy with Flight {plane_conflicts[0]}."
+
+            # The selected crew are locked too, and their duties re-read, so no concurrent creation can
+            # assign them to an overlapping flight (or pass someone without long-haul training)
+            crew = CrewIndex.load_for(cursor, date, {'Pilot': pilot_ids, 'Attendant': attendant_ids},
+                                      lock=True, **crew_config)
+            is_long_haul = int(duration) > 360
+            for role, ids in (('Pilot', pilot_ids), ('Attendant', attendant_ids)):
+                unqualified = crew.unqualified(role, ids, is_long_haul)
+                if unqualified:
+                    tx.rollback()
+                    return False, f"CRITICAL: {role}(s) {', '.join(unqualified)} can't be assigned to this flight."
+                busy = crew.busy(role, ids, date, time, duration)
+                if busy:
+                    tx.rollback()
+                    crew_id, flight_id = next(iter(busy.items()))
+                    return False, f"CRITICAL: Crew Conflict: {role} {crew_id} is on duty with Flight {flight_id}."
 
-    # 3. INSERT DATA
-    with db_cur() as cursor:
-        try:
             # Insert Flight
             cursor.execute("""
                 INSERT INTO Flights (flight_id, departure_date, airplane_id, source_airport, destination_airport, status, departure_time, runway_num)
                 VALUES (%s, %s, %s, %s, %s, 'Active', %s, %s)
             """, (f_id, date, plane_id, source, dest, time, runway))
 
-            # Insert Crew
-            for pid in pilot_ids:
-                cursor.execute(
-                    "INSERT INTO Pilots_In_Flights (pilot_id, flight_id, departure_date) VALUES (%s, %s, %s)",
-                    (pid, f_id, date))
-            for aid in attendant_ids:
-                cursor.execute(
-                    "INSERT INTO Attendants_In_Flights (attendant_id, flight_id, departure_date) VALUES (%s, %s, %s)",
-                    (aid, f_id, date))
+            # Insert Crew (executemany sends each list as one multi-row INSERT)
+            cursor.executemany(
+                "INSERT INTO Pilots_In_Flights (pilot_id, flight_id, departure_date) VALUES (%s, %s, %s)",
+                [(pid, f_id, date) for pid in pilot_ids])
+            cursor.executemany(
+                "INSERT INTO Attendants_In_Flights (attendant_id, flight_id, departure_date) VALUES (%s, %s, %s)",
+                [(aid, f_id, date) for aid in attendant_ids])
 
             # Insert Prices
-            cursor.execute("""
+            prices = [('Economy', price_economy)] + ([('Business', price_business)] if price_business else [])
+            cursor.executemany("""
                 INSERT INTO Classes_In_Flights (flight_id, departure_date, class_type, airplane_id, price)
-                VALUES (%s, %s, 'Economy', %s, %s)
-            """, (f_id, date, plane_id, price_economy))
+                VALUES (%s, %s, %s, %s, %s)
+            """, [(f_id, date, class_type, plane_id, price) for class_type, price in prices])
 
-            if price_business:
-                cursor.execute("""
-                    INSERT INTO Classes_In_Flights (flight_id, departure_date, class_type, airplane_id, price)
-                    VALUES (%s, %s, 'Business', %s, %s)
-                """, (f_id, date, plane_id, price_business))
+            record_flight_created(cursor, f_id, date, plane_id)
+    except Exception as e:
+        return False, str(e)
 
-            return True, "Flight Created Successfully!"
-        except Exception as e:
-            return False, str(e)
+    schedule_index.add_flight(f_id, date, time, duration, plane_id, runway)
+    crew_index.add_flight(f_id, date, time, duration, pilot_ids, attendant_ids)
+
+    invalidate_flight_board(date, source, dest)
+    invalidate_prices(f_id)
+    return True, "Flight Created Successfully!"
 
 def create_new_route(source, dest, duration):
     """
@@ -866,13 +1429,33 @@ def create_new_route(source, dest, duration):
             return False, f"Database Error: {str(e)}"
 
 
+# Logged-in users, loaded by Flask-Login on every request. Entries are dropped on login, logout and
+# registration (see invalidate_user); the TTL bounds staleness after changes made elsewhere.
+user_cache_config = {
+    "maxsize": 2048,
+    "ttl": 300
+}
+
+user_cache = TTLCache(**user_cache_config)
+
+
+def invalidate_user(user_id):
+    """Drops a cached user (call after any change to the user's Registered_Customers / Managers row)."""
+    user_cache.invalidate(user_id)
+
+
 def get_user_by_id(user_id):
     """
     Factory function to retrieve a user object (RegisteredUser or Manager) by ID.
-    Used by Flask-Login for user loading.
+    Used by Flask-Login for user loading, so the result is cached in user_cache (unknown IDs too).
     param user_id (str): The unique ID of the user (email for customers, manager_id for managers).
-    Returns: UserMixin: An instance of RegisteredUser or Manager, or None if not found.
+    Returns: SlottedUserMixin: An instance of RegisteredUser or Manager, or None if not found.
     """
+    return user_cache.get_or_load(user_id, lambda: _load_user(user_id))
+
+
+def _load_user(user_id):
+    """Reads a user from the DB (see get_user_by_id)."""
     with db_cur() as cursor:
         cursor.execute("SELECT * FROM Registered_Customers WHERE email = %s", (user_id,))
         res = cursor.fetchone()
@@ -907,48 +1490,99 @@ def get_user_by_id(user_id):
     return None
 
 
+# Worker tables by role: (table, ID column, ID sequence)
+WORKER_TABLES = {
+    'Pilot': ('Pilots', 'pilot_id', 'pilot'),
+    'Attendant': ('Flight_Attendants', 'attendant_id', 'attendant'),
+}
+
+
+def _worker_values(data):
+    """Returns: tuple: The worker's column values after the ID (names, address, training)."""
+    # Handle Checkbox (returns 'on' if checked, None if not)
+    is_trained = 1 if data.get('long_flight_training') else 0
+    return (data.get('first_name'), data.get('middle_name'), data.get('last_name'),
+            data.get('city'), data.get('street'), data.get('house_num'), is_trained)
+
+
+def _insert_workers(cursor, role, rows):
+    """
+    Inserts workers of one role with one multi-row INSERT.
+    param rows (list[tuple]): (worker_id, *_worker_values(data)) per worker.
+    """
+    table, col_id, _ = WORKER_TABLES[role]
+    cursor.executemany(f"""
+        INSERT INTO {table}
+        ({col_id}, first_name, middle_name, last_name, city, street, house_num, start_date, long_flight_training)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, CURDATE(), %s)
+    """, rows)
+
+
 def add_new_worker(data):
     """
     Adds a new worker (Pilot or Flight Attendant) to the database.
-    Generates a new unique ID and inserts the worker's details.
+    The ID comes from the role's ID sequence (id_sequences), so concurrent hires never share an ID. If the ID
+    is already taken (rows inserted without the sequence), the sequence is resynced and the insert retried once.
     param data (dict): Dictionary containing worker details (role, names, address, training).
     Returns: tuple: (bool, str) - (Success, Message).
     """
 
-    role = data.get('role')  # 'Pilot' or 'Attendant'
+    role = 'Pilot' if data.get('role') == 'Pilot' else 'Attendant'
+    sequence = WORKER_TABLES[role][2]
 
-    # ID Generation
-    prefix = "P" if role == 'Pilot' else "FA"
-    table = "Pilots" if role == 'Pilot' else "Flight_Attendants"
-    col_id = "pilot_id" if role == 'Pilot' else "attendant_id"
-
-    # Data extraction
-    first = data.get('first_name')
-    last = data.get('last_name')
-    middle = data.get('middle_name')
-    city = data.get('city')
-    street = data.get('street')
-    house = data.get('house_num')
+    try:
+        for attempt in range(2):
+            new_id = id_sequences.next_id(sequence)
+            try:
+                with db_tx() as tx:
+                    _insert_workers(tx.cursor, role, [(new_id, *_worker_values(data))])
+                break
+            except mysql.connector.IntegrityError as err:
+                if err.errno != 1062 or attempt:
+                    raise
+                id_sequences.resync(sequence)
+        crew_index.invalidate()
+        return True, f"Added {data.get('role')} {new_id} successfully."
+    except Exception as e:
+        return False, str(e)
 
-    # Handle Checkbox (returns 'on' if checked, None if not)
-    is_trained = 1 if data.get('long_flight_training') else 0
 
-    with db_cur() as cursor:
-        # Find next ID
-        cursor.execute(f"SELECT COUNT(*) as cnt FROM {table}")
-        count = cursor.fetchone()['cnt'] + 1
-        new_id = f"{prefix}-{str(count).zfill(3)}"
+def add_new_workers(workers):
+    """
+    Adds many workers at once (e.g. a class of cabin crew being onboarded, see onboard_crew.py): one ID
+    reservation and one multi-row INSERT per role, and every row of every role in one transaction - either
+    all workers are added or none is. A duplicate ID is handled like in add_new_worker.
+    param workers (list[dict]): Worker details, as for add_new_worker.
+    Returns: tuple[bool, str, list[str]]: (Success, Message, the new IDs in input order; empty on failure).
+    """
+    by_role = {}
+    for position, data in enumerate(workers):
+        role = 'Pilot' if data.get('role') == 'Pilot' else 'Attendant'
+        by_role.setdefault(role, []).append((position, data))
 
-        try:
-            query = f"""
-                INSERT INTO {table} 
-                ({col_id}, first_name, middle_name, last_name, city, street, house_num, start_date, long_flight_training) 
-                VALUES (%s, %s, %s, %s, %s, %s, %s, CURDATE(), %s)
-            """
-            cursor.execute(query, (new_id, first, middle, last, city, street, house, is_trained))
-            return True, f"Added {role} {new_id} successfully."
-        except Exception as e:
-            return False, str(e)
+    new_ids = [None] * len(workers)
+    try:
+        for attempt in range(2):
+            rows = {}
+            for role, entries in by_role.items():
+                ids = id_sequences.next_ids(WORKER_TABLES[role][2], len(entries))
+                rows[role] = [(worker_id, *_worker_values(data)) for worker_id, (_, data) in zip(ids, entries)]
+                for worker_id, (position, _) in zip(ids, entries):
+                    new_ids[position] = worker_id
+            try:
+                with db_tx() as tx:
+                    for role, role_rows in rows.items():
+                        _insert_workers(tx.cursor, role, role_rows)
+                break
+            except mysql.connector.IntegrityError as err:
+                if err.errno != 1062 or attempt:
+                    raise
+                for role in by_role:
+                    id_sequences.resync(WORKER_TABLES[role][2])
+    except Exception as e:
+        return False, str(e), []
+    crew_index.invalidate()
+    return True, f"Added {len(workers)} workers.", new_ids
 
 
 def add_user(email, password, first_name, last_name, passport_num=None, phone=None, user_type='Customer'):